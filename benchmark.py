@@ -0,0 +1,63 @@
+# Author: Tyrone Lagore V00995698
+
+import argparse
+import glob
+import sys
+
+from simplex.batch import find_lp_files
+from simplex.benchmark import benchmark_configs, run_benchmark, compare_results, save_report, load_report
+from simplex.simplex_dictionary import PivotMethod, InitializationFn, SolveMode
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmarks the solver on every LP under each pivot method and initialization function")
+    parser.add_argument('inputs', nargs='*', default=sorted(glob.glob('data/test_LPs_volume*/input')),
+        help="LP files or directories of LP files (default: data/test_LPs_volume*/input)")
+    parser.add_argument('--mode', choices=[mode.name for mode in SolveMode], default=SolveMode.DICTIONARY.name,
+        help="dictionary implementation to solve with (default: %(default)s)")
+    parser.add_argument('--pivot', nargs='+', choices=[method.name for method in PivotMethod], default=[method.name for method in PivotMethod],
+        help="pivot rules to benchmark (default: all)")
+    parser.add_argument('--init', nargs='+', choices=[fn.name for fn in InitializationFn], default=[fn.name for fn in InitializationFn],
+        help="initialization functions to benchmark (default: all)")
+    parser.add_argument('--output', default='benchmark_results.json',
+        help="file the results are written to (default: %(default)s)")
+    parser.add_argument('--baseline', default=None,
+        help="results file of an earlier run to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2,
+        help="fraction a time or pivot count may grow by before it is flagged as a regression (default: %(default)s)")
+    parser.add_argument('--min-time', type=float, default=0.1,
+        help="seconds a time must grow by before it is flagged as a regression (default: %(default)s)")
+    parser.add_argument('--jobs', type=int, default=1,
+        help="number of LPs solved at once. More than 1 is faster, but makes the times noisier (default: %(default)s)")
+    parser.add_argument('--timeout', type=float, default=None,
+        help="seconds after which an LP is stopped (default: no limit)")
+    return parser.parse_args()
+
+def print_progress(record):
+    sys.stderr.write(f"{record['config']:<50} {record['file']:<60} {record['status']:<10} {record['time']:8.2f}s\n")
+
+def print_changes(title, changes):
+    sys.stderr.write(f"\n{title}: {len(changes)}\n")
+    for change in changes:
+        sys.stderr.write(f"  {change['config']:<50} {change['file']:<60} {change['metric']:<12} {change['baseline']} -> {change['current']}\n")
+
+def main():
+    args = parse_args()
+
+    configs = benchmark_configs([PivotMethod[name] for name in args.pivot], [InitializationFn[name] for name in args.init], SolveMode[args.mode])
+    report = run_benchmark(find_lp_files(args.inputs), configs, args.jobs, args.timeout, print_progress)
+    save_report(report, args.output)
+    sys.stderr.write(f"\nResults written to {args.output}\n")
+
+    mismatches = [record for record in report['records'] if record['matches_expected'] is False]
+    print_changes("Outputs different from expected", [{**record, 'metric': 'output', 'baseline': 'expected', 'current': record['status']} for record in mismatches])
+
+    if args.baseline is not None:
+        (regressions, improvements) = compare_results(report, load_report(args.baseline), args.threshold, args.min_time)
+        print_changes("Improvements", improvements)
+        print_changes("Regressions", regressions)
+
+        if len(regressions) > 0:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# Author: Tyrone Lagore V00995698
+
+import io
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+
+from collections import deque
+from multiprocessing.connection import wait
+
+import simplex.simplex_parser as sp
+
+def find_lp_files(paths):
+    """
+    Expands the given paths into a list of LP files. Directories are replaced by the files
+    directly inside them, in sorted order
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += [os.path.join(path, name) for name in sorted(os.listdir(path)) if os.path.isfile(os.path.join(path, name))]
+        elif os.path.isfile(path):
+            files.append(path)
+        else:
+            raise Exception(f"find_lp_files():: '{path}' is not a file or directory")
+
+    return files
+
+def make_result(path, status, output='', stats=None, elapsed=0, error=None):
+    """ result dictionary of a solved LP, see solve_batch """
+    return {'file': path, 'status': status, 'output': output, 'stats': stats, 'time': elapsed, 'error': error}
+
+def solve_file(path, config, connection):
+    """
+    Solves the LP in path and sends its result back through connection. This is run in its own process,
+    the solution the solver prints is captured and its progress messages are discarded
+    """
+    start = time.perf_counter()
+    sys.stdout = io.StringIO()
+    sys.stderr = open(os.devnull, 'w')
+
+    try:
+        with open(path) as in_file:
+            solver = sp.parse(in_file, config)
+
+        solver.solve()
+        output = sys.stdout.getvalue()
+        result = make_result(path, output.split('\n', 1)[0], output, solver.stats.to_dict(), time.perf_counter() - start)
+    except Exception:
+        result = make_result(path, 'error', elapsed=time.perf_counter() - start, error=traceback.format_exc())
+
+    connection.send(result)
+    connection.close()
+
+def solve_batch(paths, config, jobs=None, timeout=None):
+    """
+    Solves each of the LP files in paths, running up to jobs of them at once in separate processes.
+
+    LPs taking longer than timeout seconds are stopped, so a slow LP only holds up its own process.
+
+    Yields a result dictionary for each LP, in the order they finish:
+        file: the LP file
+        status: optimal, infeasible or unbounded, limit if a limit of config stopped it, or timeout / error if the LP was not solved
+        output: what the solver printed for the LP
+        stats: the solver's SimplexStats, as returned by SimplexStats.to_dict()
+        time: wall clock seconds spent on the LP, including parsing
+        error: the traceback if the status is error
+    """
+    if jobs is None:
+        jobs = multiprocessing.cpu_count()
+
+    pending = deque(paths)
+    # connection -> (path, process, start time)
+    running = {}
+
+    try:
+        while len(pending) > 0 or len(running) > 0:
+            while len(pending) > 0 and len(running) < jobs:
+                path = pending.popleft()
+                (connection, child_connection) = multiprocessing.Pipe(duplex=False)
+                process = multiprocessing.Process(target=solve_file, args=(path, config, child_connection))
+                process.start()
+                child_connection.close()
+                running[connection] = (path, process, time.perf_counter())
+
+            wait_time = None
+            if timeout is not None:
+                oldest = min(start for (_, _, start) in running.values())
+                wait_time = max(0, oldest + timeout - time.perf_counter())
+
+            for connection in wait(list(running), wait_time):
+                (path, process, start) = running.pop(connection)
+                try:
+                    result = connection.recv()
+                    process.join()
+                except EOFError:
+                    process.join()
+                    result = make_result(path, 'error', elapsed=time.perf_counter() - start, error=f'solver process exited with code {process.exitcode}')
+
+                connection.close()
+                yield result
+
+            if timeout is not None:
+                now = time.perf_counter()
+                for connection, (path, process, start) in list(running.items()):
+                    if now - start >= timeout:
+                        del running[connection]
+                        process.terminate()
+                        process.join()
+                        connection.close()
+                        yield make_result(path, 'timeout', elapsed=now - start)
+    finally:
+        # stop whatever is still running if the caller stops early
+        for connection, (_, process, _) in running.items():
+            process.terminate()
+            process.join()
+            connection.close()
@@ -0,0 +1,130 @@
+# Author: Tyrone Lagore V00995698
+
+import json
+import os
+import platform
+import time
+
+from simplex.batch import solve_batch
+from simplex.simplex_dictionary import SimplexConfig
+
+# stats summed over the auxiliary (dual initialization) and primal solves
+STAT_TOTALS = ['num_pivots', 'num_degenerate_pivots', 'pivot_selection_time', 'pivot_time']
+
+def benchmark_configs(pivot_methods, initialization_functions, solve_mode):
+    """
+    A SimplexConfig for every combination of pivot method and initialization function, as a list of (name, config)
+    """
+    configs = []
+    for pivot_method in pivot_methods:
+        for initialization_function in initialization_functions:
+            config = SimplexConfig()
+            config.pivot_method = pivot_method
+            config.initialization_function = initialization_function
+            config.solve_mode = solve_mode
+            configs.append((f'{solve_mode.name}/{pivot_method.name}/{initialization_function.name}', config))
+
+    return configs
+
+def expected_output(path):
+    """
+    The expected output of an LP in data/<volume>/input/, from data/<volume>/output/, or None if there is none
+    """
+    (input_dir, filename) = os.path.split(path)
+    output_path = os.path.join(os.path.dirname(input_dir), 'output', filename)
+
+    if not os.path.isfile(output_path):
+        return None
+
+    with open(output_path) as out_file:
+        return out_file.read().strip()
+
+def make_record(config_name, result):
+    """ benchmark record of one solve_batch result """
+    record = {'config': config_name, 'file': result['file'], 'status': result['status'], 'time': result['time']}
+
+    stats = result['stats']
+    for stat in STAT_TOTALS:
+        record[stat] = None
+        if stats is not None:
+            record[stat] = stats[stat] + (0 if stats['aux_stats'] is None else stats['aux_stats'][stat])
+
+    record['aux_num_pivots'] = None if stats is None or stats['aux_stats'] is None else stats['aux_stats']['num_pivots']
+
+    expected = expected_output(result['file'])
+    record['matches_expected'] = None if expected is None or stats is None else result['output'].strip() == expected
+
+    return record
+
+def run_benchmark(files, configs, jobs=1, timeout=None, progress=None):
+    """
+    Solves every file under every (name, config) in configs
+
+    Returns the benchmark report, with a record per LP and config. progress is called with each record as it finishes
+    """
+    records = []
+    for (name, config) in configs:
+        for result in solve_batch(files, config, jobs, timeout):
+            record = make_record(name, result)
+            records.append(record)
+
+            if progress is not None:
+                progress(record)
+
+    records.sort(key=lambda record: (record['config'], record['file']))
+
+    return {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'jobs': jobs,
+        'timeout': timeout,
+        'records': records,
+    }
+
+def compare_results(report, baseline, threshold, min_time):
+    """
+    Compares each record of the report to the baseline record of the same config and file.
+
+    A record regresses if its status changed, if its pivot count grew by more than threshold (a fraction),
+    or if its wall time grew by more than threshold and by more than min_time seconds.
+
+    Returns (regressions, improvements), each a list of {config, file, metric, baseline, current}
+    """
+    baseline_records = {(record['config'], record['file']): record for record in baseline['records']}
+
+    regressions = []
+    improvements = []
+
+    def change(record, metric, base):
+        return {'config': record['config'], 'file': record['file'], 'metric': metric, 'baseline': base[metric], 'current': record[metric]}
+
+    for record in report['records']:
+        base = baseline_records.get((record['config'], record['file']))
+        if base is None:
+            continue
+
+        if record['status'] != base['status']:
+            regressions.append(change(record, 'status', base))
+            continue
+
+        if record['num_pivots'] is not None and base['num_pivots'] is not None:
+            if record['num_pivots'] > base['num_pivots']*(1 + threshold):
+                regressions.append(change(record, 'num_pivots', base))
+            elif record['num_pivots'] < base['num_pivots']*(1 - threshold):
+                improvements.append(change(record, 'num_pivots', base))
+
+        difference = record['time'] - base['time']
+        if difference > min_time and record['time'] > base['time']*(1 + threshold):
+            regressions.append(change(record, 'time', base))
+        elif -difference > min_time and record['time'] < base['time']*(1 - threshold):
+            improvements.append(change(record, 'time', base))
+
+    return (regressions, improvements)
+
+def save_report(report, path):
+    with open(path, 'w') as out_file:
+        json.dump(report, out_file, indent=2)
+
+def load_report(path):
+    with open(path) as in_file:
+        return json.load(in_file)
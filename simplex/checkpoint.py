@@ -0,0 +1,57 @@
+# Author: Tyrone Lagore V00995698
+
+import os
+import pickle
+import struct
+import zlib
+
+# bumped whenever what is saved changes, a checkpoint of another version is not loaded
+FORMAT_VERSION = 2
+
+# magic, format version
+HEADER = struct.Struct('<4sI')
+MAGIC = b'SCKP'
+
+def save(path, solver):
+    """
+    Writes a checkpoint of the SimplexSolver solver to path, see SimplexSolver.__getstate__ for what it holds.
+    The solver is pickled (its dictionary with its exact Fraction coefficients) and compressed.
+
+    The checkpoint is written under a temporary name and renamed, so a process killed while writing it leaves
+    the previous checkpoint in place
+    """
+    data = zlib.compress(pickle.dumps(solver, protocol=pickle.HIGHEST_PROTOCOL), 1)
+
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, 'wb') as checkpoint_file:
+        checkpoint_file.write(HEADER.pack(MAGIC, FORMAT_VERSION))
+        checkpoint_file.write(data)
+    os.replace(temp_path, path)
+
+def load(path):
+    """
+    The SimplexSolver saved in path by save(). Calling solve() on it continues the solve from the checkpoint
+    """
+    with open(path, 'rb') as checkpoint_file:
+        header = checkpoint_file.read(HEADER.size)
+        if len(header) != HEADER.size:
+            raise Exception(f"load():: '{path}' is not a checkpoint")
+
+        (magic, version) = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise Exception(f"load():: '{path}' is not a checkpoint")
+        if version != FORMAT_VERSION:
+            raise Exception(f"load():: '{path}' is a checkpoint of version {version}, expected {FORMAT_VERSION}")
+
+        try:
+            data = zlib.decompress(checkpoint_file.read())
+        except zlib.error:
+            raise Exception(f"load():: '{path}' is corrupt")
+
+    return pickle.loads(data)
+
+def remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
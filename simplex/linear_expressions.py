@@ -13,6 +13,45 @@ class VariableType(Enum):
     EPSILON = 3
     ZETA = 4
 
+# variable name -> (id, vartype, idx), shared by every Variable of that name, see intern_varname
+VARIABLE_TABLE = {}
+# id -> variable name
+VARIABLE_NAMES = []
+
+def intern_varname(varname: str):
+    """
+    (id, vartype, idx) of a variable name. The name is parsed the first time it is seen and given the next
+    small integer id, which LinearExpressions key their variables by. The ids are only valid in this process
+    """
+    info = VARIABLE_TABLE.get(varname)
+    if info is None:
+        (vartype, idx) = parse_varname(varname)
+        info = (len(VARIABLE_NAMES), vartype, idx)
+        VARIABLE_TABLE[varname] = info
+        VARIABLE_NAMES.append(varname)
+
+    return info
+
+def parse_varname(varname: str):
+    """ (vartype, idx) of a variable name """
+    if varname.startswith('z'):
+        return (VariableType.ZETA, 0)
+
+    vartype = None
+    if varname.startswith('c'):
+        vartype = VariableType.CONSTANT
+    elif varname.startswith('x'):
+        vartype = VariableType.X
+    elif varname.startswith('y'):
+        vartype = VariableType.Y
+    elif varname.startswith('e'):
+        vartype = VariableType.EPSILON
+
+    if varname == Variable.CONSTANT:
+        return (vartype, 0)
+
+    return (vartype, int(varname.replace('x', '').replace('y', '').replace(Variable.EPSILON, '')))
+
 class Variable():
     """ """
 
@@ -23,28 +62,22 @@ class Variable():
     # constant = 'c'
     # epsilon = 'e'
 
+    # every pivot creates and clones many variables, they do not carry a __dict__
+    __slots__ = ('coefficient', 'varname', 'id', 'vartype', 'idx')
+
     def __init__(self, varname: str, coefficient: Fraction):
         """ """
         self.coefficient = coefficient
         self.varname = varname
+        (self.id, self.vartype, self.idx) = intern_varname(varname)
 
-        if varname.startswith('z'):
-            self.vartype = VariableType.ZETA
-            self.idx = 0
-        else:
-            if varname.startswith('c'):
-                self.vartype = VariableType.CONSTANT
-            elif varname.startswith('x'):
-                self.vartype = VariableType.X
-            elif varname.startswith('y'):
-                self.vartype = VariableType.Y
-            elif varname.startswith('e'):
-                self.vartype = VariableType.EPSILON
-
-            self.idx = self.__var_idx(varname)
+    def __reduce__(self):
+        # the ids are per process, a variable is pickled (for the row workers) by its name
+        return (Variable, (self.varname, self.coefficient))
 
     def deepclone(self):
-        return Variable(self.varname, Fraction(self.coefficient.numerator, self.coefficient.denominator))
+        # Fractions are immutable, the clone can share the coefficient
+        return Variable(self.varname, self.coefficient)
 
     def to_string(self):
         msg = ''
@@ -81,12 +114,6 @@ class Variable():
             return cmp
 
 
-    def __var_idx(self, var):
-        if var == Variable.CONSTANT:
-            return 0
-        else:
-            return int(var.replace('x', '').replace('y', '').replace(Variable.EPSILON, ''))
-
     def __similarity_comp(self, a: 'Variable', b: 'Variable', type: VariableType):
         if a.vartype == type:
             if b.vartype == type:
@@ -265,6 +292,28 @@ class Variable():
         return self
 
 
+CONSTANT_ID = intern_varname(Variable.CONSTANT)[0]
+
+def compare_epsilon(mine, theirs):
+    """
+    Compares two epsilon coefficient dictionaries, as returned by LinearExpression.get_epsilon
+
+    returns -1 if theirs is smaller in terms of epsilon
+    returns +1 if theirs is larger in terms of epsilon
+    """
+    # Note a larger epsilon index means the epsilon is smaller
+    for i in sorted(mine.keys() | theirs.keys()):
+        my_coef = mine.get(i, 0)
+        their_coef = theirs.get(i, 0)
+
+        if my_coef > their_coef:
+            return -1
+        elif their_coef > my_coef:
+            return 1
+
+    return 0
+
+
 class LinearExpression():
     """
         Represents an expression in the form of z = c1x1 + c2x2 + ... cnxn
@@ -273,19 +322,35 @@ class LinearExpression():
             in_terms_of: rewrite the expression in terms of the supplied variable (must exist in rhs)
             get_var: get the variable by name
             substitute: substitude the given variable with subexpression (list of variables) 
+
+        The variables are keyed by their ids (see intern_varname), variables are still looked up by name
     """
+
+    __slots__ = ('__lhs', '__rhs', '__epsilon', '__num_terms', 'num_epsilon')
     
-    def __init__(self, lhs: Variable, rhs, epsilon=None):
+    def __init__(self, lhs: Variable, rhs, epsilon=None, clone=True):
         """
         if epsilon is supplied, it is expected to be a tuple specificing
         (my_epsilon, num_epsilons)
+
+        if clone is False the expression takes ownership of the rhs variables instead of cloning them,
+        the caller must not reuse them
         """
         self.num_epsilon = 0
-        self.set_expression(lhs, rhs, epsilon)
-        # used for the lexicographic method. epsilon is simply an integer 1-m. Used for breaking ties
+        self.set_expression(lhs, rhs, epsilon, clone)
+        # used for the lexicographic method. epsilon is simply an integer 1-m. Used for breaking ties.
+        # Only the non-zero epsilon coefficients are stored, as {index: coefficient}
     
+    def __getstate__(self):
+        # the ids are per process, the variables are pickled by name and keyed again by __setstate__
+        return (self.__lhs, list(self.__rhs.values()), self.__epsilon, self.__num_terms, self.num_epsilon)
+
+    def __setstate__(self, state):
+        (self.__lhs, rhs, self.__epsilon, self.__num_terms, self.num_epsilon) = state
+        self.__rhs = {var.id:var for var in rhs}
+
     def rhs_vars(self):
-        return [vname for vname in list(self.__rhs.keys()) if vname != Variable.CONSTANT]
+        return [var.varname for var in self.__rhs.values() if var.varname != Variable.CONSTANT]
 
     def num_terms(self):
         """ -1 for constant term """
@@ -298,82 +363,71 @@ class LinearExpression():
 
         0 cannot occur
         """
-        
-        # Note a larger epsilon index means the epsilon is smaller
-        for i in range(1, self.num_epsilon+1):
-            var = f'{Variable.EPSILON}{i}'
-            mine = self.get_var(var)
-            theirs = other.get_var(var)
-
-            if mine.coefficient > theirs.coefficient:
-                return -1
-            elif theirs.coefficient > mine.coefficient:
-                return 1
-
-        return 0
+        return compare_epsilon(self.__epsilon, other.__epsilon)
 
     def set_epsilon(self, my_epsilon, num_epsilon):
         """
         THIS SHOULD ONLY BE CALLED IMMEDIATELY AFTER A BASIS EXPR IS CREATED
 
-        Also will delete any epsilon variables from this expression and recreate them
+        Also will delete any epsilon coefficients from this expression and recreate them
         """
-        for var in list(self.__rhs.keys()):
-            if var.startswith(Variable.EPSILON):
-                del self.__rhs[var]
-
-        for i in range(1,num_epsilon+1):
-            if i == my_epsilon:
-                var = Variable(f'{Variable.EPSILON}{i}', Fraction(1))
-            else:
-                var = Variable(f'{Variable.EPSILON}{i}', Fraction(0))
-
-            self.__rhs[var.varname] = var
-
+        self.__epsilon = {my_epsilon: Fraction(1)}
         self.num_epsilon = num_epsilon
 
-    def set_expression(self, lhs: Variable, rhs: 'LinearExpression', epsilon=None):
+    def get_epsilon(self):
+        """
+        The non-zero epsilon coefficients of the expression, as {index: coefficient}
+        """
+        return self.__epsilon
+
+    def set_expression(self, lhs: Variable, rhs: 'LinearExpression', epsilon=None, clone=True):
         """
         """
         self.__lhs = lhs
 
         # create a dictionary for quick lookup of variables
         # deepclone in case caller is reusing variables
-        self.__rhs = {val.varname:val.deepclone() for val in rhs}
+        if clone:
+            self.__rhs = {val.id:val.deepclone() for val in rhs if val.vartype != VariableType.EPSILON}
+        else:
+            self.__rhs = {val.id:val for val in rhs if val.vartype != VariableType.EPSILON}
+        self.__epsilon = {val.idx:val.coefficient for val in rhs if val.vartype == VariableType.EPSILON and val.coefficient != 0}
 
         self.__num_terms = len([x for x in rhs if x.vartype == VariableType.X or x.vartype == VariableType.Y])
 
         if epsilon:
             self.set_epsilon(epsilon[0], epsilon[1])
 
-        if Variable.CONSTANT not in self.__rhs:
+        if CONSTANT_ID not in self.__rhs:
             raise Exception(f"Cannot create a linear expression without a constant term. This can be 0, but must exist with the variable name '{Variable.CONSTANT}'")
 
     def in_terms_of(self, varname: str):
-        if varname not in self.__rhs:
+        repl_val = self.get_var(varname)
+        if repl_val is None:
             raise Exception(f"in_terms_of():: Cannot rewrite expression in terms of '{varname}' because it was not found in the expression.")
 
-        repl_val = self.__rhs.pop(varname)
+        del self.__rhs[repl_val.id]
         self.__lhs.coefficient = -self.__lhs.coefficient
         repl_val.coefficient = -repl_val.coefficient
 
-        self.__rhs[self.__lhs.varname] = self.__lhs
+        self.__rhs[self.__lhs.id] = self.__lhs
         self.__lhs = repl_val
         self.__normalize()
 
         return self.__rhs.values()
 
     def get_constant(self):
-        if Variable.CONSTANT not in self.__rhs:
+        if CONSTANT_ID not in self.__rhs:
             raise Exception(f'Expression did not have a constant variable')
 
-        return self.__rhs[Variable.CONSTANT]
+        return self.__rhs[CONSTANT_ID]
 
     def get_var(self, varname: str):
-        if varname not in self.__rhs:
+        info = VARIABLE_TABLE.get(varname)
+        if info is None:
             return None
 
-        return self.__rhs[varname]
+        return self.__rhs.get(info[0])
 
     def get_lhs(self):
         return self.__lhs.deepclone()
@@ -381,15 +435,32 @@ class LinearExpression():
     def varname(self):
         return self.__lhs.varname
 
-    def substitute(self, varname: str, expr):
-        sub_var = self.__rhs.pop(varname)
+    def substitute(self, varname: str, expr, epsilon=None, drop_zeros=False):
+        """
+        epsilon is the epsilon coefficients of the substituted expression, as returned by get_epsilon.
+        If it is not supplied the epsilon coefficients of this expression are left unchanged
+
+        If drop_zeros is True, variables whose coefficient cancels out to 0 are removed instead of kept with a 0
+        coefficient, the basis expressions are kept sparse this way
+        """
+        sub_var = self.__rhs.pop(VARIABLE_TABLE[varname][0])
         
         for var in expr:
-            if var.varname in self.__rhs:
-                self.__rhs[var.varname].coefficient += (var.coefficient*sub_var.coefficient)
-            else:
-                self.__rhs[var.varname] = Variable(var.varname, var.coefficient*sub_var.coefficient)
+            existing = self.__rhs.get(var.id)
+            if existing is not None:
+                existing.coefficient += (var.coefficient*sub_var.coefficient)
+                if drop_zeros and existing.coefficient == 0 and var.varname != Variable.CONSTANT:
+                    del self.__rhs[var.id]
+            elif not drop_zeros or var.coefficient != 0 or var.varname == Variable.CONSTANT:
+                self.__rhs[var.id] = Variable(var.varname, var.coefficient*sub_var.coefficient)
 
+        if epsilon:
+            for idx, coefficient in epsilon.items():
+                updated = self.__epsilon.get(idx, 0) + coefficient*sub_var.coefficient
+                if updated != 0:
+                    self.__epsilon[idx] = updated
+                else:
+                    self.__epsilon.pop(idx, None)
 
     def __normalize(self):
         """
@@ -402,6 +473,9 @@ class LinearExpression():
         for _, var in self.__rhs.items():
             var /= self.__lhs
 
+        for idx in self.__epsilon:
+            self.__epsilon[idx] /= self.__lhs.coefficient
+
         # same as dividing by itself
         self.__lhs.coefficient = Fraction(1)
 
@@ -410,19 +484,13 @@ class LinearExpression():
 
     def lgst_eps(self):
         """ """
-        for i in range(1, self.num_epsilon+1):
-            var = f'{Variable.EPSILON}{i}'
-            eps = self.get_var(var)
-
-            if eps.coefficient > 0:
-                return (eps.idx, eps.coefficient)
+        for idx in sorted(self.__epsilon):
+            if self.__epsilon[idx] > 0:
+                return (idx, self.__epsilon[idx])
 
     def get_vars(self, include_constant=False):
         vars = []
         for var in self.__rhs.values():
-            if var.varname.startswith(Variable.EPSILON):
-                continue
-
             if include_constant or var.varname != Variable.CONSTANT:
                 vars.append(var)
 
@@ -431,7 +499,8 @@ class LinearExpression():
     def deepclone(self):
         lhs = self.__lhs.deepclone()
         rhs = [var.deepclone() for var in self.__rhs.values()]
-        new = LinearExpression(lhs, rhs)
+        new = LinearExpression(lhs, rhs, clone=False)
+        new.__epsilon = dict(self.__epsilon)
         new.num_epsilon = self.num_epsilon
 
         return new
@@ -449,17 +518,25 @@ class LinearExpression():
             return False
 
         for key, var in self.__rhs.items():
-            other_var = other.get_var(key)
+            other_var = other.__rhs.get(key)
+            if other_var is None:
+                sys.stderr.write(f"Variable: '{var.varname}' was not found\n")
+                return False
+
             if var.coefficient != other_var.coefficient:
-                sys.stderr.write(f"Variable: '{key}' did not match. {var.coefficient} != {other_var.coefficient}\n")
+                sys.stderr.write(f"Variable: '{var.varname}' did not match. {var.coefficient} != {other_var.coefficient}\n")
                 return False
 
+        if self.__epsilon != other.__epsilon:
+            sys.stderr.write(f"Epsilon did not match. {self.__epsilon} != {other.__epsilon}\n")
+            return False
+
         return True
 
     def to_string(self):
         rhs_str = ""
 
-        rhs_vars = [val for val in self.__rhs.values() if not val.varname.startswith(Variable.EPSILON)]
+        rhs_vars = list(self.__rhs.values())
         rhs_vars.sort(key=functools.cmp_to_key(lambda x,y: x.var_comp(y)))
 
         # rhs_vars.sort(key=lambda v: v.varname)
@@ -0,0 +1,190 @@
+# Author: Tyrone Lagore V00995698
+
+import array
+import hashlib
+import mmap
+import os
+import struct
+
+from fractions import Fraction
+
+from simplex.linear_expressions import LinearExpression, Variable
+
+# bumped whenever the layout changes, it is part of the key so old entries are never read
+FORMAT_VERSION = 1
+
+# magic, format version, n, m, number of non-zeros
+HEADER = struct.Struct('<4sIqqq')
+MAGIC = b'SLPC'
+
+INT64_MIN = -2**63
+INT64_MAX = 2**63 - 1
+
+class LPCache():
+    """
+    On-disk cache of parsed L.P.s, keyed by a hash of the L.P. file, so a file that was solved before does not
+    have to be tokenized again. Each entry is a compact binary file in native byte order:
+
+        header: see HEADER
+        objective function: n+1 numerators, then n+1 denominators (constant first)
+        bounds: m numerators, then m denominators
+        row starts: m+1 offsets into the non-zeros
+        columns: the 1 indexed variable of each non-zero
+        coefficients: a numerator, then a denominator, for each non-zero
+
+    all as int64. The coefficients are those of the parser's basis expressions (b - Ax), row by row.
+    An L.P. with a rational that does not fit in int64 is not cached.
+
+    Entries are memory-mapped on load. Once the entries add up to more than max_bytes, the least recently
+    used ones are evicted
+    """
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, text):
+        """ The key of the L.P. file contents text """
+        digest = hashlib.sha256(f'{FORMAT_VERSION}\n'.encode())
+        digest.update(text.encode())
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, f'{key}.lp')
+
+    def load(self, key):
+        """
+        (objective function, constraints) as parse_obj_function and parse_constraint give them, or None if the
+        L.P. is not cached. The constraints do not have epsilons yet
+        """
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as cache_file:
+                size = os.fstat(cache_file.fileno()).st_size
+                if size < HEADER.size:
+                    raise ValueError(f"'{path}' is truncated")
+
+                with mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    lp = self.__read(mapped, size)
+        except FileNotFoundError:
+            return None
+        except (ValueError, ZeroDivisionError, IndexError, struct.error):
+            # a corrupt entry (bad header, zero denominator, offset past the end) is a miss, it is replaced once the L.P. is parsed again
+            self.remove(path)
+            return None
+
+        # the modification time orders the entries for eviction
+        os.utime(path)
+        return lp
+
+    def __read(self, mapped, size):
+        (magic, version, n, m, nnz) = HEADER.unpack_from(mapped, 0)
+        if magic != MAGIC or version != FORMAT_VERSION or min(n, m, nnz) < 0 or size != HEADER.size + 8*entry_length(n, m, nnz):
+            raise ValueError("not an L.P. cache entry")
+
+        with memoryview(mapped) as view, view[HEADER.size:].cast('q') as values:
+            offset = 0
+
+            def fractions(count):
+                nonlocal offset
+                start = offset
+                offset += 2*count
+                return [Fraction(values[start+k], values[start+count+k]) for k in range(count)]
+
+            objective = fractions(n+1)
+            bounds = fractions(m)
+
+            row_starts = values[offset:offset+m+1].tolist()
+            columns = values[offset+m+1:offset+m+1+nnz].tolist()
+            offset += m+1+nnz
+
+            coefficients = [Fraction(values[offset+2*k], values[offset+2*k+1]) for k in range(nnz)]
+
+        if row_starts[0] != 0 or row_starts[-1] != nnz or any(start > end for start, end in zip(row_starts, row_starts[1:])):
+            raise ValueError("corrupt row starts")
+        if any(column < 1 or column > n for column in columns):
+            raise ValueError("corrupt columns")
+
+        obj_rhs = [Variable(Variable.CONSTANT, objective[0])]
+        obj_rhs += [Variable(f'x{j}', coef) for j, coef in enumerate(objective[1:], 1)]
+        objective_function = LinearExpression(Variable('z', Fraction(1)), obj_rhs, clone=False)
+
+        constraints = []
+        for i in range(m):
+            rhs = [Variable(Variable.CONSTANT, bounds[i])]
+            rhs += [Variable(f'x{columns[k]}', coefficients[k]) for k in range(row_starts[i], row_starts[i+1])]
+            constraints.append(LinearExpression(Variable(f'x{n+i+1}', Fraction(1)), rhs, clone=False))
+
+        return (objective_function, constraints)
+
+    def store(self, key, objective_function, constraints):
+        """
+        Caches the L.P. parsed from the file with this key, then evicts entries until the cache fits in max_bytes.
+        Returns False if the L.P. could not be cached
+        """
+        objective = [objective_function.get_constant().coefficient] + [var.coefficient for var in objective_function.get_vars()]
+        bounds = [constraint.get_constant().coefficient for constraint in constraints]
+
+        row_starts = [0]
+        columns = []
+        coefficients = []
+        for constraint in constraints:
+            for var in constraint.get_vars():
+                if var.coefficient != 0:
+                    columns.append(var.idx)
+                    coefficients += [var.coefficient.numerator, var.coefficient.denominator]
+            row_starts.append(len(columns))
+
+        (n, m, nnz) = (len(objective)-1, len(constraints), len(columns))
+        if HEADER.size + 8*entry_length(n, m, nnz) > self.max_bytes:
+            return False
+
+        ints = [value.numerator for value in objective] + [value.denominator for value in objective]
+        ints += [value.numerator for value in bounds] + [value.denominator for value in bounds]
+        ints += row_starts + columns + coefficients
+        if any(value < INT64_MIN or value > INT64_MAX for value in ints):
+            return False
+
+        # written under a temporary name and renamed, so a concurrent load never sees a partial entry
+        path = self.path(key)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as cache_file:
+            cache_file.write(HEADER.pack(MAGIC, FORMAT_VERSION, n, m, nnz))
+            array.array('q', ints).tofile(cache_file)
+        os.replace(temp_path, path)
+
+        self.evict(keep=path)
+        return True
+
+    def evict(self, keep=None):
+        """ Removes the least recently used entries, other than keep, until the cache fits in max_bytes """
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.lp'):
+                continue
+
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for (_, size, _) in entries)
+        for (_, size, path) in sorted(entries):
+            if total <= self.max_bytes:
+                break
+
+            if path != keep:
+                self.remove(path)
+                total -= size
+
+    def remove(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+def entry_length(n, m, nnz):
+    """ Number of int64 values after the header of an entry """
+    return 2*(n+1) + 2*m + (m+1) + nnz + 2*nnz
@@ -0,0 +1,177 @@
+# Author: Tyrone Lagore V00995698
+
+from fractions import Fraction
+
+from simplex.linear_expressions import LinearExpression, Variable
+from simplex.simplex_dictionary import SimplexState
+
+class Postsolve():
+    """
+    Restores the solution of the L.P. given to presolve() from the solution of the presolved L.P.
+
+        state: the result presolve found on its own (INFEASIBLE), or None if the presolved L.P. decides it
+        unbounded_if_feasible: a removed column has a positive objective function coefficient and no constraint on it
+        columns: for each original variable, the index of its variable in the presolved L.P., or None if it was removed
+        shifts: for each original variable, the value its variable in the presolved L.P. is shifted up by
+        removed_rows / removed_columns: number of constraints and variables presolve removed
+    """
+    def __init__(self, n, m):
+        self.state = None
+        self.unbounded_if_feasible = False
+        self.columns = [None]*n
+        self.shifts = [Fraction(0)]*n
+        self.removed_rows = 0
+        self.removed_columns = 0
+
+    def restore_state(self, state):
+        """ The result of the original L.P. given the result of the presolved L.P. """
+        if self.state is not None:
+            return self.state
+
+        if state == SimplexState.OPTIMAL and self.unbounded_if_feasible:
+            return SimplexState.UNBOUNDED
+
+        return state
+
+    def restore_values(self, basis_sol):
+        """
+        The value of every original variable, as [(varname, value)], given get_basis_values() of the presolved L.P.
+        """
+        values = [value for (_, value) in basis_sol]
+
+        restored = []
+        for j, (column, shift) in enumerate(zip(self.columns, self.shifts)):
+            value = 0 if column is None else values[column-1]
+            restored.append((f'x{j+1}', value + shift))
+
+        return restored
+
+    def restore_sensitivity(self, report):
+        raise Exception("restore_sensitivity():: The sensitivity analysis of a presolved L.P. is not supported")
+
+def presolve(objective_function, constraints):
+    """
+    Presolves the L.P. max c^T x s.t. Ax <= b, x >= 0, given as the objective function and basis expressions from the parser.
+    These reductions are repeated until none applies:
+
+        a row with no positive coefficient and a non-negative bound can never be violated, it is removed
+        a row with no negative coefficient and a negative bound can never be satisfied, the L.P. is infeasible
+        a row with no negative coefficient and a bound of 0 forces each of its variables to 0, they are removed with the row
+        a singleton row a x_j <= b with a < 0 and b < 0 is a lower bound, x_j is shifted up by b/a and the row removed
+        a column with no coefficients is removed, at 0 if its objective function coefficient is not positive.
+            Otherwise the L.P. is unbounded unless it is infeasible
+        of rows that are positive multiples of each other, only the tightest is kept
+
+    Returns (objective function, constraints, Postsolve) where the presolved L.P. is in the parser's form, with its variables
+    and constraints renumbered in their original order. The constraints do not have epsilons yet
+    """
+    costs = [var.coefficient for var in objective_function.get_vars()]
+    constant = objective_function.get_constant().coefficient
+    (n, m) = (len(costs), len(constraints))
+
+    # the basis expressions hold b - Ax
+    rows = [{var.idx - 1: -var.coefficient for var in constraint.get_vars() if var.coefficient != 0} for constraint in constraints]
+    bounds = [constraint.get_constant().coefficient for constraint in constraints]
+
+    postsolve = Postsolve(n, m)
+    active_rows = set(range(m))
+    active_columns = set(range(n))
+    column_rows = [set() for _ in range(n)]
+    for i, row in enumerate(rows):
+        for j in row:
+            column_rows[j].add(i)
+
+    def remove_row(i):
+        active_rows.discard(i)
+        for j in rows[i]:
+            column_rows[j].discard(i)
+
+    def remove_column(j):
+        active_columns.discard(j)
+        for i in column_rows[j]:
+            del rows[i][j]
+
+    changed = True
+    while changed and postsolve.state is None:
+        changed = False
+
+        for i in sorted(active_rows):
+            row = rows[i]
+            if all(coef <= 0 for coef in row.values()):
+                if bounds[i] >= 0:
+                    remove_row(i)
+                    changed = True
+                    continue
+
+                if len(row) == 1:
+                    # a x_j <= b with a, b < 0 is x_j >= b/a
+                    [(j, coef)] = row.items()
+                    shift = bounds[i]/coef
+                    remove_row(i)
+
+                    postsolve.shifts[j] += shift
+                    constant += costs[j]*shift
+                    for k in column_rows[j]:
+                        bounds[k] -= rows[k][j]*shift
+
+                    changed = True
+                    continue
+
+            if all(coef >= 0 for coef in row.values()):
+                if bounds[i] < 0:
+                    postsolve.state = SimplexState.INFEASIBLE
+                    break
+
+                if bounds[i] == 0:
+                    for j in list(row):
+                        remove_column(j)
+
+                    remove_row(i)
+                    changed = True
+
+        for j in sorted(active_columns):
+            if len(column_rows[j]) == 0:
+                if costs[j] > 0:
+                    postsolve.unbounded_if_feasible = True
+
+                remove_column(j)
+                changed = True
+
+        # rows scaled so their first coefficient is +-1 are equal if the rows are positive multiples of each other
+        tightest = {}
+        for i in sorted(active_rows):
+            if len(rows[i]) == 0:
+                continue
+
+            scale = abs(rows[i][min(rows[i])])
+            key = tuple(sorted((j, coef/scale) for j, coef in rows[i].items()))
+            if key not in tightest:
+                tightest[key] = i
+                continue
+
+            kept = tightest[key]
+            if bounds[i]/scale < bounds[kept]/abs(rows[kept][min(rows[kept])]):
+                (kept, i) = (i, kept)
+                tightest[key] = kept
+
+            remove_row(i)
+            changed = True
+
+    postsolve.removed_rows = m - len(active_rows)
+    postsolve.removed_columns = n - len(active_columns)
+
+    columns = sorted(active_columns)
+    for new_j, j in enumerate(columns):
+        postsolve.columns[j] = new_j + 1
+
+    obj_rhs = [Variable(Variable.CONSTANT, constant)]
+    obj_rhs += [Variable(f'x{new_j+1}', costs[j]) for new_j, j in enumerate(columns)]
+    reduced_objective = LinearExpression(Variable('z', Fraction(1)), obj_rhs, clone=False)
+
+    reduced_constraints = []
+    for new_i, i in enumerate(sorted(active_rows)):
+        rhs = [Variable(Variable.CONSTANT, bounds[i])]
+        rhs += [Variable(f'x{new_j+1}', -rows[i][j]) for new_j, j in enumerate(columns) if j in rows[i]]
+        reduced_constraints.append(LinearExpression(Variable(f'x{len(columns)+new_i+1}', Fraction(1)), rhs, clone=False))
+
+    return (reduced_objective, reduced_constraints, postsolve)
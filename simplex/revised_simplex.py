@@ -0,0 +1,694 @@
+# Author: Tyrone Lagore V00995698
+
+import sys
+
+import numpy as np
+
+from fractions import Fraction
+from simplex.linear_expressions import LinearExpression, Variable
+from simplex.simplex_dictionary import SimplexConfig, PivotMethod, SimplexState, dual_init_coefficients, best_priced, check_basis, CandidateList, DEVEX_RESET_FACTOR, DUAL_DEGENERATE_LIMIT
+from simplex.sparse_lu import SparseLU
+
+class RevisedSimplex():
+    """
+    Revised simplex method. Instead of a dictionary, keeps the constraint matrix A of
+
+        max c^T x s.t. A x + w = b
+
+    in sparse column form, along with a sparse LU factorization of the basis matrix B.
+
+    Variables are tracked by index. Variables 1..n are the columns of A and variable n+i is the slack of row i.
+    The dictionary this represents is never built, each iteration only needs:
+        btran: y^T = c_B^T B^-1, for the objective function coefficients c_j - y^T a_j
+        ftran: B^-1 a_j, the (negated) column of the entering variable for the ratio test
+
+    Each pivot appends an eta to the factorization, which is refactorized every REFACTOR_FREQUENCY pivots.
+
+    Steepest edge and Devex pricing keep a weight per variable. Their updates need the pivot row,
+    row r of B^-1 A from btran(e_r), and for steepest edge the products of the entering column B^-1 a_q
+    with the other columns, a_j^T btran(B^-1 a_q).
+
+    Pivots are chosen exactly like SimplexDictionary chooses them, including the order the objective function
+    variables are visited in (obj_order) and the lexicographic tie-breaking. The epsilon of a basis row is
+    row i of B^-1 B0 (B0 is the basis the epsilons were added at), and is only computed when there is a tie.
+    """
+    DEBUG = False
+
+    TOLERANCE = 1e-9
+
+    # basic variable values smaller than this are round-off and are flushed to 0
+    ZERO_TOLERANCE = 1e-11
+
+    REFACTOR_FREQUENCY = 50
+
+    def __init__(self, objective_function: LinearExpression, constraints, config = None):
+        """ """
+        if config is None:
+            self.config = SimplexConfig()
+        else:
+            self.config = config
+
+        self.is_dual = False
+        self.__weights_method = None
+        self.__dual_degenerate_pivots = 0
+        self.__reset_candidates()
+
+        self.n = objective_function.num_terms()
+        self.m = len(constraints)
+        self.num_x = self.n
+
+        obj_vars = objective_function.get_vars()
+        if [var.idx for var in obj_vars] != list(range(1, self.n+1)):
+            raise Exception("RevisedSimplex:: objective function variables must be x1..xn")
+
+        self.constant = float(objective_function.get_constant().coefficient)
+        self.costs = np.zeros(self.n + self.m + 1)
+        self.costs[1:self.n+1] = [float(var.coefficient) for var in obj_vars]
+
+        self.rhs = np.array([float(constraint.get_constant().coefficient) for constraint in constraints])
+
+        # The dictionary holds -A, so negate the coefficients
+        entries = []
+        for i, constraint in enumerate(constraints):
+            if Variable(constraint.varname(), 0).idx != self.n + i + 1:
+                raise Exception(f"RevisedSimplex:: basis expression {i+1} must be for variable x{self.n+i+1}")
+
+            for var in constraint.get_vars():
+                if var.coefficient != 0:
+                    entries.append((i, var.idx, -float(var.coefficient)))
+
+        self.__set_matrix(entries)
+
+        self.perturbed = any(constraint.num_epsilon > 0 for constraint in constraints)
+
+        self.basic = list(range(self.n+1, self.n+self.m+1))
+        self.__reset_perturbation()
+
+        # order the variables are visited in by the objective function and the basis expressions
+        self.obj_order = list(range(1, self.n+1))
+        self.row_order = list(range(1, self.n+1))
+
+        self.refactor()
+        self.update_state(init=True)
+
+    def debug_print(self, msg):
+        if self.DEBUG:
+            sys.stderr.write("{0}\n".format(msg))
+
+    def __set_matrix(self, entries):
+        """
+        entries is a list of (row, var_idx, value) for the columns of A, stored in compressed sparse column form
+        """
+        entries.sort(key=lambda entry: (entry[1], entry[0]))
+        self.col_rows = np.array([row for (row, _, _) in entries], dtype=np.int64)
+        self.col_vars = np.array([var_idx for (_, var_idx, _) in entries], dtype=np.int64)
+        self.col_values = np.array([value for (_, _, value) in entries], dtype=np.float64)
+        self.col_start = np.searchsorted(self.col_vars, np.arange(1, self.n+2))
+
+    def __column(self, var_idx):
+        """ sparse column of a variable as {row: value} """
+        if var_idx > self.n:
+            return {var_idx - self.n - 1: 1.0}
+
+        (start, end) = (self.col_start[var_idx-1], self.col_start[var_idx])
+        return dict(zip(self.col_rows[start:end].tolist(), self.col_values[start:end].tolist()))
+
+    def __dense_column(self, var_idx):
+        column = [0.0]*self.m
+        for row, value in self.__column(var_idx).items():
+            column[row] = value
+        return column
+
+    def __reset_perturbation(self):
+        """ Each basis row gets its own epsilon at the current basis """
+        self.eps_basis = list(self.basic)
+        self.eps_is_slack = self.eps_basis == list(range(self.n+1, self.n+self.m+1))
+
+    def refactor(self):
+        """
+        Factorizes the basis from scratch and recomputes the basic variable values
+        """
+        self.lu = SparseLU([self.__column(var_idx) for var_idx in self.basic], self.m)
+        self.values = np.array(self.lu.ftran(self.rhs))
+        self.values[np.abs(self.values) < self.ZERO_TOLERANCE] = 0
+        self.__reduced_costs = None
+
+    def var_name(self, var_idx):
+        return f"{'y' if self.is_dual else 'x'}{var_idx}"
+
+    def __row_products(self, vector):
+        """
+        a_j^T vector for every column a_j of [A I], indexed by variable
+        """
+        vector = np.asarray(vector)
+        products = np.zeros(self.n + self.m + 1)
+        products[1:self.n+1] = np.bincount(self.col_vars - 1, weights=self.col_values*vector[self.col_rows], minlength=self.n)
+        products[self.n+1:] = vector
+        return products
+
+    def reduced_costs(self):
+        """
+        Objective function coefficients of every variable (0 for basic variables), indexed by variable
+        """
+        if self.__reduced_costs is None:
+            duals = np.array(self.lu.btran(self.costs[self.basic]))
+
+            costs = self.costs.copy()
+            costs[1:self.n+1] -= np.bincount(self.col_vars - 1, weights=self.col_values*duals[self.col_rows], minlength=self.n)
+            costs[self.n+1:] -= duals
+            costs[self.basic] = 0
+
+            self.__reduced_costs = costs
+
+        return self.__reduced_costs
+
+    def __value(self, value):
+        if abs(value) < self.TOLERANCE:
+            return 0.0
+        return float(value)
+
+    def get_state(self):
+        return self.__state
+
+    def get_objective_value(self):
+        return self.__value(self.constant + self.costs[self.basic] @ self.values)
+
+    def get_basis_values(self):
+        """
+        """
+        positions = {var_idx: position for position, var_idx in enumerate(self.basic)}
+
+        basis_sol = []
+        for var_idx in range(1, self.num_x+1):
+            position = positions.get(var_idx)
+            basis_sol += [(self.var_name(var_idx), 0 if position is None else self.__value(self.values[position]))]
+
+        return basis_sol
+
+    def get_basis(self):
+        """
+        Names of the basic variables, ordered by index
+        """
+        if self.is_dual:
+            raise Exception("get_basis():: The dictionary is a dual dictionary, it has no basis of the original L.P.")
+
+        return [self.var_name(var_idx) for var_idx in sorted(self.basic)]
+
+    def set_basis(self, basis):
+        """
+        Pivots to the given basis, choosing the leaving positions like SimplexDictionary.set_basis.
+        The epsilons start over at the new basis
+        """
+        if self.is_dual:
+            raise Exception("set_basis():: Cannot set the basis of a dual dictionary")
+
+        check_basis(basis, self.n, self.m)
+        target = {Variable(varname, 0).idx for varname in basis}
+
+        for var_idx in sorted(target):
+            if var_idx in self.basic:
+                continue
+
+            alpha = np.asarray(self.lu.ftran(self.__dense_column(var_idx)))
+            positions = [position for position in range(self.m) if self.basic[position] not in target and abs(alpha[position]) > self.TOLERANCE]
+            if len(positions) == 0:
+                raise Exception(f"set_basis():: The basis is singular, '{self.var_name(var_idx)}' cannot enter the basis")
+
+            self.pivot(var_idx, (max(positions, key=lambda position: abs(alpha[position])), alpha))
+
+        self.__reset_perturbation()
+        self.refactor()
+        self.update_state()
+
+    def update_state(self, init=False):
+        """
+        """
+        self.__state = SimplexState.FEASIBLE
+
+        if self.__optimal():
+            self.__state = SimplexState.OPTIMAL
+        elif (self.values < -self.TOLERANCE).any():
+            self.__state = SimplexState.INFEASIBLE
+        elif init:
+            costs = self.reduced_costs()
+            for var_idx in self.obj_order:
+                if costs[var_idx] > self.TOLERANCE and max(self.lu.ftran(self.__dense_column(var_idx)), default=0) <= self.TOLERANCE:
+                    self.__state = SimplexState.UNBOUNDED
+                    break
+
+    def __optimal(self):
+        return not (self.reduced_costs()[self.obj_order] > self.TOLERANCE).any() and not (self.values < -self.TOLERANCE).any()
+
+    def __no_entering_variable(self):
+        if self.__optimal():
+            self.__state = SimplexState.OPTIMAL
+        else:
+            self.__state = SimplexState.INFEASIBLE
+
+    def __filter_largest(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        largest = values.max()
+        return list(np.flatnonzero(values >= largest - self.TOLERANCE*max(1.0, abs(largest))))
+
+    def get_pivot(self, pivot_type):
+        """
+        Gets the entering variable and the leaving (basis position, ftran of entering column) for a specific pivot
+        """
+        self.__eps_rows = {}
+
+        if pivot_type == PivotMethod.LARGEST_COEFFICIENT:
+            return self.__get_largest_coefficient_pivot()
+        elif pivot_type == PivotMethod.LARGEST_INCREASE:
+            return self.__get_largest_increase_pivot()
+        elif pivot_type == PivotMethod.STEEPEST_EDGE or pivot_type == PivotMethod.DEVEX:
+            return self.__get_priced_pivot(pivot_type)
+
+        return (None, None)
+
+    def __reset_candidates(self):
+        self.__candidates = None
+        if self.config.pricing_chunk_size is not None:
+            self.__candidates = CandidateList(self.config.pricing_chunk_size)
+
+    def __entering_candidates(self):
+        """
+        The variables with a positive objective function coefficient, in order. With partial pricing, only those of the candidate list
+        """
+        costs = self.reduced_costs()
+        if self.__candidates is None:
+            return [var_idx for var_idx in self.obj_order if costs[var_idx] > self.TOLERANCE]
+
+        return self.__candidates.select(lambda var_idxs: list(costs[var_idxs] > self.TOLERANCE), lambda: self.obj_order)
+
+    def __get_largest_coefficient_pivot(self):
+        candidates = self.__entering_candidates()
+
+        if len(candidates) == 0:
+            self.__no_entering_variable()
+            return (None, None)
+
+        entering_var = candidates[self.__filter_largest(self.reduced_costs()[candidates])[0]]
+
+        alpha = self.lu.ftran(self.__dense_column(entering_var))
+        (positions, _) = self.__ratio_test(alpha)
+
+        if len(positions) == 0:
+            self.__state = SimplexState.UNBOUNDED
+            return (None, None)
+
+        return (entering_var, (self.__break_ties(positions), alpha))
+
+    def __reset_weights(self, pivot_type):
+        """
+        Starts the edge weights (indexed by variable) of steepest edge or Devex pricing over at the current basis.
+        Steepest edge weights are 1 + |B^-1 a_j|^2, the reference framework of Devex is the set of current non-basic variables
+        """
+        self.__weights_method = pivot_type
+        self.__weights = np.ones(self.n + self.m + 1)
+
+        if pivot_type == PivotMethod.STEEPEST_EDGE:
+            for var_idx in self.obj_order:
+                alpha = np.asarray(self.lu.ftran(self.__dense_column(var_idx)))
+                self.__weights[var_idx] += alpha @ alpha
+        elif pivot_type == PivotMethod.DEVEX:
+            self.__reference = set(self.obj_order)
+
+    def __get_priced_pivot(self, pivot_type):
+        """
+        The entering variable has the largest c_j^2 / w_j, the leaving position is found with the usual ratio test
+        """
+        if self.__weights_method != pivot_type:
+            self.__reset_weights(pivot_type)
+
+        candidates = self.__entering_candidates()
+
+        if len(candidates) == 0:
+            self.__no_entering_variable()
+            return (None, None)
+
+        scores = self.reduced_costs()[candidates]**2 / self.__weights[candidates]
+        entering_var = candidates[best_priced(scores)]
+
+        alpha = self.lu.ftran(self.__dense_column(entering_var))
+        (positions, _) = self.__ratio_test(alpha)
+
+        if len(positions) == 0:
+            self.__state = SimplexState.UNBOUNDED
+            return (None, None)
+
+        return (entering_var, (self.__break_ties(positions), alpha))
+
+    def __update_weights(self, entering_var, position, alpha):
+        """
+        Updates the edge weights for a pivot, before the factorization is updated. With p = alpha[position]
+        and a_j = (B^-1 a_j)[position] / p for each non-basic variable j:
+
+        steepest edge: w_j = w_j - 2 a_j (e_j . e_q) + a_j^2 w_q, at least 1 + a_j^2, and w_leaving = w_q / p^2
+        Devex: w_j = max(w_j, a_j^2 w_q) and w_leaving = max(w_q / p^2, 1)
+        """
+        unit = [0.0]*self.m
+        unit[position] = 1.0
+
+        nonbasic = [var_idx for var_idx in self.obj_order if var_idx != entering_var]
+        pivot = alpha[position]
+        ratios = self.__row_products(self.lu.btran(unit))[nonbasic] / pivot
+
+        weights = self.__weights
+        if self.__weights_method == PivotMethod.STEEPEST_EDGE:
+            products = self.__row_products(self.lu.btran(alpha.tolist()))[nonbasic]
+
+            # the exact weight of the entering variable is known, so use it instead of the updated one
+            entering_weight = 1 + alpha @ alpha
+            weights[nonbasic] = np.maximum(weights[nonbasic] - 2*ratios*products + ratios**2*entering_weight, 1 + ratios**2)
+        else:
+            in_reference = np.array([var_idx in self.__reference for var_idx in self.basic], dtype=bool)
+            reference_weight = (1 if entering_var in self.__reference else 0) + (alpha[in_reference]**2).sum()
+
+            if weights[entering_var] > DEVEX_RESET_FACTOR*reference_weight:
+                self.__reference = set(self.obj_order)
+                weights[:] = 1
+
+            entering_weight = weights[entering_var]
+            weights[nonbasic] = np.maximum(weights[nonbasic], ratios**2*entering_weight)
+
+        weights[self.basic[position]] = max(entering_weight / pivot**2, 1.0)
+
+    def __get_largest_increase_pivot(self):
+        candidates = self.__entering_candidates()
+
+        if len(candidates) == 0:
+            self.__no_entering_variable()
+            return (None, None)
+
+        costs = self.reduced_costs()
+        bounded = []
+        for var_idx in candidates:
+            alpha = self.lu.ftran(self.__dense_column(var_idx))
+            (positions, bound) = self.__ratio_test(alpha)
+
+            if len(positions) > 0:
+                bounded.append((var_idx, positions, alpha, bound*costs[var_idx]))
+
+        if len(bounded) == 0:
+            # we had positive variables in our non-basic, but nothing to pivot out
+            self.__state = SimplexState.UNBOUNDED
+            return (None, None)
+
+        # break ties based on lexicographical anti-cycling, first one wins on equal epsilon
+        (entering_var, leaving) = (None, None)
+        for i in self.__filter_largest([increase for (_, _, _, increase) in bounded]):
+            (var_idx, positions, alpha, _) = bounded[i]
+            position = self.__break_ties(positions)
+
+            if leaving is None or self.__lex_greater(position, leaving[0]):
+                (entering_var, leaving) = (var_idx, (position, alpha))
+
+        return (entering_var, leaving)
+
+    def __ratio_test(self, alpha):
+        """
+        The dictionary coefficient of the entering variable in basis row i is -alpha[i]
+        Returns the positions tied for the smallest bound, and the bound
+        """
+        alpha = np.asarray(alpha)
+        positions = np.flatnonzero(alpha > self.TOLERANCE)
+
+        if len(positions) == 0:
+            return ([], None)
+
+        bounds = self.values[positions] / alpha[positions]
+        smallest = bounds.min()
+        tied = positions[bounds <= smallest + self.TOLERANCE*max(1.0, abs(smallest))]
+
+        return (list(tied), smallest)
+
+    def __eps_row(self, position):
+        """
+        Epsilon coefficients of a basis row, row position of B^-1 B0
+        """
+        if position not in self.__eps_rows:
+            unit = [0.0]*self.m
+            unit[position] = 1.0
+            row = self.lu.btran(unit)
+
+            if self.eps_is_slack:
+                eps = np.array(row)
+            else:
+                eps = np.array([sum(row[i]*value for i, value in self.__column(var_idx).items()) for var_idx in self.eps_basis])
+
+            self.__eps_rows[position] = eps
+
+        return self.__eps_rows[position]
+
+    def __lex_greater(self, first, second):
+        if not self.perturbed:
+            return False
+
+        diff = self.__eps_row(first) - self.__eps_row(second)
+        nonzero = np.flatnonzero(np.abs(diff) > self.TOLERANCE)
+        return len(nonzero) > 0 and diff[nonzero[0]] > 0
+
+    def __break_ties(self, positions):
+        """
+        Break ties using the lexicographical method, the row with the largest epsilon wins
+        """
+        top = positions[0]
+        for position in positions[1:]:
+            if self.__lex_greater(position, top):
+                top = position
+
+        return top
+
+    def describe_pivot(self, entering_var, leaving):
+        """
+        (entering variable name, leaving variable name, basis position of the leaving variable) of a pivot
+        """
+        (position, _) = leaving
+        return (self.var_name(entering_var), self.var_name(self.basic[position]), position)
+
+    def pivot(self, entering_var, leaving):
+        """
+        Pivots entering_var into the basis at the leaving basis position
+        """
+        (position, alpha) = leaving
+        alpha = np.asarray(alpha)
+        leaving_var = self.basic[position]
+
+        if self.__weights_method is not None:
+            self.__update_weights(entering_var, position, alpha)
+
+        step = self.values[position] / alpha[position]
+        self.values -= step*alpha
+        self.values[position] = step
+        self.values[np.abs(self.values) < self.ZERO_TOLERANCE] = 0
+
+        self.basic[position] = entering_var
+
+        # the leaving variable is appended to the end of every expression
+        self.obj_order.remove(entering_var)
+        self.obj_order.append(leaving_var)
+        self.row_order.remove(entering_var)
+        self.row_order.append(leaving_var)
+
+        if self.lu.num_updates() >= self.REFACTOR_FREQUENCY:
+            self.refactor()
+        else:
+            self.lu.update(position, alpha.tolist())
+            self.__reduced_costs = None
+
+        self.update_state()
+
+    def as_dual_init(self):
+        """
+        Replaces the objective function for dual initialization, then takes the dual
+
+        Returns the original objective function as (constant, [(var_idx, coefficient)])
+        """
+        orig_fn = (self.constant, [(var_idx, self.costs[var_idx]) for var_idx in self.obj_order])
+
+        coefficients = dual_init_coefficients(self.n, self.config.initialization_function)
+
+        self.constant = 0.0
+        self.costs = np.zeros(self.n + self.m + 1)
+        self.costs[1:self.n+1] = [-coef for coef in coefficients]
+        self.obj_order = list(range(1, self.n+1))
+        self.__reduced_costs = None
+
+        self.as_dual_nf()
+
+        return orig_fn
+
+    def as_dual_feasible(self):
+        """
+        Replaces the non-negative objective function coefficients with the negated initialization function
+        coefficients, making the dictionary dual feasible for the dual simplex.
+
+        The objective function is rewritten in terms of the non-basic variables first (the costs become the
+        objective function coefficients, and the objective value the constant), so this works from any basis
+
+        Returns the original objective function as (constant, [(var_idx, coefficient)])
+        """
+        costs = self.reduced_costs()
+        constant = self.constant + self.costs[self.basic] @ self.values
+        orig_fn = (constant, [(var_idx, costs[var_idx]) for var_idx in self.obj_order])
+
+        coefficients = dual_init_coefficients(self.n, self.config.initialization_function)
+
+        self.constant = constant
+        self.costs = np.zeros(self.n + self.m + 1)
+        for var_idx, coef in zip(self.obj_order, coefficients):
+            self.costs[var_idx] = costs[var_idx] if costs[var_idx] < -self.TOLERANCE else -coef
+
+        self.__reduced_costs = None
+        self.update_state()
+
+        return orig_fn
+
+    def get_dual_pivot(self):
+        """
+        Gets the entering variable and the leaving (basis position, ftran of entering column) of a dual simplex pivot,
+        chosen like SimplexDictionary.get_dual_pivot. The leaving row of the dictionary is row position of B^-1 A, from btran(e_position)
+        """
+        positions = np.flatnonzero(self.values < -self.TOLERANCE)
+        if len(positions) == 0:
+            return (None, None)
+
+        bland = self.__dual_degenerate_pivots >= DUAL_DEGENERATE_LIMIT
+        if bland:
+            position = min(positions, key=lambda position: self.basic[position])
+        else:
+            position = positions[self.__filter_largest(-self.values[positions])[0]]
+
+        unit = [0.0]*self.m
+        unit[position] = 1.0
+
+        # the dictionary coefficient of variable j in the leaving row is -row[j]
+        row = self.__row_products(self.lu.btran(unit))
+        cols = [var_idx for var_idx in self.obj_order if row[var_idx] < -self.TOLERANCE]
+        if len(cols) == 0:
+            return (None, None)
+
+        costs = self.reduced_costs()
+        tied = [cols[i] for i in self.__filter_largest(costs[cols] / -row[cols])]
+        entering_var = min(tied) if bland else tied[0]
+
+        if costs[entering_var] < -self.TOLERANCE:
+            self.__dual_degenerate_pivots = 0
+        else:
+            self.__dual_degenerate_pivots += 1
+
+        return (entering_var, (position, self.lu.ftran(self.__dense_column(entering_var))))
+
+    def as_dual_nf(self):
+        """
+        Transforms the problem into its dual in normal form:
+
+            max -b^T y s.t. -A^T y + v = -c
+
+        The dual basis is the complement of the current basis, the dual basis rows are in the order
+        of the objective function variables, each with a new epsilon
+        """
+        (n, m) = (self.n, self.m)
+
+        basic = [self.__dual_var(var_idx) for var_idx in self.obj_order]
+        order = [self.__dual_var(var_idx) for var_idx in self.basic]
+
+        # row i of A becomes column i of the dual
+        entries = list(zip(self.col_vars.tolist(), (self.col_rows + 1).tolist(), (-self.col_values).tolist()))
+        costs = np.zeros(n + m + 1)
+        costs[1:m+1] = -self.rhs
+        rhs = -self.costs[1:n+1]
+
+        self.n = m
+        self.m = n
+        self.__set_matrix([(var_idx - 1, row, value) for (var_idx, row, value) in entries])
+
+        self.constant = -self.constant
+        self.costs = costs
+        self.rhs = rhs
+
+        self.basic = basic
+        self.obj_order = order
+        self.row_order = list(order)
+        self.__reset_perturbation()
+
+        self.is_dual = not self.is_dual
+        self.__weights_method = None
+        self.__reset_candidates()
+        self.refactor()
+        self.update_state()
+
+    def __dual_var(self, var_idx):
+        """
+        x1-n <-> yn+1-yn+m
+        xn+1-n+m <-> y1-m
+        """
+        if var_idx <= self.n:
+            return var_idx + self.m
+        return var_idx - self.n
+
+    def restore_objective(self, orig_fn):
+        """
+        Sets the original objective function (as returned by as_dual_init) as the objective function.
+        The objective function variables are ordered as if they were substituted into a dictionary.
+        """
+        (constant, terms) = orig_fn
+
+        basic = set(self.basic)
+        order = [var_idx for (var_idx, _) in terms]
+        present = set(order)
+
+        self.costs = np.zeros(self.n + self.m + 1)
+        for (var_idx, coef) in terms:
+            self.costs[var_idx] = coef
+
+            if var_idx in basic:
+                order.remove(var_idx)
+                present.discard(var_idx)
+                for row_var in self.row_order:
+                    if row_var not in present:
+                        order.append(row_var)
+                        present.add(row_var)
+
+        self.constant = constant
+        self.obj_order = order
+        self.__reduced_costs = None
+        self.update_state()
+
+    def close(self):
+        """ Nothing to release, the dictionary is solved in this process """
+        pass
+
+    def get_dictionary(self):
+        """
+        The dictionary as LinearExpressions, (objective function, [basis expression of each basis position])
+        """
+        costs = self.reduced_costs()
+
+        # LinearExpressions hold Fractions, the floats convert exactly
+        obj_vars = [Variable(Variable.CONSTANT, Fraction(self.get_objective_value()))]
+        obj_vars += [Variable(self.var_name(var_idx), Fraction(self.__value(costs[var_idx]))) for var_idx in self.obj_order]
+        objective_function = LinearExpression(Variable('z', Fraction(1)), obj_vars, clone=False)
+
+        columns = {var_idx: self.lu.ftran(self.__dense_column(var_idx)) for var_idx in self.obj_order}
+        basis_exprs = []
+        for position, var_idx in enumerate(self.basic):
+            rhs_vars = [Variable(Variable.CONSTANT, Fraction(self.__value(self.values[position])))]
+            rhs_vars += [Variable(self.var_name(col_var), Fraction(self.__value(-columns[col_var][position]))) for col_var in self.obj_order]
+            basis_exprs.append(LinearExpression(Variable(self.var_name(var_idx), Fraction(1)), rhs_vars, clone=False))
+
+        return (objective_function, basis_exprs)
+
+    def to_string(self):
+        (objective_function, basis_exprs) = self.get_dictionary()
+
+        msg = '\n----------------------------------\n'
+        msg += objective_function.to_string()
+        msg += '\n----------------------------------'
+
+        for basis_expr in basis_exprs:
+            msg += f'\n{basis_expr.to_string()}'
+
+        msg += '\n----------------------------------'
+
+        return msg
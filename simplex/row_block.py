@@ -0,0 +1,182 @@
+# Author: Tyrone Lagore V00995698
+
+from math import inf
+from simplex.linear_expressions import VariableType
+
+class RowBlock():
+    """
+    The basis expressions of a dictionary, in row order. The block shares the list of basis expressions
+    with the dictionary and rewrites them in place.
+
+    Keeps a lookup from variable name to the rows of the block the variable has a non-zero coefficient in,
+    so that the ratio test and pivot only visit the rows the entering variable appears in. The rows with a
+    negative constant are kept up to date the same way, only the rows a pivot rewrites are checked again.
+
+    Supported operations:
+        leaving_candidates: the rows with the smallest ratio test bound for each of the given variables
+        pivot: rewrite the leaving row in terms of the entering variable and substitute it into the other rows
+        column, column_norms, edge_products: the columns of the block, for steepest edge and Devex pricing
+        infeasible_rows, row_coefficients: the rows the dual simplex chooses between
+    """
+
+    def __init__(self, rows):
+        """ """
+        self.rows = rows
+        self.__build_occurrences()
+        self.__count_infeasible()
+
+    def __build_occurrences(self):
+        """
+        Lookup from variable name to the rows of the block it has a non-zero coefficient in
+        """
+        self.occurrences = {}
+        for row, basis_expr in enumerate(self.rows):
+            for var in basis_expr.get_vars():
+                if var.coefficient != 0:
+                    self.occurrences.setdefault(var.varname, set()).add(row)
+
+    def __count_infeasible(self):
+        self.negative_rows = {row for row, basis_expr in enumerate(self.rows) if basis_expr.get_constant().coefficient < 0}
+        return len(self.negative_rows)
+
+    def __update_infeasible(self, rows):
+        """
+        Checks the constants of the rewritten rows again, returns the number of rows with a negative constant
+        """
+        for row in rows:
+            if self.rows[row].get_constant().coefficient < 0:
+                self.negative_rows.add(row)
+            else:
+                self.negative_rows.discard(row)
+
+        return len(self.negative_rows)
+
+    def num_infeasible(self):
+        """ number of rows with a negative constant """
+        return len(self.negative_rows)
+
+    def infeasible_rows(self):
+        """
+        (row, constant) of every row of the block with a negative constant, in row order
+        """
+        return [(row, self.rows[row].get_constant().coefficient) for row in sorted(self.negative_rows)]
+
+    def row_coefficients(self, row):
+        """
+        The non-zero coefficients of a row, as {varname: coefficient}
+        """
+        return {var.varname: var.coefficient for var in self.rows[row].get_vars() if var.coefficient != 0}
+
+    def leaving_candidates(self, varnames):
+        """
+        For each variable, the smallest bound the rows of the block put on it and the rows that have that bound,
+        in row order, along with their epsilons for breaking ties:
+
+            {varname: (bound, [(row, epsilon)])}
+
+        Variables that are not bounded by any row of the block are left out.
+        """
+        candidates = {}
+
+        for varname in varnames:
+            ties = []
+            smallest_bound = inf
+
+            for row in sorted(self.occurrences.get(varname, ())):
+                basis_expr = self.rows[row]
+                candidate = basis_expr.get_var(varname)
+
+                # only look at expressions with valid bounds
+                if candidate.coefficient >= 0:
+                    continue
+
+                constant = basis_expr.get_constant()
+                bound = constant.coefficient / -candidate.coefficient
+
+                if bound < smallest_bound:
+                    smallest_bound = bound
+                    ties = [(row, basis_expr.get_epsilon())]
+                elif bound == smallest_bound:
+                    ties.append((row, basis_expr.get_epsilon()))
+
+            if len(ties) > 0:
+                candidates[varname] = (smallest_bound, ties)
+
+        return candidates
+
+    def column(self, varname):
+        """
+        The non-zero coefficients of the variable in the rows of the block, as {row: coefficient}
+        """
+        return {row: self.rows[row].get_var(varname).coefficient for row in sorted(self.occurrences.get(varname, ()))}
+
+    def column_norms(self):
+        """
+        Sum of the squares of each variable's coefficients in the rows of the block, as floats
+        """
+        norms = {}
+        for basis_expr in self.rows:
+            for var in basis_expr.get_vars():
+                norms[var.varname] = norms.get(var.varname, 0.0) + float(var.coefficient)**2
+
+        return norms
+
+    def edge_products(self, entering_varname):
+        """
+        Dot product of the entering variable's column with the column of each variable, over the rows of the block, as floats.
+        Only the rows the entering variable appears in contribute
+        """
+        products = {}
+        for row in sorted(self.occurrences.get(entering_varname, ())):
+            basis_expr = self.rows[row]
+            coefficient = float(basis_expr.get_var(entering_varname).coefficient)
+
+            for var in basis_expr.get_vars():
+                products[var.varname] = products.get(var.varname, 0.0) + coefficient*float(var.coefficient)
+
+        return products
+
+    def pivot(self, entering_varname, leaving_row):
+        """
+        Rewrites the leaving row in terms of the entering variable and substitutes it into the other rows
+
+        Returns the resultant, for substituting into the objective function
+        """
+        leaving_expr = self.rows[leaving_row]
+        resultant = list(leaving_expr.in_terms_of(entering_varname))
+        epsilon = leaving_expr.get_epsilon()
+
+        # the rows are sparse, only the expressions the entering variable appears in change
+        rows = self.occurrences.pop(entering_varname, set())
+        rows.discard(leaving_row)
+
+        for row in rows:
+            self.rows[row].substitute(entering_varname, resultant, epsilon, drop_zeros=True)
+
+        self.__update_occurrences(rows, leaving_row, resultant)
+
+        # the rows the entering variable did not appear in keep their constants
+        self.__update_infeasible(rows | {leaving_row})
+
+        return resultant
+
+    def __update_occurrences(self, rows, leaving_row, resultant):
+        """
+        Updates the occurrences of the resultant variables in the rewritten rows
+        """
+        for var in resultant:
+            if var.vartype != VariableType.X and var.vartype != VariableType.Y:
+                continue
+
+            var_rows = self.occurrences.setdefault(var.varname, set())
+
+            if var.coefficient != 0:
+                var_rows.add(leaving_row)
+            else:
+                var_rows.discard(leaving_row)
+
+            for row in rows:
+                if self.rows[row].get_var(var.varname) is not None:
+                    var_rows.add(row)
+                else:
+                    var_rows.discard(row)
@@ -0,0 +1,125 @@
+# Author: Tyrone Lagore V00995698
+
+import math
+
+from fractions import Fraction
+
+from simplex.linear_expressions import LinearExpression, Variable
+from simplex.sensitivity import SensitivityReport
+from simplex.simplex_dictionary import ScalingMethod
+
+def power_of_two(factor):
+    """ The power of two closest to factor (in log scale), as a Fraction. Scaling by it is exact in floating point """
+    return Fraction(2)**round(math.log2(factor))
+
+def geometric_pass(rows, num_columns):
+    """
+    Scales each row, then each column, by 1/sqrt(largest * smallest) of its absolute values,
+    bringing its entries closer to 1 on either side. Returns (row factors, column factors)
+    """
+    row_factors = []
+    for row in rows:
+        magnitudes = [abs(coef) for coef in row.values()]
+        row_factors.append(1.0 if len(magnitudes) == 0 else 1/math.sqrt(max(magnitudes)*min(magnitudes)))
+
+    column_magnitudes = [[] for _ in range(num_columns)]
+    for row, row_factor in zip(rows, row_factors):
+        for j, coef in row.items():
+            column_magnitudes[j].append(abs(coef)*row_factor)
+
+    column_factors = [1.0 if len(magnitudes) == 0 else 1/math.sqrt(max(magnitudes)*min(magnitudes)) for magnitudes in column_magnitudes]
+
+    return (row_factors, column_factors)
+
+def equilibration_pass(rows, num_columns):
+    """
+    Scales each row, then each column, so that its largest absolute value is 1. Returns (row factors, column factors)
+    """
+    row_factors = [1.0 if len(row) == 0 else 1/max(abs(coef) for coef in row.values()) for row in rows]
+
+    column_largest = [0.0]*num_columns
+    for row, row_factor in zip(rows, row_factors):
+        for j, coef in row.items():
+            column_largest[j] = max(column_largest[j], abs(coef)*row_factor)
+
+    column_factors = [1.0 if largest == 0 else 1/largest for largest in column_largest]
+
+    return (row_factors, column_factors)
+
+class Scaling():
+    """
+    Row and column scale factors of a scaled L.P., see scale(). The scaled L.P. is max (Sc)^T x' s.t. (RAS)x' <= Rb, x' >= 0,
+    where R and S are the diagonal matrices of row_factors and column_factors, so x = Sx'.
+
+    This is a postsolve step like presolve.Postsolve, it restores the solution of the original L.P.
+    """
+    def __init__(self, row_factors, column_factors):
+        self.state = None
+        self.row_factors = row_factors
+        self.column_factors = column_factors
+
+    def restore_state(self, state):
+        return state
+
+    def restore_values(self, basis_sol):
+        """ Unscales get_basis_values() of the scaled L.P. """
+        return [(varname, value*factor) for ((varname, value), factor) in zip(basis_sol, self.column_factors)]
+
+    def restore_sensitivity(self, report):
+        """ Unscales the sensitivity analysis of the scaled L.P. """
+        def unscale_range(value_range, factor):
+            return tuple(None if value is None else value/factor for value in value_range)
+
+        return SensitivityReport(
+            [reduced_cost/factor for reduced_cost, factor in zip(report.reduced_costs, self.column_factors)],
+            [shadow_price*factor for shadow_price, factor in zip(report.shadow_prices, self.row_factors)],
+            [unscale_range(value_range, factor) for value_range, factor in zip(report.cost_ranges, self.column_factors)],
+            [unscale_range(value_range, factor) for value_range, factor in zip(report.bound_ranges, self.row_factors)])
+
+def scale(objective_function, constraints, method, passes):
+    """
+    Scales the rows and columns of the L.P. given as the objective function and basis expressions from the parser,
+    so that the coefficients of A are closer to 1. method is a ScalingMethod:
+
+        GEOMETRIC: passes geometric mean passes, see geometric_pass
+        EQUILIBRATION: a single equilibration pass, see equilibration_pass
+        GEOMETRIC_EQUILIBRATION: passes geometric mean passes, then an equilibration pass
+
+    Every factor is rounded to a power of two, so the scaled L.P. has exactly the same solutions.
+    Returns (objective function, constraints, Scaling), the constraints do not have epsilons yet
+    """
+    n = objective_function.num_terms()
+
+    # the basis expressions hold b - Ax
+    rows = [{var.idx - 1: -float(var.coefficient) for var in constraint.get_vars() if var.coefficient != 0} for constraint in constraints]
+
+    row_factors = [Fraction(1)]*len(rows)
+    column_factors = [Fraction(1)]*n
+
+    scaling_passes = []
+    if method in (ScalingMethod.GEOMETRIC, ScalingMethod.GEOMETRIC_EQUILIBRATION):
+        scaling_passes += [geometric_pass]*passes
+    if method in (ScalingMethod.EQUILIBRATION, ScalingMethod.GEOMETRIC_EQUILIBRATION):
+        scaling_passes.append(equilibration_pass)
+
+    for scaling_pass in scaling_passes:
+        (pass_rows, pass_columns) = scaling_pass(rows, n)
+        pass_rows = [power_of_two(factor) for factor in pass_rows]
+        pass_columns = [power_of_two(factor) for factor in pass_columns]
+
+        row_factors = [factor*pass_factor for factor, pass_factor in zip(row_factors, pass_rows)]
+        column_factors = [factor*pass_factor for factor, pass_factor in zip(column_factors, pass_columns)]
+        rows = [{j: coef*float(pass_rows[i]*pass_columns[j]) for j, coef in row.items()} for i, row in enumerate(rows)]
+
+    obj_rhs = [objective_function.get_constant().deepclone()]
+    obj_rhs += [Variable(var.varname, var.coefficient*column_factors[var.idx-1]) for var in objective_function.get_vars()]
+    scaled_objective = LinearExpression(Variable('z', Fraction(1)), obj_rhs, clone=False)
+
+    scaled_constraints = []
+    for i, constraint in enumerate(constraints):
+        rhs = [Variable(Variable.CONSTANT, constraint.get_constant().coefficient*row_factors[i])]
+        # only the float modes are scaled, and their dictionaries do not need the zero coefficients
+        rhs += [Variable(var.varname, var.coefficient*row_factors[i]*column_factors[var.idx-1]) for var in constraint.get_vars() if var.coefficient != 0]
+        scaled_constraints.append(LinearExpression(Variable(constraint.varname(), Fraction(1)), rhs, clone=False))
+
+    return (scaled_objective, scaled_constraints, Scaling(row_factors, column_factors))
@@ -0,0 +1,97 @@
+# Author: Tyrone Lagore V00995698
+
+class SensitivityReport():
+    """
+    Sensitivity analysis of an optimal dictionary, for the L.P. max c^T x s.t. Ax <= b, x >= 0
+
+        reduced_costs: the objective function coefficient of each of x1 to xn in the optimal dictionary (0 if basic),
+            how much the objective value changes per unit a non-basic variable is forced up
+        shadow_prices: the dual value of each constraint, how much the objective value changes per unit its bound goes up
+        cost_ranges: (lowest, highest) objective function coefficient of each of x1 to xn for which the basis stays optimal
+        bound_ranges: (lowest, highest) bound of each constraint for which the basis stays feasible
+
+    A range end is None if there is no limit on that side. Only one coefficient or bound is changed at a time,
+    and the ranges are those of the basis, a degenerate basis can stop being optimal at a range end while
+    another optimal basis takes over
+    """
+    def __init__(self, reduced_costs, shadow_prices, cost_ranges, bound_ranges):
+        self.reduced_costs = reduced_costs
+        self.shadow_prices = shadow_prices
+        self.cost_ranges = cost_ranges
+        self.bound_ranges = bound_ranges
+
+    def to_dict(self):
+        return {
+            'reduced_costs': self.reduced_costs,
+            'shadow_prices': self.shadow_prices,
+            'cost_ranges': self.cost_ranges,
+            'bound_ranges': self.bound_ranges,
+        }
+
+def ratio_range(terms):
+    """
+    The range (lowest, highest) of t for which every (a, b) in terms has a + t*b >= 0, given that t = 0 is in it
+    """
+    (lowest, highest) = (None, None)
+    for (a, b) in terms:
+        if b > 0:
+            if lowest is None or -a/b > lowest:
+                lowest = -a/b
+        elif b < 0:
+            if highest is None or -a/b < highest:
+                highest = -a/b
+
+    return (lowest, highest)
+
+def shift_range(value, delta_range):
+    """ value + each end of delta_range, leaving open ends open """
+    return tuple(None if delta is None else value + delta for delta in delta_range)
+
+def analyze(objective_function, basis_exprs, costs, bounds):
+    """
+    Sensitivity analysis of an optimal dictionary, given as the LinearExpressions returned by get_dictionary().
+    costs are the original objective function coefficients of x1 to xn and bounds the original constraint bounds.
+
+    Every range comes from a single row or column of the dictionary, so this is one pass over the dictionary
+    """
+    (n, m) = (len(costs), len(bounds))
+    coefficients = {var.varname: var.coefficient for var in objective_function.get_vars()}
+    rows = {basis_expr.varname(): basis_expr for basis_expr in basis_exprs}
+
+    def coefficient(varname):
+        return coefficients.get(varname, 0)
+
+    reduced_costs = [coefficient(f'x{j}') for j in range(1, n+1)]
+    shadow_prices = [-coefficient(f'x{n+i}') for i in range(1, m+1)]
+
+    cost_ranges = []
+    for j in range(1, n+1):
+        row = rows.get(f'x{j}')
+        if row is None:
+            # the coefficient can go up until the reduced cost reaches 0
+            cost_ranges.append(shift_range(costs[j-1], (None, -coefficient(f'x{j}'))))
+        else:
+            # raising c_j by t adds t times the row to the objective function, its coefficients must stay <= 0
+            terms = [(-coefficient(var.varname), -var.coefficient) for var in row.get_vars()]
+            cost_ranges.append(shift_range(costs[j-1], ratio_range(terms)))
+
+    # the columns of the non-basic slack variables, {slack name: [(row constant, row coefficient)]}
+    columns = {f'x{n+i}': [] for i in range(1, m+1) if f'x{n+i}' not in rows}
+    for basis_expr in basis_exprs:
+        constant = basis_expr.get_constant().coefficient
+        for var in basis_expr.get_vars():
+            if var.varname in columns:
+                columns[var.varname].append((constant, var.coefficient))
+
+    bound_ranges = []
+    for i in range(1, m+1):
+        slack = f'x{n+i}'
+        if slack in rows:
+            # raising the bound by t raises the slack by t
+            bound_ranges.append(shift_range(bounds[i-1], (-rows[slack].get_constant().coefficient, None)))
+        else:
+            # raising the bound by t raises the slack by t, which changes each row's constant by -t times its slack coefficient
+            terms = [(constant, -coef) for (constant, coef) in columns[slack]]
+            bound_ranges.append(shift_range(bounds[i-1], ratio_range(terms)))
+
+    return SensitivityReport(reduced_costs, shadow_prices, cost_ranges, bound_ranges)
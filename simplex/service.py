@@ -0,0 +1,511 @@
+# Author: Tyrone Lagore V00995698
+
+import asyncio
+import copy
+import io
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+
+from enum import Enum
+
+import simplex.simplex_parser as sp
+from simplex.batch import make_result
+from simplex.simplex_dictionary import PivotMethod, FeasibilityMethod, SolveMode, ScalingMethod
+
+# seconds a cancelled or timed out job gets to stop at its next pivot before its worker process is killed
+KILL_GRACE = 5
+
+# a request is a single line of JSON, L.P. text included
+MAX_REQUEST_BYTES = 64*1024*1024
+
+# progress events are dropped while more than this many bytes are waiting to be sent to a client
+PROGRESS_BUFFER_LIMIT = 1024*1024
+
+# solve request option -> (SimplexConfig attribute, type of the value)
+JOB_OPTIONS = {
+    'mode': ('solve_mode', SolveMode),
+    'pivot': ('pivot_method', PivotMethod),
+    'feasibility': ('feasibility_method', FeasibilityMethod),
+    'scaling': ('scaling_method', ScalingMethod),
+    'presolve': ('presolve', bool),
+    'chunk_size': ('pricing_chunk_size', int),
+    'pivot_limit': ('pivot_limit', int),
+    'time_limit': ('time_limit', float),
+    'selection_time_limit': ('selection_time_limit', float),
+}
+
+def job_config(config, options):
+    """ A copy of config with the options of a solve request applied, see JOB_OPTIONS """
+    job = copy.copy(config)
+    for name, value in options.items():
+        if name not in JOB_OPTIONS:
+            raise Exception(f"job_config():: Unknown option '{name}', expected one of {', '.join(JOB_OPTIONS)}")
+
+        (attribute, kind) = JOB_OPTIONS[name]
+        if issubclass(kind, Enum):
+            if value not in kind.__members__:
+                raise Exception(f"job_config():: '{value}' is not a {name}, expected one of {', '.join(kind.__members__)}")
+            value = kind[value]
+        elif kind is bool:
+            if not isinstance(value, bool):
+                raise Exception(f"job_config():: {name} must be true or false")
+        elif value is not None:
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise Exception(f"job_config():: {name} must be a number")
+            value = kind(value)
+
+        setattr(job, attribute, value)
+
+    # the jobs would share the checkpoint file
+    job.checkpoint_path = None
+    return job
+
+def service_worker(connection):
+    """
+    Solves the jobs of a SolveService one at a time, in a worker process. The service sends
+    ('solve', job number, L.P. text, config, progress interval), ('cancel', job number), or None to stop.
+    A job is answered with ('progress', job number, progress) messages, then ('result', job number, result).
+
+    The messages are read by a thread, so a cancellation reaches the solve while it is running
+    """
+    sys.stderr = open(os.devnull, 'w')
+
+    jobs = queue.Queue()
+    lock = threading.Lock()
+    # job number -> solver of the running job, and the cancelled job numbers
+    solvers = {}
+    cancelled = set()
+
+    def read():
+        while True:
+            try:
+                message = connection.recv()
+            except EOFError:
+                message = None
+
+            if message is None:
+                jobs.put(None)
+                return
+
+            if message[0] == 'cancel':
+                with lock:
+                    cancelled.add(message[1])
+                    if message[1] in solvers:
+                        solvers[message[1]].cancel()
+            else:
+                jobs.put(message)
+
+    def register(number, solver):
+        with lock:
+            solvers[number] = solver
+            if number in cancelled:
+                # cancelled while it was being parsed
+                solver.cancel()
+
+    def unregister(number):
+        with lock:
+            solvers.pop(number, None)
+            cancelled.discard(number)
+
+    threading.Thread(target=read, daemon=True).start()
+
+    while True:
+        message = jobs.get()
+        if message is None:
+            break
+
+        (_, number, text, config, progress_interval) = message
+        try:
+            result = solve_job(number, text, config, progress_interval, connection, register)
+        finally:
+            unregister(number)
+        connection.send(('result', number, result))
+
+def solve_job(number, text, config, progress_interval, connection, register):
+    """
+    Solves the L.P. text, sending progress through connection at most every progress_interval seconds
+    (None sends none). Returns the result like batch.solve_file's, without a file
+    """
+    start = time.perf_counter()
+    sys.stdout = io.StringIO()
+
+    try:
+        solver = sp.parse(io.StringIO(text), config)
+        register(number, solver)
+
+        if progress_interval is not None:
+            last_progress = start
+            def observer(event):
+                nonlocal last_progress
+                now = time.perf_counter()
+                if now - last_progress >= progress_interval:
+                    last_progress = now
+                    progress = {'auxiliary': event.auxiliary, 'pivots': event.pivot_number, 'objective': float(event.objective_value)}
+                    connection.send(('progress', number, progress))
+
+            solver.add_observer(observer)
+
+        solver.solve()
+        output = sys.stdout.getvalue()
+        return make_result(None, output.split('\n', 1)[0], output, solver.stats.to_dict(), time.perf_counter() - start)
+    except Exception:
+        return make_result(None, 'error', elapsed=time.perf_counter() - start, error=traceback.format_exc())
+
+class ServiceWorker():
+    """
+    A worker process of a SolveService, see service_worker, and the connection to it.
+
+    Messages to the process are sent by a writer thread, in order. Sending an L.P. blocks until the process has read
+    most of it, which would stall the service's event loop
+    """
+    def __init__(self, context):
+        self.context = context
+        self.start()
+
+    def start(self):
+        (self.connection, child_connection) = self.context.Pipe()
+        self.process = self.context.Process(target=service_worker, args=(child_connection,))
+        self.process.start()
+        child_connection.close()
+
+        self.outbox = queue.Queue()
+        self.writer = threading.Thread(target=self.__write, args=(self.connection, self.outbox), daemon=True)
+        self.writer.start()
+
+    @staticmethod
+    def __write(connection, outbox):
+        while True:
+            message = outbox.get()
+            try:
+                connection.send(message)
+            except OSError:
+                # the process is gone, the messages still queued are for it
+                return
+
+            if message is None:
+                return
+
+    def send(self, message):
+        """ Queues message for the worker process, see service_worker. Never blocks """
+        self.outbox.put(message)
+
+    def __close(self):
+        # the writer is done with the connection once it sent None or the process is gone
+        self.outbox.put(None)
+        self.writer.join()
+        self.connection.close()
+
+    def restart(self):
+        """ Replaces the worker process, after it was killed or died """
+        self.process.terminate()
+        self.process.join()
+        self.__close()
+        self.start()
+
+    def stop(self):
+        self.send(None)
+
+        # a job may still be running
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.__close()
+
+    async def recv(self):
+        """ The next message of the worker process. Raises EOFError if the process is gone """
+        loop = asyncio.get_running_loop()
+        fileno = self.connection.fileno()
+        while not self.connection.poll():
+            readable = loop.create_future()
+            loop.add_reader(fileno, lambda: readable.done() or readable.set_result(None))
+            try:
+                await readable
+            finally:
+                loop.remove_reader(fileno)
+
+        try:
+            return self.connection.recv()
+        except ConnectionResetError:
+            # killed before it read all of its messages
+            raise EOFError
+
+class ServiceClient():
+    """ A connection to a SolveService, and its jobs that are not done yet by id """
+    def __init__(self, writer):
+        self.writer = writer
+        self.jobs = {}
+
+    def send(self, message, lossy=False):
+        """ Writes message as a line of JSON. A lossy message is dropped if the client is not keeping up """
+        if self.writer.is_closing():
+            return
+
+        if lossy and self.writer.transport.get_write_buffer_size() > PROGRESS_BUFFER_LIMIT:
+            return
+
+        self.writer.write((json.dumps(message) + '\n').encode())
+
+class SolveJob():
+    def __init__(self, client, job_id, number, text, config, timeout, progress):
+        self.client = client
+        self.id = job_id
+        self.number = number
+        self.text = text
+        self.config = config
+        self.timeout = timeout
+        self.progress = progress
+
+        self.worker = None
+        self.start = None
+        # 'timeout' or 'cancelled' once the job is being stopped, its result gets this status
+        self.stopped = None
+        # True once the worker process was killed for it
+        self.killed = False
+        self.done = False
+        self.timers = []
+
+class SolveService():
+    """
+    Long-running solve service on a local Unix or TCP socket. L.P.s are solved by a fixed pool of worker
+    processes, so a request does not pay for starting a Python process.
+
+    Requests and responses are lines of JSON. A client sends
+
+        {"op": "solve", "id": ..., "lp": "<L.P. in the input format>", "options": {...}, "timeout": seconds, "progress": true}
+        {"op": "cancel", "id": ...}
+
+    id is optional for a solve (the service numbers the jobs without one), options are any of JOB_OPTIONS
+    (the names of the driver's options, e.g. {"mode": "HYBRID", "time_limit": 10}), timeout defaults to the
+    service's and progress to true. The service answers each solve with events carrying its id:
+
+        {"event": "queued", "position": jobs waiting}
+        {"event": "started"}
+        {"event": "progress", "auxiliary": ..., "pivots": ..., "objective": ...}, at most every progress_interval seconds
+        {"event": "result", "status": ..., "output": ..., "stats": ..., "time": ..., "error": ...}
+
+    and any request it cannot take with {"event": "error", "message": ...}. The result is batch.solve_batch's, status
+    is cancelled for a cancelled job and timeout for a job that ran past its timeout (output has the best solution
+    it found, if any).
+
+    The queue holds queue_size jobs. While it is full, the service stops reading requests from a client that submits
+    another one, so a client cannot queue without bound. Progress events are dropped for a client that does not read them.
+
+    A cancelled job, or one running longer than its timeout, stops at its next pivot. Its worker process is killed and
+    replaced if it has not stopped after KILL_GRACE seconds, and its output is then empty. The jobs of a client that
+    disconnects are cancelled
+    """
+    def __init__(self, config, workers=None, queue_size=64, timeout=None, progress_interval=1.0):
+        self.config = config
+        self.num_workers = multiprocessing.cpu_count() if workers is None else workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.progress_interval = progress_interval
+
+        self.server = None
+        self.path = None
+        self.workers = []
+        self.runners = []
+        self.clients = set()
+        self.__next_number = 1
+
+    async def start(self, path=None, host='127.0.0.1', port=None):
+        """ Starts the worker processes, then serves on the Unix socket path, or on host and port """
+        # the workers are forked from a server process without the service's sockets and event loop
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(['simplex.service'])
+
+        self.queue = asyncio.Queue(self.queue_size)
+        self.workers = [ServiceWorker(context) for _ in range(self.num_workers)]
+        self.runners = [asyncio.create_task(self.__run_worker(worker)) for worker in self.workers]
+
+        if path is not None:
+            self.path = path
+            self.server = await asyncio.start_unix_server(self.__handle_client, path, limit=MAX_REQUEST_BYTES)
+        else:
+            self.server = await asyncio.start_server(self.__handle_client, host, port, limit=MAX_REQUEST_BYTES)
+
+    def addresses(self):
+        """ The addresses the service is listening on """
+        return [sock.getsockname() for sock in self.server.sockets]
+
+    async def close(self):
+        """ Stops serving, drops the clients and stops the worker processes, killing any running jobs """
+        self.server.close()
+        for client in list(self.clients):
+            client.writer.close()
+        await self.server.wait_closed()
+
+        for runner in self.runners:
+            runner.cancel()
+        await asyncio.gather(*self.runners, return_exceptions=True)
+
+        for worker in self.workers:
+            worker.stop()
+
+        if self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
+
+    async def __handle_client(self, reader, writer):
+        client = ServiceClient(writer)
+        self.clients.add(client)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    client.send({'event': 'error', 'message': f'requests are limited to {MAX_REQUEST_BYTES} bytes'})
+                    break
+
+                if not line:
+                    break
+
+                await self.__handle_request(client, line)
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.discard(client)
+            # there is nobody left to send the results to
+            for job in list(client.jobs.values()):
+                self.__stop(job, 'cancelled')
+            writer.close()
+
+    async def __handle_request(self, client, line):
+        request = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise Exception("handle_request():: A request must be a JSON object")
+
+            if request.get('op') == 'cancel':
+                job = client.jobs.get(request.get('id'))
+                if job is None:
+                    raise Exception(f"handle_request():: There is no job '{request.get('id')}' to cancel")
+                self.__stop(job, 'cancelled')
+                return
+
+            if request.get('op') != 'solve':
+                raise Exception(f"handle_request():: Unknown op '{request.get('op')}', expected solve or cancel")
+
+            job = self.__make_job(client, request)
+        except Exception as e:
+            message = {'event': 'error', 'message': str(e)}
+            if isinstance(request, dict) and 'id' in request:
+                message['id'] = request['id']
+            client.send(message)
+            return
+
+        client.jobs[job.id] = job
+        # while the queue is full the client's next requests are not read
+        await self.queue.put(job)
+        client.send({'id': job.id, 'event': 'queued', 'position': self.queue.qsize()})
+
+    def __make_job(self, client, request):
+        number = self.__next_number
+        self.__next_number += 1
+
+        job_id = request.get('id', number)
+        if isinstance(job_id, (list, dict)):
+            raise Exception("make_job():: A job id must be a string or a number")
+        if job_id in client.jobs:
+            raise Exception(f"make_job():: Job '{job_id}' is already queued or running")
+
+        text = request.get('lp')
+        if not isinstance(text, str):
+            raise Exception("make_job():: A solve request needs the L.P. as a string in 'lp'")
+
+        options = request.get('options', {})
+        if not isinstance(options, dict):
+            raise Exception("make_job():: options must be a JSON object")
+
+        timeout = request.get('timeout', self.timeout)
+        if timeout is not None and (isinstance(timeout, bool) or not isinstance(timeout, (int, float))):
+            raise Exception("make_job():: timeout must be a number")
+
+        return SolveJob(client, job_id, number, text, job_config(self.config, options), timeout, request.get('progress', True) is not False)
+
+    async def __run_worker(self, worker):
+        while True:
+            job = await self.queue.get()
+            if job.done:
+                # cancelled while it was queued
+                continue
+
+            await self.__run_job(worker, job)
+
+    async def __run_job(self, worker, job):
+        loop = asyncio.get_running_loop()
+        job.worker = worker
+        job.start = time.perf_counter()
+        job.client.send({'id': job.id, 'event': 'started'})
+
+        worker.send(('solve', job.number, job.text, job.config, self.progress_interval if job.progress else None))
+        if job.timeout is not None:
+            job.timers.append(loop.call_later(job.timeout, self.__stop, job, 'timeout'))
+
+        try:
+            while True:
+                try:
+                    (kind, number, payload) = await worker.recv()
+                except EOFError:
+                    # killed by __kill, or it died
+                    exitcode = worker.process.exitcode
+                    worker.restart()
+                    error = None if job.killed else f'solver process exited with code {exitcode}'
+                    result = make_result(None, 'error', elapsed=time.perf_counter() - job.start, error=error)
+                    break
+
+                if number != job.number:
+                    continue
+
+                if kind == 'progress':
+                    job.client.send({'id': job.id, 'event': 'progress', **payload}, lossy=True)
+                    continue
+
+                result = payload
+                break
+        finally:
+            for timer in job.timers:
+                timer.cancel()
+
+        self.__finish(job, result)
+
+    def __kill(self, job):
+        """ Kills the worker process of a job that did not stop in time, its runner replaces it """
+        if job.done:
+            return
+
+        job.killed = True
+        job.worker.process.terminate()
+
+    def __stop(self, job, reason):
+        """
+        Stops a job for reason, 'cancelled' or 'timeout'. A running job is cancelled in its worker process, so it stops
+        at its next pivot with the best solution it found, and is killed after KILL_GRACE seconds
+        """
+        if job.done or job.stopped is not None:
+            return
+
+        job.stopped = reason
+        if job.worker is None:
+            # the runner that takes it from the queue skips it
+            self.__finish(job, make_result(None, reason))
+            return
+
+        job.worker.send(('cancel', job.number))
+        job.timers.append(asyncio.get_running_loop().call_later(KILL_GRACE, self.__kill, job))
+
+    def __finish(self, job, result):
+        job.done = True
+        job.client.jobs.pop(job.id, None)
+
+        del result['file']
+        if job.stopped is not None and (job.killed or result['status'] != 'error'):
+            result['status'] = job.stopped
+        job.client.send({'id': job.id, 'event': 'result', **result})
@@ -2,48 +2,238 @@
 
 import functools
 import math
-import multiprocessing
 import sys
 
-from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from fractions import Fraction
 from math import inf
-from simplex.linear_expressions import LinearExpression, Variable
+from simplex.linear_expressions import LinearExpression, Variable, compare_epsilon
+from simplex.row_block import RowBlock
 
 class PivotMethod(Enum):
     LARGEST_COEFFICIENT = 1
     LARGEST_INCREASE = 2
+    STEEPEST_EDGE = 3
+    DEVEX = 4
 
 class SimplexState(Enum):
     FEASIBLE = 1
     OPTIMAL = 2
     INFEASIBLE = 3
     UNBOUNDED = 4
+    # a limit or cancellation stopped the solve, see SimplexSolver.solve. Never the state of a dictionary itself
+    LIMIT_REACHED = 5
 
 class InitializationFn(Enum):
     FIBONNACI = 1
     MODIFIED_FIBONNACI = 2
 
+class ScalingMethod(Enum):
+    NONE = 1
+    GEOMETRIC = 2
+    EQUILIBRATION = 3
+    GEOMETRIC_EQUILIBRATION = 4
+
+class FeasibilityMethod(Enum):
+    DUAL_INIT = 1
+    DUAL_SIMPLEX = 2
+
+class SolveMode(Enum):
+    DICTIONARY = 1
+    FLOAT_TABLEAU = 2
+    EXACT_INTEGER = 3
+    REVISED = 4
+    HYBRID = 5
+
 class SimplexConfig():
     """
-    Currently unused, but might be used for to configure different methods of solving down the line
+    Configures how the simplex solver pivots, initializes and stores its dictionary
+
+    solve_mode selects the dictionary implementation:
+        DICTIONARY: exact Fraction arithmetic on LinearExpressions (default)
+        FLOAT_TABLEAU: float64 NumPy tableau (requires numpy)
+        EXACT_INTEGER: exact fraction-free integer tableau (requires numpy)
+        REVISED: float64 revised simplex on a sparse LU factorization of the basis (requires numpy)
+        HYBRID: REVISED finds a basis, then the DICTIONARY is pivoted to it and solved exactly from there (requires numpy)
+
+    pivot_method selects the pivot rule:
+        LARGEST_COEFFICIENT: the largest objective function coefficient enters (default)
+        LARGEST_INCREASE: the variable giving the largest increase in objective value enters
+        STEEPEST_EDGE: the largest coefficient relative to the exact length of its edge enters
+        DEVEX: the largest coefficient relative to an approximate length of its edge enters
+
+    feasibility_method selects how an infeasible starting dictionary is made feasible:
+        DUAL_INIT: solve the dual of the dictionary with the initialization function as the objective function (default)
+        DUAL_SIMPLEX: dual simplex pivots on the dictionary itself, with its positive objective function coefficients
+            replaced by the negated initialization function ones
+
+    pricing_chunk_size turns on partial pricing: only a candidate list of the attractive variables found in
+    a chunk of this many objective function variables is priced, see CandidateList. None prices every variable.
+
+    presolve removes redundant rows and columns from the parsed L.P. before the dictionary is built, see presolve.presolve
+
+    scaling_method scales the rows and columns of the L.P. in the FLOAT_TABLEAU and REVISED modes, and of the float solve
+    of the HYBRID mode, see scaling.scale. The exact modes are never scaled. scaling_passes is the number of geometric mean passes.
+    The pivot rules compare scaled coefficients, so an L.P. with several optimal vertices may end at another one
+        NONE: no scaling (default)
+        GEOMETRIC: geometric mean passes
+        EQUILIBRATION: an equilibration pass
+        GEOMETRIC_EQUILIBRATION: geometric mean passes followed by an equilibration pass
+
+    cache_dir is a directory the parser caches parsed L.P.s in, keyed by a hash of the L.P. file, see lp_cache.LPCache.
+    None does not cache. The least recently used entries are evicted once the cache is larger than cache_max_bytes
+
+    checkpoint_path is a file the solver writes a checkpoint of the solve to, see checkpoint.save, every checkpoint_pivots
+    pivots or checkpoint_seconds seconds, whichever comes first (None for either turns it off). None does not checkpoint.
+    Only the DICTIONARY and HYBRID modes can be checkpointed
+
+    pivot_limit, time_limit and selection_time_limit stop the solve once it has made this many pivots, run for this many
+    seconds or spent this many seconds choosing pivots, see SimplexSolver.solve. None is no limit. The float solve of the
+    HYBRID mode counts its own pivots and selection time, the time limit covers both solves
     """
     pivot_method = PivotMethod.LARGEST_COEFFICIENT
     initialization_function = InitializationFn.FIBONNACI
+    feasibility_method = FeasibilityMethod.DUAL_INIT
+    solve_mode = SolveMode.DICTIONARY
+    pricing_chunk_size = None
+    presolve = False
+    scaling_method = ScalingMethod.NONE
+    scaling_passes = 4
+    cache_dir = None
+    cache_max_bytes = 256*1024*1024
+    checkpoint_path = None
+    checkpoint_pivots = None
+    checkpoint_seconds = 60
+    pivot_limit = None
+    time_limit = None
+    selection_time_limit = None
+
+# edge weights are floats, so priced scores this close (relative) to the largest count as ties
+PRICING_TOLERANCE = 1e-9
+
+# the Devex reference framework is reset once the weight of an entering variable is this many times its actual weight
+DEVEX_RESET_FACTOR = 3
+
+# after this many dual simplex pivots in a row that do not change the objective value, the dual simplex
+# switches to Bland's rule (lowest variable index) until the objective value changes, so it can not cycle
+DUAL_DEGENERATE_LIMIT = 50
+
+def check_basis(basis, n, m):
+    """
+    Raises an exception unless basis is a list of m distinct variable names out of x1 to xn+m
+    """
+    if len(basis) != m or len(set(basis)) != m:
+        raise Exception(f"check_basis():: A basis must have {m} distinct variables, got {len(basis)}")
 
+    for varname in basis:
+        if not varname.startswith('x') or not varname[1:].isdigit() or not 1 <= int(varname[1:]) <= n+m:
+            raise Exception(f"check_basis():: '{varname}' is not one of the variables x1 to x{n+m}")
 
-class SimplexDictionary():
-    DEBUG = False
+def best_priced(scores):
+    """
+    Index of the first of the largest scores (c_j^2 / w_j) of steepest edge or Devex pricing
+    """
+    largest = max(scores)
+    return next(i for i, score in enumerate(scores) if score >= largest*(1 - PRICING_TOLERANCE))
+
+class CandidateList():
+    """
+    Candidate list for partial (multiple) pricing.
+
+    Instead of pricing every objective function variable, the pivot rule only looks at a list of attractive
+    (positive coefficient) variables. The list is filled from the next chunk of chunk_size objective function
+    variables that has any attractive ones, rotating through the objective function, and is used for as many
+    pivots as it had variables, or until none of them is attractive anymore.
 
-    def __init__(self, objective_function: LinearExpression, constraints, config = None):
+    Variables are whatever keys the dictionary tracks its objective function variables by.
+    """
+    def __init__(self, chunk_size):
         """ """
-        self.basis_exprs = [constraint.deepclone() for constraint in constraints]
-        self.objective_function = objective_function.deepclone()
-        self.x_vars = [x.deepclone() for x in self.objective_function.get_vars()]
-        self.worker_count = int(math.ceil(multiprocessing.cpu_count()/2.0))
+        if chunk_size < 1:
+            raise Exception(f"CandidateList:: chunk size must be at least 1, got {chunk_size}")
+
+        self.chunk_size = chunk_size
+        self.cursor = 0
+        self.candidates = []
+        self.remaining = 0
+
+    def select(self, is_attractive, order):
+        """
+        The variables of the list that are still attractive. is_attractive returns whether each of a list of
+        variables is attractive, order returns every objective function variable in order and is only called
+        to refill the list.
+
+        Returns an empty list only if no objective function variable is attractive
+        """
+        if self.remaining > 0 and len(self.candidates) > 0:
+            self.candidates = [key for key, attractive in zip(self.candidates, is_attractive(self.candidates)) if attractive]
 
-        # self.basis_comp_lock = threading.Semaphore(multiprocessing.cpu_count())
+        if self.remaining <= 0 or len(self.candidates) == 0:
+            self.candidates = self.__refill(is_attractive, order())
+            self.remaining = len(self.candidates)
+
+        self.remaining -= 1
+        return self.candidates
+
+    def __refill(self, is_attractive, order):
+        scanned = 0
+        while scanned < len(order):
+            start = self.cursor % len(order)
+            chunk = order[start:start+self.chunk_size]
+            self.cursor = start + len(chunk)
+            scanned += len(chunk)
+
+            attractive = [key for key, attractive in zip(chunk, is_attractive(chunk)) if attractive]
+            if len(attractive) > 0:
+                return attractive
+
+        return []
+
+def dual_init_coefficients(n, initialization_function):
+    """
+    Coefficients (before negation) of the objective function substituted in by the dual initialization.
+
+    fibonacci does not play nicely if we have too many objective variables, so only use it if the obj var count is reasonable
+    """
+    if n >= 60:
+        return [1]*n
+
+    def fib(modified=False):
+        # fibonacci sequence, starting at the 3rd element
+        cur = 1
+        i_next = 2
+        while True:
+            yield cur
+            if modified:
+                cur, i_next = i_next, cur+math.ceil((4.0/5.0)*i_next)
+            else:
+                cur, i_next = i_next, cur+i_next
+
+    modified_fib = initialization_function == InitializationFn.FIBONNACI
+    num_gen = fib(modified_fib)
+
+    return [next(num_gen) for _ in range(n)]
+
+
+class SimplexDictionary():
+    DEBUG = False
+
+    def __init__(self, objective_function: LinearExpression, constraints, config = None, clone = True):
+        """
+        if clone is False the dictionary takes ownership of the objective function and constraints instead of
+        cloning them, the caller must not use them afterwards
+        """
+        if clone:
+            self.basis_exprs = [constraint.deepclone() for constraint in constraints]
+            self.objective_function = objective_function.deepclone()
+        else:
+            self.basis_exprs = list(constraints)
+            self.objective_function = objective_function
+        # only the names are needed for get_basis_values, in order
+        x_vars = sorted(self.objective_function.get_vars(), key=functools.cmp_to_key(lambda x,y: x.var_comp(y)))
+        self.x_varnames = [var.varname for var in x_vars]
+        # the order the non-basic variables would have in the basis expressions if they were dense, see restore_objective
+        self.row_order = [var.varname for var in self.objective_function.get_vars()]
 
         if config is None:
             self.config = SimplexConfig()
@@ -51,11 +241,38 @@ class SimplexDictionary():
             self.config = config
 
         self.is_dual = False
+        self.__dual_degenerate_pivots = 0
+        self.__reset_weights(None)
+        self.__reset_candidates()
         
         self.n = self.objective_function.num_terms()
         self.m = len(constraints)
+        self.__load_rows()
         self.update_state(init=True)
 
+    def __load_rows(self):
+        """
+        Hands the basis expressions to a RowBlock, which runs the ratio tests and pivots on them in place
+        """
+        self.rows = RowBlock(self.basis_exprs)
+        self.basic_varnames = [basis_expr.varname() for basis_expr in self.basis_exprs]
+
+    def __getstate__(self):
+        # the rows are rebuilt from the basis expressions when the dictionary is loaded.
+        # update_state may be replaced by a timed one, see SimplexSolver, the solver puts it back itself
+        state = dict(self.__dict__)
+        state['rows'] = None
+        state.pop('update_state', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__load_rows()
+
+    def close(self):
+        """ Nothing to release, the dictionary is solved in this process """
+        pass
+
     def debug_print(self, msg):
         if self.DEBUG:
             sys.stderr.write("{0}\n".format(msg))
@@ -66,10 +283,7 @@ class SimplexDictionary():
 
         basis_sol = []
 
-        self.x_vars.sort(key=functools.cmp_to_key(lambda x,y: x.var_comp(y)))
-
-        for var in self.x_vars:
-            varname = var.varname
+        for varname in self.x_varnames:
             basis_expr = self.get_basis_by_varname(varname)
             if basis_expr is None:
                 basis_sol += [(varname, Fraction(0))]
@@ -83,62 +297,132 @@ class SimplexDictionary():
         return self.objective_function.get_constant().coefficient
 
     def __is_feasible(self):
-        for basis_expr in self.basis_exprs:
-            const = basis_expr.get_constant().coefficient
-            if const < 0:
-                return False
-
-        return True
+        return self.rows.num_infeasible() == 0
 
     def set_objective_function(self, fn: LinearExpression):
         """
             Set a new objective function. This objective function must be in terms
-            of the existing objective function variables
+            of the existing objective function variables. The dictionary takes ownership of fn
         """
         curvars = {var.varname:var for var in self.objective_function.get_vars()}
         for var in fn.get_vars():
             if var.varname not in curvars:
                 raise Exception(f"Cannot set objective function to '{fn}' as it is not in terms of current objective function: '{self.objective_function}'")
 
-        self.objective_function = fn.deepclone()
+        self.objective_function = fn
         self.update_state()
 
+    def restore_objective(self, orig_fn: LinearExpression):
+        """
+        Rewrites the original objective function (as returned by as_dual_init) in terms of the
+        current non-basic variables and sets it as the objective function.
+
+        The basis expressions are sparse, the non-basic variables none of the substituted expressions hold are
+        kept with a 0 coefficient. The variables are ordered as if every basis expression held every non-basic
+        variable in row_order, each basic variable is replaced by the row_order variables not there yet
+        """
+        rows = {basis_expr.varname(): basis_expr for basis_expr in self.basis_exprs}
+
+        order = [var.varname for var in orig_fn.get_vars()]
+        present = set(order)
+
+        for varname in list(order):
+            basis = rows.get(varname)
+            if basis is not None:
+                orig_fn.substitute(varname, basis.get_vars(include_constant=True))
+
+                order.remove(varname)
+                present.discard(varname)
+                for row_varname in self.row_order:
+                    if row_varname not in present:
+                        order.append(row_varname)
+                        present.add(row_varname)
+
+        obj_rhs = [orig_fn.get_constant()]
+        obj_rhs += [orig_fn.get_var(varname) or Variable(varname, Fraction(0)) for varname in order]
+        self.set_objective_function(LinearExpression(orig_fn.get_lhs(), obj_rhs, clone=False))
+
     def as_dual_init(self) -> LinearExpression:
         """
         Transforms the dictionary into a dual dictionary for initialization
 
         Returns the original objective function
         """
-        orig_fn = self.objective_function.deepclone()
-
-        def fib(modified=False):
-            # fibonacci sequence, starting at the 3rd element
-            cur = 1
-            i_next = 2
-            while True:
-                yield cur
-                if modified:
-                    cur, i_next = i_next, cur+math.ceil((4.0/5.0)*i_next)
-                else:
-                    cur, i_next = i_next, cur+i_next
-
-        modified_fib = self.config.initialization_function == InitializationFn.FIBONNACI
-        num_gen = fib(modified_fib)
-        
-        # fibonacci does not play nicely if we have too many objective variables, so only use it if the obj var count is reasonable
-        if self.n < 60:
-            obj_rhs = [Variable(Variable.CONSTANT, Fraction(0))] + [ Variable('x' + str(idx), -Fraction(next(num_gen))) for idx in range(1, self.n + 1)]
-        else:
-            obj_rhs = [Variable(Variable.CONSTANT, Fraction(0))] + [ Variable('x' + str(idx), -Fraction(1)) for idx in range(1, self.n + 1)]
+        orig_fn = self.objective_function
+
+        coefficients = dual_init_coefficients(self.n, self.config.initialization_function)
+        obj_rhs = [Variable(Variable.CONSTANT, Fraction(0))] + [ Variable('x' + str(idx), -Fraction(coef)) for idx, coef in enumerate(coefficients, 1)]
 
         obj_lhs = Variable('z', Fraction(1))
-        self.objective_function.set_expression(obj_lhs, obj_rhs)
+        self.objective_function = LinearExpression(obj_lhs, obj_rhs, clone=False)
         
         # change dictionary to dual in normal form
         self.as_dual_nf()
 
         return orig_fn
 
+    def as_dual_feasible(self) -> LinearExpression:
+        """
+        Replaces the non-negative coefficients of the objective function with the negated initialization function
+        coefficients, making the dictionary dual feasible for the dual simplex
+
+        Returns the original objective function
+        """
+        orig_fn = self.objective_function
+
+        coefficients = dual_init_coefficients(self.n, self.config.initialization_function)
+        obj_rhs = [orig_fn.get_constant().deepclone()]
+        for var, coef in zip(orig_fn.get_vars(), coefficients):
+            obj_rhs += [Variable(var.varname, var.coefficient if var.coefficient < 0 else -Fraction(coef))]
+
+        self.objective_function = LinearExpression(orig_fn.get_lhs(), obj_rhs, clone=False)
+        self.update_state()
+
+        return orig_fn
+
+    def get_dual_pivot(self):
+        """
+        Gets the entering variable and the row of the leaving variable for a dual simplex pivot, on a dual feasible dictionary
+
+        The leaving row is the one with the most negative constant. The entering variable is the one the leaving row
+        has a positive coefficient for, with the smallest -c_j / d_rj (the dual ratio test), the first one on ties.
+        After DUAL_DEGENERATE_LIMIT degenerate pivots in a row both use the lowest variable index instead.
+
+        Returns (None, None) if there are no negative rows, or if the leaving row has no positive coefficient (the LP is infeasible)
+        """
+        infeasible = self.rows.infeasible_rows()
+        if len(infeasible) == 0:
+            return (None, None)
+
+        bland = self.__dual_degenerate_pivots >= DUAL_DEGENERATE_LIMIT
+        if bland:
+            (leaving_row, _) = min(infeasible, key=lambda item: Variable(self.basic_varnames[item[0]], 0).idx)
+        else:
+            (leaving_row, _) = min(infeasible, key=lambda item: item[1])
+
+        coefficients = self.rows.row_coefficients(leaving_row)
+
+        entering_var = None
+        smallest_ratio = None
+        for var in self.objective_function.get_vars():
+            coefficient = coefficients.get(var.varname, 0)
+            if coefficient <= 0:
+                continue
+
+            ratio = -var.coefficient / coefficient
+            if smallest_ratio is None or ratio < smallest_ratio or (bland and ratio == smallest_ratio and var.idx < entering_var.idx):
+                (entering_var, smallest_ratio) = (var, ratio)
+
+        if entering_var is None:
+            return (None, None)
+
+        if entering_var.coefficient == 0:
+            self.__dual_degenerate_pivots += 1
+        else:
+            self.__dual_degenerate_pivots = 0
+
+        return (entering_var, leaving_row)
+
     def as_dual_nf(self):
         """
         Transforms the dictionary into a dual dictionary in normal form
@@ -149,13 +433,17 @@ class SimplexDictionary():
         (dual_lhs, dual_rhs) = self.__get_dual_obj_fn(dual_lookup)
         dual_basis = self.__get_dual_basis(dual_lookup)
 
-        self.objective_function.set_expression(dual_lhs, dual_rhs)
+        self.objective_function.set_expression(dual_lhs, dual_rhs, clone=False)
         self.basis_exprs = dual_basis
+        self.row_order = [var.varname for var in self.objective_function.get_vars()]
 
         self.is_dual = not self.is_dual
 
         self.n = self.objective_function.num_terms()
         self.m = len(self.basis_exprs)
+        self.__reset_weights(None)
+        self.__reset_candidates()
+        self.__load_rows()
         self.update_state()
 
     def __get_dual_basis(self, dual_lookup):
@@ -168,18 +456,18 @@ class SimplexDictionary():
 
         for var in self.objective_function.get_vars():
             # Each dual expression has negative constant of coefficient of primal objective function
-            dual_expr = [Variable(Variable.CONSTANT, Fraction(-var.coefficient))]
+            dual_expr = [Variable(Variable.CONSTANT, -var.coefficient)]
             
             # iterate primal basis expressions to extract the variable and create
-            # a dual basis expression in the dual dictionary
+            # a dual basis expression in the dual dictionary, the rows are sparse
             for primal_expr in self.basis_exprs:
                 next_var = primal_expr.get_var(var.varname)
-                dual_varname = dual_lookup[primal_expr.varname()]
-                dual_expr += [Variable(dual_varname, Fraction(-next_var.coefficient))]
+                if next_var is not None and next_var.coefficient != 0:
+                    dual_expr += [Variable(dual_lookup[primal_expr.varname()], -next_var.coefficient)]
 
             dual_slack_name = dual_lookup[var.varname]
             dual_slack_var = Variable(dual_slack_name, Fraction(1))
-            dual_basis += [LinearExpression(lhs=dual_slack_var, rhs=dual_expr, epsilon=(basis_var_idx, num_basis))]
+            dual_basis += [LinearExpression(lhs=dual_slack_var, rhs=dual_expr, epsilon=(basis_var_idx, num_basis), clone=False)]
 
             basis_var_idx += 1
 
@@ -214,31 +502,79 @@ class SimplexDictionary():
         for primal_expr in self.basis_exprs:
             dual_varname = dual_lookup[primal_expr.varname()]
             constant = primal_expr.get_constant()
-            dual_rhs += [Variable(dual_varname, Fraction(-constant.coefficient))]
+            dual_rhs += [Variable(dual_varname, -constant.coefficient)]
             idx += 1
 
         return (dual_lhs, dual_rhs)
 
     def get_pivot(self, pivot_type):
         """ 
-        Gets the entering and leaving variables for a specific pivot
+        Gets the entering variable and the row of the leaving variable for a specific pivot
         """
         entering_var = None
-        leaving_expr = None
+        leaving_row = None
 
         # could add new pivot types here
         if pivot_type == PivotMethod.LARGEST_COEFFICIENT:
-            (entering_var, leaving_expr) = self.__get_largest_coefficient_pivot()
+            (entering_var, leaving_row) = self.__get_largest_coefficient_pivot()
         elif pivot_type == PivotMethod.LARGEST_INCREASE:
-            (entering_var, leaving_expr) = self.__get_largest_increase_pivot()
+            (entering_var, leaving_row) = self.__get_largest_increase_pivot()
+        elif pivot_type == PivotMethod.STEEPEST_EDGE or pivot_type == PivotMethod.DEVEX:
+            (entering_var, leaving_row) = self.__get_priced_pivot(pivot_type)
 
-        return (entering_var, leaving_expr)
+        return (entering_var, leaving_row)
 
-    def __get_largest_increase_pivot(self):
-        # First we get all the positive coefficient variables in our objective function
-        all_pos = [var for var in self.objective_function.get_vars() if var.coefficient > 0]
+    def __reset_candidates(self):
+        self.__candidates = None
+        if self.config.pricing_chunk_size is not None:
+            self.__candidates = CandidateList(self.config.pricing_chunk_size)
 
-        if len(all_pos) == 0:
+    def __entering_candidates(self):
+        """
+        The objective function variables with a positive coefficient, in order. With partial pricing, only those of the candidate list
+        """
+        if self.__candidates is None:
+            return [var for var in self.objective_function.get_vars() if var.coefficient > 0]
+
+        def is_attractive(varnames):
+            return [self.objective_function.get_var(varname) is not None and self.objective_function.get_var(varname).coefficient > 0 for varname in varnames]
+
+        def order():
+            return [var.varname for var in self.objective_function.get_vars()]
+
+        return [self.objective_function.get_var(varname) for varname in self.__candidates.select(is_attractive, order)]
+
+    def __reset_weights(self, pivot_type):
+        """
+        Starts the edge weights of steepest edge or Devex pricing over at the current dictionary,
+        pivot_type None drops them until the next priced pivot.
+
+        Steepest edge weights are the exact squared length of each edge, 1 + the sum of the squares of the
+        variable's coefficients in the basis expressions. Devex weights are 1, with the current non-basic
+        variables as the reference framework.
+        """
+        self.__weights_method = pivot_type
+        self.__weights = None
+        self.__reference = None
+
+        if pivot_type == PivotMethod.STEEPEST_EDGE:
+            norms = self.rows.column_norms()
+            self.__weights = {var.varname: 1 + norms.get(var.varname, 0.0) for var in self.objective_function.get_vars()}
+        elif pivot_type == PivotMethod.DEVEX:
+            self.__reference = {var.varname for var in self.objective_function.get_vars()}
+            self.__weights = {varname: 1.0 for varname in self.__reference}
+
+    def __get_priced_pivot(self, pivot_type):
+        """
+        Steepest edge and Devex pricing: the entering variable has the largest c_j^2 / w_j, its coefficient
+        relative to the length of its edge. The leaving variable is found with the usual ratio test
+        """
+        if self.__weights_method != pivot_type:
+            self.__reset_weights(pivot_type)
+
+        candidates = self.__entering_candidates()
+
+        if len(candidates) == 0:
             if self.__optimal():
                 self.__state = SimplexState.OPTIMAL
             else:
@@ -246,45 +582,84 @@ class SimplexDictionary():
 
             return (None, None)
 
+        scores = [float(var.coefficient)**2 / self.__weights[var.varname] for var in candidates]
+        entering_var = candidates[best_priced(scores)]
 
-        candidate_exprs = []
-        leaving_expr = None
+        return (entering_var, self.__get_leaving_variable(entering_var))
 
-        for var in all_pos:
-            inter_exprs = []
-            smallest_bound = inf
-            multiplier = var.coefficient
-            max_increase = -1
+    def __edge_update_terms(self, entering_varname):
+        """
+        What the weight update of a pivot needs from the dictionary before the pivot. For steepest edge, the dot
+        products of the entering column with the other columns. For Devex, the entering column
+        """
+        if self.__weights_method == PivotMethod.STEEPEST_EDGE:
+            return self.rows.edge_products(entering_varname)
+        elif self.__weights_method == PivotMethod.DEVEX:
+            return self.rows.column(entering_varname)
 
-            for basis_expr in self.basis_exprs:
-                candidate = basis_expr.get_var(var.varname)
+        return None
 
-                # only look at expressions with valid bounds
-                if candidate.coefficient >= 0:
-                    continue
+    def __update_weights(self, entering_varname, leaving_varname, resultant, terms):
+        """
+        Updates the edge weights after a pivot. Only the variables of the leaving row change, resultant is the
+        leaving row rewritten in terms of the entering variable: the leaving variable has coefficient 1/p
+        (p is the pivot coefficient) and every other variable j has coefficient -a_j, a_j = d_rj / p
 
-                constant = basis_expr.get_constant()
+        steepest edge: w_j = w_j - 2 a_j (e_j . e_q) + a_j^2 w_q, at least 1 + a_j^2, and w_leaving = w_q / p^2
+        Devex: w_j = max(w_j, a_j^2 w_q) and w_leaving = max(w_q / p^2, 1)
+        """
+        if self.__weights_method == PivotMethod.STEEPEST_EDGE:
+            # the exact weight of the entering variable is known, so use it instead of the updated one
+            entering_weight = 1 + terms.get(entering_varname, 0.0)
+        else:
+            # the actual weight of the entering variable in the reference framework
+            reference_weight = (1 if entering_varname in self.__reference else 0)
+            reference_weight += sum(float(coefficient)**2 for row, coefficient in terms.items() if self.basic_varnames[row] in self.__reference)
 
-                if candidate.coefficient == 0:
-                    bound = 0
-                else:
-                    bound = constant.coefficient / -candidate.coefficient
+            if self.__weights[entering_varname] > DEVEX_RESET_FACTOR*reference_weight:
+                self.__reference = set(self.__weights)
+                self.__weights = {varname: 1.0 for varname in self.__reference}
 
-                increase = bound*multiplier
+            entering_weight = self.__weights[entering_varname]
 
-                if bound < smallest_bound:
-                    smallest_bound = bound
-                    inter_exprs = [basis_expr]
-                    max_increase = increase
-                elif bound == smallest_bound and increase == max_increase:
-                    inter_exprs.append(basis_expr)
-                elif bound == smallest_bound and increase > max_increase:
-                    inter_exprs = [basis_expr]
-                    max_increase = increase
+        del self.__weights[entering_varname]
 
-            if len(inter_exprs) > 0:
-                leaving_expr = self.__break_ties(inter_exprs)
-                candidate_exprs.append((var, leaving_expr, max_increase))
+        for var in resultant:
+            if var.varname == Variable.CONSTANT or var.coefficient == 0:
+                continue
+
+            if var.varname == leaving_varname:
+                self.__weights[var.varname] = max(entering_weight*float(var.coefficient)**2, 1.0)
+                continue
+
+            ratio = -float(var.coefficient)
+            if self.__weights_method == PivotMethod.STEEPEST_EDGE:
+                weight = self.__weights[var.varname] - 2*ratio*terms.get(var.varname, 0.0) + ratio**2*entering_weight
+                self.__weights[var.varname] = max(weight, 1 + ratio**2)
+            else:
+                self.__weights[var.varname] = max(self.__weights[var.varname], ratio**2*entering_weight)
+
+    def __get_largest_increase_pivot(self):
+        # First we get all the positive coefficient variables in our objective function
+        all_pos = self.__entering_candidates()
+
+        if len(all_pos) == 0:
+            if self.__optimal():
+                self.__state = SimplexState.OPTIMAL
+            else:
+                self.__state = SimplexState.INFEASIBLE
+
+            return (None, None)
+
+        candidate_exprs = []
+        bounds = self.rows.leaving_candidates([var.varname for var in all_pos])
+
+        for var in all_pos:
+            if var.varname in bounds:
+                # every row with the smallest bound gives the same increase for this variable
+                (smallest_bound, ties) = bounds[var.varname]
+                leaving = self.__break_ties(ties)
+                candidate_exprs.append((var, leaving, smallest_bound*var.coefficient))
 
         if len(candidate_exprs) == 0:
             # we had positive variables in our non-basic, but nothing to pivot out
@@ -294,8 +669,8 @@ class SimplexDictionary():
             # filter leaving expressions to only the max possible increases
             filtered_exprs = self.__filter_largest_increase(candidate_exprs)
             # break ties based on lexicographical anti-cycling
-            leaving_expr = self.__break_ties_lgst(filtered_exprs)
-            return (leaving_expr[0], leaving_expr[1])
+            (entering_var, (leaving_row, _)) = self.__break_ties_lgst(filtered_exprs)
+            return (entering_var, leaving_row)
 
         
     def __filter_largest_increase(self, candidate_basis):
@@ -313,9 +688,10 @@ class SimplexDictionary():
     def __get_largest_coefficient_pivot(self):
         max_val = -inf
         entering_var = None
+        leaving_row = None
 
-        for var in self.objective_function.get_vars():
-            if var.coefficient > 0 and var.coefficient > max_val:
+        for var in self.__entering_candidates():
+            if var.coefficient > max_val:
                 max_val = var.coefficient
                 entering_var = var
         
@@ -325,46 +701,24 @@ class SimplexDictionary():
             else:
                 self.__state == SimplexState.INFEASIBLE
         else:
-            leaving_expr = self.__get_leaving_variable(entering_var)
+            leaving_row = self.__get_leaving_variable(entering_var)
 
-        return (entering_var, leaving_expr)
+        return (entering_var, leaving_row)
 
-    def __get_leaving_variable(self, entering_var: Variable) -> LinearExpression:
+    def __get_leaving_variable(self, entering_var: Variable):
         """
-        This function just looks for the lowest bound for an entering_variable and returns that basis expression
+        This function just looks for the lowest bound for an entering_variable and returns the row of that basis expression
         """
+        leaving_row = None
+        bounds = self.rows.leaving_candidates([entering_var.varname])
 
-        leaving_exprs = []
-
-        leaving_expr = None
-        smallest_bound = inf
-
-        for basis_expr in self.basis_exprs:
-            candidate = basis_expr.get_var(entering_var.varname)
-
-            # only look at expressions with valid bounds
-            if candidate.coefficient >= 0:
-                continue
-
-            constant = basis_expr.get_constant()
-
-            if candidate.coefficient == 0:
-                bound = 0
-            else:
-                bound = constant.coefficient / -candidate.coefficient
-
-            if bound < smallest_bound:
-                smallest_bound = bound
-                leaving_exprs = [basis_expr]
-            elif bound == smallest_bound:
-                leaving_exprs.append(basis_expr)
-
-        if len(leaving_exprs) == 0:
+        if entering_var.varname not in bounds:
             self.__state = SimplexState.UNBOUNDED
         else:
-            leaving_expr = self.__break_ties(leaving_exprs)
+            (_, ties) = bounds[entering_var.varname]
+            (leaving_row, _) = self.__break_ties(ties)
 
-        return leaving_expr
+        return leaving_row
 
     def __break_ties_lgst(self, expressions):
         """
@@ -373,7 +727,7 @@ class SimplexDictionary():
         Since largest increase requires keeping track of which is the entering variable and which is the exiting expression,
         expressions here is a list of tuples of the form:
 
-        [(varname, candidate_leaving_expression)] 
+        [(entering_var, (leaving_row, epsilon))] 
         """
 
         if len(expressions) == 0:
@@ -381,69 +735,74 @@ class SimplexDictionary():
         elif len(expressions) == 1:
             return expressions[0]
 
-        # self.debug_print('Breaking ties:\n{0}'.format("\n".join([expression[1].to_string() for expression in expressions])))
-        max = expressions[0][1]
         max_i = 0
         
         for i in range(1, len(expressions)):
-            if expressions[i][1] > max:
-                max = expressions[i][1]
+            if compare_epsilon(expressions[i][1][1], expressions[max_i][1][1]) == -1:
                 max_i = i
 
-        # self.debug_print(f'Chose: {expressions[max_i][1].to_string()}')
-
         return expressions[max_i]
 
-        # expressions.sort(key=functools.cmp_to_key(lambda x,y: x[1].compare_eps(y[1])))
-        return expressions[0]
-
     def __break_ties(self, expressions):
         """
         Break ties using the lexicographical method
 
-        We sort the expressions by their epsilon values and take the first one
+        expressions is a list of (row, epsilon) tuples, the first one with the largest epsilon is returned
         """
         if len(expressions) == 0:
             return None
 
-        # self.debug_print('Breaking ties:\n{0}'.format("\n".join([expression.to_string() for expression in expressions])))
-        
-        # We overrode the ge in LinearExpression so max just natively works
-        top = max(expressions)
-        # self.debug_print(f'Chose: {expressions[0].to_string()}')
-        return top
+        top = expressions[0]
+        for expression in expressions[1:]:
+            if compare_epsilon(expression[1], top[1]) == -1:
+                top = expression
 
-    def sub_basis(self, args):
-        basis_expr = args['basis_expr']
-        entering_var = args['entering_var']
-        resultant = args['resultant']
+        return top
 
-        basis_expr.substitute(entering_var.varname, resultant)
+    def describe_pivot(self, entering_var, leaving_row):
+        """
+        (entering variable name, leaving variable name, row of the leaving variable) of a pivot
+        """
+        return (entering_var.varname, self.basic_varnames[leaving_row], leaving_row)
 
-    def pivot(self, entering_var, leaving_expr):
+    def pivot(self, entering_var, leaving_row):
         """
         Pivots a specific entering variable for a basis variable.
 
-        The basis variable is the entire basis expression, which is used to
+        The basis variable is the entire basis expression in leaving_row, which is used to
         rewrite the basis expression in terms of the entering variable.
         """
-        resultant = leaving_expr.in_terms_of(entering_var.varname)
+        terms = self.__edge_update_terms(entering_var.varname)
+        leaving_varname = self.basic_varnames[leaving_row]
+
+        resultant = self.rows.pivot(entering_var.varname, leaving_row)
+        self.basic_varnames[leaving_row] = entering_var.varname
+
+        # the leaving variable is appended to the end of every expression
+        self.row_order.remove(entering_var.varname)
+        self.row_order.append(leaving_varname)
 
+        if self.__weights is not None:
+            self.__update_weights(entering_var.varname, leaving_varname, resultant, terms)
+
+        # only the objective function coefficients of the entering variable and the resultant's variables change
+        changed = [var.varname for var in resultant if var.varname != Variable.CONSTANT]
+        positive = self.__count_positive([entering_var.varname] + changed)
         self.objective_function.substitute(entering_var.varname, resultant)
-        others = [basis_expr for basis_expr in self.basis_exprs if basis_expr != leaving_expr]
-        args = [{'basis_expr': b, 'entering_var': entering_var, 'resultant': resultant} for b in others]
+        self.__positive += self.__count_positive(changed) - positive
 
-        with ThreadPoolExecutor(max_workers=self.worker_count) as executor:
-            executor.map(self.sub_basis, args)
-            
-        self.update_state()
+        self.update_state(recount=False)
         
     def get_state(self):
         return self.__state
 
-    def update_state(self, init=False):
+    def update_state(self, init=False, recount=True):
         """
+        recount counts the positive objective function coefficients again. pivot() keeps the count up to date
+        itself, anything else that changes the objective function has to recount
         """
+        if recount:
+            self.__positive = self.__count_positive(var.varname for var in self.objective_function.get_vars())
 
         self.__state = SimplexState.FEASIBLE
             
@@ -452,35 +811,70 @@ class SimplexDictionary():
         elif self.__state != SimplexState.OPTIMAL and not self.__is_feasible():
             self.__state = SimplexState.INFEASIBLE
         elif init:
-            # Need to check if we're unbounded
-            # NOTE: This operation is expensive, but we only find all variables one time.
-            # If we needed to do this frequently we should make a lookup from variable to 
-            # the expressions it appears in.
-            for var in self.objective_function.get_vars():
-                if var.coefficient > 0:
-                    all_positive = True
-
-                    for basis_expr in self.basis_exprs:
-                        basis_var = basis_expr.get_var(var.varname)
-                        if basis_var is not None:
-                            if basis_var.coefficient < 0:
-                                all_positive = False
-                                break
-                    
-                    if all_positive:
-                        self.__state = SimplexState.UNBOUNDED
-                        break
+            # Need to check if we're unbounded, a positive variable no row puts a bound on
+            all_pos = [var.varname for var in self.objective_function.get_vars() if var.coefficient > 0]
+            bounds = self.rows.leaving_candidates(all_pos)
+
+            if any(varname not in bounds for varname in all_pos):
+                self.__state = SimplexState.UNBOUNDED
 
     def __optimal(self):
-        optimal = True
-        
-        for var in self.objective_function.get_vars():
-            optimal = optimal and (var.coefficient <= 0 or var.varname == Variable.CONSTANT)
+        return self.__positive == 0 and self.rows.num_infeasible() == 0
+
+    def __count_positive(self, varnames):
+        """ number of the variables with a positive objective function coefficient """
+        count = 0
+        for varname in varnames:
+            var = self.objective_function.get_var(varname)
+            if var is not None and var.coefficient > 0:
+                count += 1
+
+        return count
+
+    def get_basis(self):
+        """
+        Names of the basic variables, ordered by index
+        """
+        if self.is_dual:
+            raise Exception("get_basis():: The dictionary is a dual dictionary, it has no basis of the original L.P.")
+
+        return sorted(self.basic_varnames, key=lambda varname: Variable(varname, 0).idx)
+
+    def set_basis(self, basis, strict=True):
+        """
+        Pivots the dictionary to the given basis, a list of the names of the m basic variables (see get_basis).
+
+        Each variable of the basis that is not basic yet enters in place of the basic variable outside of the basis with
+        the largest coefficient for it (in absolute value, the first on ties), regardless of feasibility. The epsilons then
+        start over at the new basis, like they do after taking the dual.
+
+        A singular basis raises an exception, unless strict is False. Then the variables that cannot enter are left out,
+        and the dictionary ends at the nearest basis it can reach
+        """
+        if self.is_dual:
+            raise Exception("set_basis():: Cannot set the basis of a dual dictionary")
+
+        check_basis(basis, self.n, self.m)
+        target = set(basis)
+
+        for varname in sorted(target, key=lambda varname: Variable(varname, 0).idx):
+            if varname in self.basic_varnames:
+                continue
+
+            eligible = [(row, coefficient) for row, coefficient in self.rows.column(varname).items() if self.basic_varnames[row] not in target]
+            if len(eligible) == 0:
+                if not strict:
+                    continue
+                raise Exception(f"set_basis():: The basis is singular, '{varname}' cannot enter the basis")
 
-        for constraint in self.basis_exprs:
-            optimal = optimal and constraint.get_constant().coefficient >= 0
+            (leaving_row, _) = max(eligible, key=lambda item: abs(item[1]))
+            self.pivot(self.objective_function.get_var(varname), leaving_row)
 
-        return optimal
+        for i, basis_expr in enumerate(self.basis_exprs):
+            basis_expr.set_epsilon(i+1, self.m)
+
+        self.__load_rows()
+        self.update_state()
 
     def get_basis_by_varname(self, varname: str, basis_exprs = None) -> LinearExpression:
         """
@@ -492,7 +886,8 @@ class SimplexDictionary():
         return next((expr for expr in basis_exprs if expr.varname() == varname), None)
     
     def deepclone(self):
-        dict = SimplexDictionary(self.objective_function, self.basis_exprs)
+        dict = SimplexDictionary(self.objective_function, self.basis_exprs, clone=True)
+        dict.row_order = list(self.row_order)
         return dict
 
     def deepequals(self, other_dict: 'SimplexDictionary'):
@@ -533,6 +928,13 @@ class SimplexDictionary():
 
         return True
 
+    def get_dictionary(self):
+        """
+        The dictionary as LinearExpressions, (objective function, [basis expression of each row]).
+        These are the dictionary's own expressions, they must not be modified
+        """
+        return (self.objective_function, self.basis_exprs)
+
     def to_string(self):
         msg = '\n----------------------------------\n'
         msg += self.objective_function.to_string()
@@ -1,13 +1,78 @@
+import io
 import sys
+import time
 from fractions import Fraction
 
 from simplex.linear_expressions import LinearExpression, Variable
+from simplex.lp_cache import LPCache
+from simplex.presolve import presolve
+from simplex.scaling import scale
+from simplex.simplex_dictionary import ScalingMethod, SolveMode
 from simplex.simplex_solver import SimplexSolver
 
-def parse(in_file, simplex_config):
+def parse(in_file, simplex_config, basis=None):
     """
+    basis is an optional basis to warm start the solver from, see parse_basis.
+    If simplex_config.presolve is set, the solver is given the presolved L.P. and restores the solution of the original one.
+    The L.P. is scaled the same way in the float solve modes if simplex_config.scaling_method is set (the HYBRID mode
+    scales the L.P. of its float solve itself, see SimplexSolver).
+    If simplex_config.cache_dir is set, the parsed L.P. is cached there, see lp_cache.LPCache
     """
     sys.stderr.write("Parsing LP...\n")
+    start = time.perf_counter()
+    if simplex_config is None or simplex_config.cache_dir is None:
+        (obj_fn, constraints) = parse_lp(in_file)
+    else:
+        cache = LPCache(simplex_config.cache_dir, simplex_config.cache_max_bytes)
+        text = in_file.read()
+        key = cache.key(text)
+
+        lp = cache.load(key)
+        if lp is None:
+            lp = parse_lp(io.StringIO(text))
+            cache.store(key, *lp)
+        else:
+            sys.stderr.write("Loaded LP from cache\n")
+
+        (obj_fn, constraints) = lp
+
+    parse_time = time.perf_counter() - start
+
+    # the steps the solver undoes to restore the solution of the original L.P., in the order they were applied
+    postsolve = []
+    if simplex_config is not None and simplex_config.presolve:
+        if basis is not None:
+            raise Exception("parse():: A basis cannot be used with presolve, the solver pivots on the presolved L.P.")
+
+        start = time.perf_counter()
+        (obj_fn, constraints, presolved) = presolve(obj_fn, constraints)
+        postsolve.append(presolved)
+        presolve_time = time.perf_counter() - start
+        sys.stderr.write(f"Presolve removed {presolved.removed_rows} constraints and {presolved.removed_columns} variables\n")
+
+    scaling_time = None
+    if simplex_config is not None and simplex_config.scaling_method != ScalingMethod.NONE and simplex_config.solve_mode in (SolveMode.FLOAT_TABLEAU, SolveMode.REVISED):
+        start = time.perf_counter()
+        (obj_fn, constraints, scaling) = scale(obj_fn, constraints, simplex_config.scaling_method, simplex_config.scaling_passes)
+        postsolve.append(scaling)
+        scaling_time = time.perf_counter() - start
+
+    for i, constraint in enumerate(constraints):
+        constraint.set_epsilon(i+1, len(constraints))
+
+    solver = SimplexSolver(obj_fn, constraints, simplex_config, basis, postsolve)
+    solver.stats.add_phase_time('parse', parse_time)
+    if simplex_config is not None and simplex_config.presolve:
+        solver.stats.add_phase_time('presolve', presolve_time)
+    if scaling_time is not None:
+        solver.stats.add_phase_time('scaling', scaling_time)
+
+    return solver
+
+def parse_lp(in_file):
+    """
+    (objective function, constraints) of the L.P. in in_file, read a line at a time. The constraints do not have epsilons yet
+    """
     line = in_file.readline().strip()
     (obj_fn, n) = parse_obj_function(line)
 
@@ -18,10 +83,16 @@ def parse(in_file, simplex_config):
         constraints.append(constraint)
         basis_count += 1
 
-    for i, constraint in enumerate(constraints):
-        constraint.set_epsilon(i+1, basis_count)
+    return (obj_fn, constraints)
 
-    return SimplexSolver(obj_fn, constraints, simplex_config)
+def parse_basis(line):
+    """
+    A basis written by format_basis, the names of the basic variables separated by spaces
+    """
+    return line.split()
+
+def format_basis(basis):
+    return ' '.join(basis)
 
 def parse_constraint(line, constraint_idx):
     """
@@ -34,7 +105,8 @@ def parse_constraint(line, constraint_idx):
     lhs = Variable(f'x{constraint_idx}', Fraction(1))
     rhs = parse_rhs(parts, bound)
 
-    return LinearExpression(lhs, rhs)
+    # the variables were just created for this expression, there is nothing to clone
+    return LinearExpression(lhs, rhs, clone=False)
 
 def parse_obj_function(line):
     parts = line.split()
@@ -42,15 +114,49 @@ def parse_obj_function(line):
     lhs = Variable('z', Fraction(1))
     rhs = parse_rhs(parts, 0, True)
 
-    return (LinearExpression(lhs, rhs), len(rhs))
+    return (LinearExpression(lhs, rhs, clone=False), len(rhs))
 
 def parse_rhs(parts, constant, obj_fn=False):
-    # let Fraction do the heavy lifting of the convertion from string to fraction, then convert to Fraction
-    rhs = [Variable(Variable.CONSTANT, Fraction(constant))]
+    """
+    The objective function keeps every variable, the dictionaries rely on it to number the variables.
+    A constraint only gets its non-zero coefficients, so parsing an L.P. scales with the non-zeros of A
+    rather than its size
+    """
+    rhs = [Variable(Variable.CONSTANT, parse_number(constant))]
     for idx, part in enumerate(parts):
-        varname = f'x{idx+1}'
+        if obj_fn:
+            rhs.append(Variable(f'x{idx+1}', parse_number(part)))
+            continue
+
+        # most entries of a sparse L.P. are written as a plain 0 (or -0)
+        if part == '0' or part == '-0':
+            continue
 
-        coef = Fraction(part) if obj_fn else -Fraction(part)
-        rhs.append(Variable(varname, coef))
+        coef = parse_number(part)
+        if coef != 0:
+            rhs.append(Variable(f'x{idx+1}', -coef))
 
     return rhs
+
+def parse_number(part):
+    """
+    Fraction(part), without going through the regular expression Fraction parses strings with for
+    the integers and plain decimals L.P. files are written in. Anything else is left to Fraction
+    """
+    if isinstance(part, int):
+        return Fraction(part)
+
+    (whole, point, decimals) = part.partition('.')
+    digits = whole.lstrip('+-')
+    if len(whole) - len(digits) <= 1 and (digits.isdigit() or (point and digits == '')):
+        if not point:
+            return Fraction(int(whole))
+
+        if decimals.isdigit():
+            # 12.345 is 12345/10^3
+            return Fraction(int(whole + decimals), 10**len(decimals))
+
+        if decimals == '' and digits != '':
+            return Fraction(int(whole))
+
+    return Fraction(part)
@@ -1,11 +1,30 @@
 # Author: Tyrone Lagore V00995698
 
+import copy
 import math
+import threading
 import time
 import sys 
 
+from enum import Enum
+from simplex import checkpoint
 from simplex.linear_expressions import LinearExpression
-from simplex.simplex_dictionary import SimplexDictionary, PivotMethod, SimplexState
+from simplex.scaling import scale
+from simplex.sensitivity import analyze
+from simplex.simplex_dictionary import SimplexDictionary, SimplexConfig, SimplexState, SolveMode, FeasibilityMethod, ScalingMethod
+
+try:
+    from simplex.tableau import FloatTableau, IntegerTableau
+    from simplex.revised_simplex import RevisedSimplex
+except ImportError:
+    # numpy is only required for the tableau and revised solve modes
+    FloatTableau = None
+    IntegerTableau = None
+    RevisedSimplex = None
+
+# the float solve of the HYBRID mode gives up after this many pivots per variable and constraint, it is cycling on
+# round-off by then (the netlib L.P.s take at most 1.7)
+FLOAT_PIVOT_FACTOR = 4
 
 class SimplexStats():
     num_variables = 0
@@ -21,6 +40,20 @@ class SimplexStats():
     required_auxiliary = False
     aux_stats: 'SimplexStats' = None
 
+    # stats of the float solve that found the starting basis in the HYBRID mode
+    float_stats: 'SimplexStats' = None
+
+    # the SolveLimit that stopped the solve, if any
+    limit: 'SolveLimit' = None
+
+    def __init__(self):
+        # seconds spent in each phase, over both the auxiliary and primal problem. Phases can overlap,
+        # update_state is also part of the time of the pivots and dual transforms that call it
+        self.phase_times = {}
+
+    def add_phase_time(self, phase, seconds):
+        self.phase_times[phase] = self.phase_times.get(phase, 0) + seconds
+
     def is_auxiliary(self):
         self.required_auxiliary = True
         self.aux_stats = SimplexStats()
@@ -36,14 +69,46 @@ class SimplexStats():
         self.pivot_selection_time = 0
         self.pivot_time = 0
 
+    def total(self):
+        """ New stats adding up the auxiliary and primal pivots """
+        total = SimplexStats()
+        for stats in [self] if self.aux_stats is None else [self.aux_stats, self]:
+            total.num_pivots += stats.num_pivots
+            total.num_degenerate_pivots += stats.num_degenerate_pivots
+            total.solution_time += stats.solution_time
+            total.pivot_selection_time += stats.pivot_selection_time
+            total.pivot_time += stats.pivot_time
+
+        return total
+
+    def to_dict(self):
+        """
+        The stats as a dictionary, for serializing. aux_stats is included as a nested dictionary
+        """
+        return {
+            'num_variables': self.num_variables,
+            'num_constraints': self.num_constraints,
+            'num_pivots': self.num_pivots,
+            'num_degenerate_pivots': self.num_degenerate_pivots,
+            'solution_time': self.solution_time,
+            'pivot_selection_time': self.pivot_selection_time,
+            'pivot_time': self.pivot_time,
+            'required_auxiliary': self.required_auxiliary,
+            'aux_stats': None if self.aux_stats is None else self.aux_stats.to_dict(),
+            'float_stats': None if self.float_stats is None else self.float_stats.to_dict(),
+            'limit': None if self.limit is None else self.limit.name,
+            'phase_times': dict(self.phase_times),
+        }
+
     def __print_header(self):
         sys.stderr.write("\nSimplex Stats\n")
         sys.stderr.write("{0}\n".format('-'*70))
         sys.stderr.write("| {0:<12}| {1:30}| {2:<20} |\n".format("Category", "Stat", "Value"))
         sys.stderr.write("{0}\n".format('-'*70))
 
-    def __print_stats(self, stats: 'SimplexStats', aux: bool):
-        p_type = 'Dual' if aux else 'Primal'
+    def __print_stats(self, stats: 'SimplexStats', aux: bool, p_type=None):
+        if p_type is None:
+            p_type = 'Dual' if aux else 'Primal'
         sys.stderr.write("| {0:<12}| {1:30}| {2:20} |\n".format('', f"number of pivots:", stats.num_pivots))
         sys.stderr.write("| {0:<12}| {1:30}| {2:20} |\n".format('', f"number of degenerate pivots:", stats.num_degenerate_pivots))
         sys.stderr.write("| {0:<12}| {1:30}| {2:19.6f}s |\n".format(p_type, f"avg pivot selection time:", 0 if stats.num_pivots == 0 else stats.pivot_selection_time/stats.num_pivots))
@@ -56,33 +121,258 @@ class SimplexStats():
         sys.stderr.write("| {0:<12}| {1:30}| {2:>20} |\n".format('', 'number of variables: ', self.num_variables))
         sys.stderr.write("| {0:<12}| {1:30}| {2:>20} |\n".format('Overview', 'number of constraints: ', self.num_constraints))
         sys.stderr.write("| {0:<12}| {1:30}| {2:>20} |\n".format('', "required auxiliary:", "Yes" if self.required_auxiliary else "No"))
+        if self.limit is not None:
+            sys.stderr.write("| {0:<12}| {1:30}| {2:>20} |\n".format('', "stopped by:", self.limit.name))
         sys.stderr.write("{0}\n".format('-'*70))
+
+        if len(self.phase_times) > 0:
+            for i, (phase, seconds) in enumerate(self.phase_times.items()):
+                sys.stderr.write("| {0:<12}| {1:30}| {2:19.6f}s |\n".format('Phases' if i == 0 else '', f"{phase}:", seconds))
+            sys.stderr.write("{0}\n".format('-'*70))
+        if self.float_stats is not None:
+            # the float solve's own dual pivots are counted in with its primal ones
+            self.__print_stats(self.float_stats.total(), False, 'Float')
         if self.required_auxiliary:
             self.__print_stats(self.aux_stats, True)
 
         self.__print_stats(self, False)
 
-class SimplexConfig():
-    pivot_method = PivotMethod.LARGEST_INCREASE
+class PivotEvent():
+    """
+    Passed to the observers of a SimplexSolver after each pivot
+
+        auxiliary: True if the pivot was made solving the auxiliary (dual initialization) problem, or by the dual simplex
+        pivot_number: pivots made so far on this problem, including this one
+        entering_var, leaving_var: names of the variables entering and leaving the basis
+        leaving_row: 0 indexed row of the dictionary the leaving variable was basic in
+        objective_value: objective value after the pivot
+        degenerate: True if the pivot did not change the objective value
+        selection_time, pivot_time: seconds spent choosing and making the pivot
+    """
+    def __init__(self, auxiliary, pivot_number, entering_var, leaving_var, leaving_row, objective_value, degenerate, selection_time, pivot_time):
+        self.auxiliary = auxiliary
+        self.pivot_number = pivot_number
+        self.entering_var = entering_var
+        self.leaving_var = leaving_var
+        self.leaving_row = leaving_row
+        self.objective_value = objective_value
+        self.degenerate = degenerate
+        self.selection_time = selection_time
+        self.pivot_time = pivot_time
+
+class SolvePhase(Enum):
+    """
+    The pivots a solve is making, so a solver loaded from a checkpoint knows where to continue
+
+        DUAL_INIT: pivots on the dual of the dictionary, the auxiliary problem of dual initialization
+        DUAL_SIMPLEX: dual simplex pivots making the dictionary feasible
+        PRIMAL: primal pivots on the feasible dictionary
+    """
+    DUAL_INIT = 1
+    DUAL_SIMPLEX = 2
+    PRIMAL = 3
+
+class SolveLimit(Enum):
+    """
+    What stopped a solve before it was done, see SimplexConfig
+
+        PIVOTS: pivot_limit pivots were made
+        TIME: the solve ran for time_limit seconds
+        SELECTION_TIME: selection_time_limit seconds were spent choosing pivots
+        CANCELLED: the solve was cancelled through its CancelToken
+    """
+    PIVOTS = 1
+    TIME = 2
+    SELECTION_TIME = 3
+    CANCELLED = 4
+
+class CancelToken():
+    """
+    Cancels a solve from another thread or a signal handler. The solver checks it between pivots
+    """
+    def __init__(self):
+        self.__event = threading.Event()
+
+    def cancel(self):
+        self.__event.set()
+
+    def is_cancelled(self):
+        return self.__event.is_set()
+
+class SolveStopped(Exception):
+    """
+    Raised between pivots once a limit is reached, it unwinds the solve up to SimplexSolver.solve. solver is the
+    solver that was pivoting (the float solver in the HYBRID mode, otherwise the solver itself)
+    """
+    def __init__(self, solver, limit):
+        super().__init__(f"Solve stopped: {limit.name}")
+        self.solver = solver
+        self.limit = limit
 
 class SimplexSolver():
     DEBUG = False
 
-    def __init__(self, objective_function: LinearExpression, constraints, config: SimplexConfig=None):
-        """ """
+    def __init__(self, objective_function: LinearExpression, constraints, config: SimplexConfig=None, basis=None, postsolve=None):
+        """
+        basis warm starts the solve from a basis saved by get_basis() of an earlier solve. The starting dictionary
+        is pivoted to it before solving, and the dual simplex makes it feasible if it is not
+
+        postsolve is the list of steps the L.P. went through before it was given to the solver (presolve.Postsolve,
+        scaling.Scaling), in the order they were applied. They are undone in reverse order to print the result of the original L.P.
+
+        In the HYBRID solve mode the L.P. is first solved by a REVISED solver, see __solve_float. If config.scaling_method
+        is set, only the L.P. of that float solve is scaled
+
+        The solver takes ownership of the objective function and constraints, they are not cloned and must not be
+        used by the caller afterwards
+
+        If config.checkpoint_path is set, checkpoints of the solve are written to it while pivoting, see
+        checkpoint.load to continue from one
+
+        cancel() cancels the solve, see solve(). cancel_token can be replaced by a CancelToken shared with other solvers
+        """
         if config is not None:
             self.config = config
         else:
             self.config = SimplexConfig()
 
-        self.s_dict = SimplexDictionary(objective_function, constraints, config)
-        self.degenerate_count = 0
+        self.cancel_token = CancelToken()
+        # the dictionary with the best feasible solution found when a limit stops the solve, and the postsolve steps of its L.P.
+        self.best_dict = None
+        self.best_postsolve = None
+        self.__limit_start = time.perf_counter()
+
+        if self.config.checkpoint_path is not None and self.config.solve_mode not in (SolveMode.DICTIONARY, SolveMode.HYBRID):
+            raise Exception(f"Solve mode '{self.config.solve_mode.name}' can not be checkpointed, only DICTIONARY and HYBRID can")
+
+        self.float_solver = None
+        if self.config.solve_mode == SolveMode.HYBRID:
+            if RevisedSimplex is None:
+                raise Exception(f"Solve mode '{self.config.solve_mode.name}' requires numpy to be installed")
+
+            float_config = copy.copy(self.config)
+            float_config.solve_mode = SolveMode.REVISED
+            # only the exact solve is checkpointed, a resumed solve does not go back to the float one
+            float_config.checkpoint_path = None
+            float_pivot_limit = FLOAT_PIVOT_FACTOR*(objective_function.num_terms() + len(constraints))
+            if float_config.pivot_limit is None or float_pivot_limit < float_config.pivot_limit:
+                float_config.pivot_limit = float_pivot_limit
+            self.float_solver = self.__create_float_solver(objective_function, constraints, float_config, basis)
+            basis = None
+
         self.stats = SimplexStats()
+        self.observers = []
+        self.postsolve = [] if postsolve is None else postsolve
+
+        # the original objective function coefficients and bounds, for the sensitivity analysis
+        self.costs = [var.coefficient for var in objective_function.get_vars()]
+        self.bounds = [constraint.get_constant().coefficient for constraint in constraints]
+
+        self.s_dict = self.__timed('create_dictionary', self.__create_dictionary, objective_function, constraints, config)
+        self.__time_update_state()
+        self.degenerate_count = 0
         self.stats.num_variables = self.s_dict.n
         self.stats.num_constraints = len(constraints)
 
+        self.warm_start = basis is not None
+        if self.warm_start:
+            self.__timed('set_basis', self.s_dict.set_basis, basis)
+
         self.pivot_method = self.config.pivot_method
 
+        # None until the solve starts pivoting, orig_fn is the objective function put aside while making the dictionary feasible
+        self.phase = None
+        self.orig_fn = None
+        self.__reset_checkpoint_interval()
+
+    def __create_float_solver(self, objective_function, constraints, float_config, basis):
+        """
+        The REVISED solver of the HYBRID mode. Scaling the L.P. does not rename its variables, so the basis the
+        float solve ends with is a basis of the exact dictionary either way
+        """
+        if float_config.scaling_method == ScalingMethod.NONE:
+            # the revised simplex only reads the expressions while it is built, so it is built first and
+            # the exact dictionary then takes ownership of the same expressions
+            return SimplexSolver(objective_function, constraints, float_config, basis)
+
+        start = time.perf_counter()
+        (objective_function, constraints, scaling) = scale(objective_function, constraints, float_config.scaling_method, float_config.scaling_passes)
+        for i, constraint in enumerate(constraints):
+            constraint.set_epsilon(i+1, len(constraints))
+        scaling_time = time.perf_counter() - start
+
+        float_solver = SimplexSolver(objective_function, constraints, float_config, basis, [scaling])
+        float_solver.stats.add_phase_time('scaling', scaling_time)
+        return float_solver
+
+    def __getstate__(self):
+        """
+        Everything needed to continue the solve: the dictionary, the phase and put aside objective function,
+        the stats so far, the configuration and the postsolve steps. Observers and the cancel token are not saved,
+        and the float solve of the HYBRID mode is already over by the time pivots are checkpointed
+        """
+        state = dict(self.__dict__)
+        state['observers'] = []
+        state['float_solver'] = None
+        state['cancel_token'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.cancel_token = CancelToken()
+        self.__time_update_state()
+        self.__reset_checkpoint_interval()
+
+    def cancel(self):
+        """ Stops the solve before its next pivot, see solve(). Safe to call from another thread or a signal handler """
+        self.cancel_token.cancel()
+
+    def __create_dictionary(self, objective_function, constraints, config):
+        """
+        Creates the dictionary implementation selected by config.solve_mode
+        """
+        tableaus = {
+            SolveMode.FLOAT_TABLEAU: FloatTableau,
+            SolveMode.EXACT_INTEGER: IntegerTableau,
+            SolveMode.REVISED: RevisedSimplex,
+        }
+
+        if self.config.solve_mode in tableaus:
+            tableau = tableaus[self.config.solve_mode]
+            if tableau is None:
+                raise Exception(f"Solve mode '{self.config.solve_mode.name}' requires numpy to be installed")
+
+            return tableau(objective_function, constraints, config)
+
+        return SimplexDictionary(objective_function, constraints, config, clone=False)
+
+    def __timed(self, phase, fn, *args, **kwargs):
+        """ calls fn, adding the time it took to the phase """
+        st = time.perf_counter()
+        result = fn(*args, **kwargs)
+        self.stats.add_phase_time(phase, time.perf_counter() - st)
+        return result
+
+    def __time_update_state(self):
+        """
+        Replaces the dictionary's update_state, which it calls after every pivot and dual transform, with a timed one
+        """
+        update_state = self.s_dict.update_state
+
+        def timed_update_state(*args, **kwargs):
+            self.__timed('update_state', update_state, *args, **kwargs)
+
+        self.s_dict.update_state = timed_update_state
+
+    def add_observer(self, observer):
+        """
+        observer is called with a PivotEvent after every pivot
+        """
+        self.observers.append(observer)
+
+    def remove_observer(self, observer):
+        self.observers.remove(observer)
+
     def enable_debug(self):
         self.DEBUG = True
         self.s_dict.DEBUG = True
@@ -94,91 +384,314 @@ class SimplexSolver():
     def make_feasible(self):
         """ 
         Attempt to make the dictionary feasibly by solving an auxiliary problem.
-        Uses the dual initialization technique
+        Uses the dual initialization technique, or the dual simplex if configured to
         
         This does not necessarily succeed
 
         Returns: True if successful, else false
         """
+        # dual initialization starts from the slack basis, a warm start keeps its own basis
+        if self.phase == SolvePhase.DUAL_SIMPLEX or (self.phase is None and (self.warm_start or self.config.feasibility_method == FeasibilityMethod.DUAL_SIMPLEX)):
+            return self.__make_feasible_dual_simplex()
 
         # self.debug_print(self.s_dict.to_string())
         # self.debug_print("Dictionary is not feasible, attempting auxiliary problem")
 
-        orig_fn = self.s_dict.as_dual_init()
+        # a solver loaded from a checkpoint may already be solving the auxiliary problem
+        if self.phase is None:
+            self.orig_fn = self.__timed('as_dual_init', self.s_dict.as_dual_init)
+            self.phase = SolvePhase.DUAL_INIT
         self.solve(auxiliary=True)
         
         if self.s_dict.get_state() == SimplexState.OPTIMAL:
             # self.debug_print("Dual problem was solvable!")
 
             # take the dual to get our original problem in terms of the dual-feasible dictionary
-            self.s_dict.as_dual_nf()
+            self.__timed('as_dual_nf', self.s_dict.as_dual_nf)
+            self.__timed('restore_objective', self.s_dict.restore_objective, self.orig_fn)
+            self.orig_fn = None
 
-            orig_vars = list(orig_fn.get_vars())
+            return True
 
-            for var in orig_vars:
-                basis = self.s_dict.get_basis_by_varname(var.varname)
-                if basis is not None:
-                    orig_fn.substitute(var.varname, basis.get_vars(include_constant=True))
+        # self.debug_print("Dual problem was not solvable.")
+        return False
 
-            # self.debug_print("Transformed function:")
-            # self.debug_print(orig_fn.to_string())
+    def __make_feasible_dual_simplex(self):
+        """
+        Makes the dictionary dual feasible by replacing its objective function, then pivots with the
+        dual simplex until it is feasible. The dictionary is never transformed into its dual.
 
-            self.s_dict.set_objective_function(orig_fn)
+        The dual simplex pivots are counted as the auxiliary problem's
+        """
+        if self.phase is None:
+            self.orig_fn = self.__timed('as_dual_feasible', self.s_dict.as_dual_feasible)
+            self.phase = SolvePhase.DUAL_SIMPLEX
 
-            return True
+        self.__pivot_loop(True, SimplexState.INFEASIBLE, self.s_dict.get_dual_pivot, "Dual simplex pivots: ")
 
-        # self.debug_print("Dual problem was not solvable.")
-        return False
+        sys.stderr.write("\n")
+        self.stats.is_auxiliary()
+
+        if self.s_dict.get_state() == SimplexState.INFEASIBLE:
+            # the leaving row had no positive coefficient
+            return False
+
+        self.__timed('restore_objective', self.s_dict.restore_objective, self.orig_fn)
+        self.orig_fn = None
+
+        return True
+
+    def get_basis(self):
+        """
+        The basic variables of the dictionary, as a list of variable names that can be given back to a
+        new SimplexSolver to warm start it
+        """
+        return self.s_dict.get_basis()
+
+    def sensitivity(self):
+        """
+        Sensitivity analysis of the optimal dictionary, see sensitivity.analyze
+        """
+        if self.s_dict.get_state() != SimplexState.OPTIMAL or self.s_dict.is_dual:
+            raise Exception("sensitivity():: The L.P. has not been solved to optimality")
+
+        (objective_function, basis_exprs) = self.s_dict.get_dictionary()
+        report = analyze(objective_function, basis_exprs, self.costs, self.bounds)
+
+        for step in reversed(self.postsolve):
+            report = step.restore_sensitivity(report)
+
+        return report
 
     def solve(self, auxiliary = False):
-        if not self.s_dict.get_state() == SimplexState.FEASIBLE and not auxiliary:
-            if not self.make_feasible():
-                self.print_result(SimplexState.INFEASIBLE)
-                return
+        """
+        Solves the L.P. and prints the result, returns the state of the result.
 
-        start_time = time.time()
-        while self.s_dict.get_state() == SimplexState.FEASIBLE:
-            cur_val = self.s_dict.get_objective_value()
-            
-            st = time.perf_counter()
-            (entering_var, leaving_expr) = self.s_dict.get_pivot(self.pivot_method)
-            self.stats.pivot_selection_time += (time.perf_counter() - st)
+        Once a limit of the configuration is reached, or the solve is cancelled, the solve stops before its next
+        pivot and the state is LIMIT_REACHED. The best feasible solution found so far is printed with it, if the
+        dictionary was feasible, and stats.limit is the SolveLimit reached
+        """
+        if not auxiliary:
+            self.__limit_start = time.perf_counter()
+            self.best_dict = None
+            self.stats.limit = None
+
+        try:
+            try:
+                state = self.__solve(auxiliary)
+            except SolveStopped as stopped:
+                if auxiliary:
+                    raise
+                state = self.__stop(stopped)
+
+            if not auxiliary:
+                if self.config.checkpoint_path is not None and state != SimplexState.LIMIT_REACHED:
+                    # the solve is over, there is nothing left to continue
+                    checkpoint.remove(self.config.checkpoint_path)
+                self.print_result(state)
+
+            return state
+        finally:
+            if not auxiliary:
+                self.s_dict.close()
+
+    def __stop(self, stopped):
+        """
+        Records the limit that stopped the solve. The dictionary that was pivoting has the best feasible solution
+        found so far if it was in its primal phase, primal pivots never lower the objective value
+        """
+        sys.stderr.write(f"\nSolve stopped: {stopped.limit.name}\n")
+        self.stats.limit = stopped.limit
 
-            if self.s_dict.get_state() == SimplexState.FEASIBLE:
-                st = time.perf_counter()
-                self.s_dict.pivot(entering_var, leaving_expr)
-                self.stats.pivot_time += (time.perf_counter() - st)
+        if stopped.solver.phase == SolvePhase.PRIMAL:
+            self.best_dict = stopped.solver.s_dict
+            # the float solver of the HYBRID mode may have scaled its L.P. after the steps of this one
+            self.best_postsolve = self.postsolve if stopped.solver is self else self.postsolve + stopped.solver.postsolve
 
-                # self.debug_print(self.to_string())
-                # self.debug_print(f"entering_var: {entering_var.to_string()}\nleaving_var: {leaving_expr.to_string()}") 
-                updated_val = self.s_dict.get_objective_value()
-                self.stats.num_pivots += 1
-                
-                if cur_val == updated_val:
-                    self.stats.num_degenerate_pivots += 1
+        if stopped.solver is self and self.config.checkpoint_path is not None:
+            # the solve can be resumed from here, with higher limits
+            self.__timed('checkpoint', checkpoint.save, self.config.checkpoint_path, self)
+
+        return SimplexState.LIMIT_REACHED
+
+    def __solve(self, auxiliary):
+        """
+        Solves the dictionary, returns the state of the result
+        """
+        for step in self.postsolve:
+            if step.state is not None:
+                # presolve already found the result
+                return step.state
 
-                sys.stderr.write( "{0}{1}\r".format("Dual LP pivots: " if auxiliary else "Primal LP pivots: ", self.stats.num_pivots) )
+        if self.float_solver is not None and not auxiliary and self.phase is None:
+            self.__solve_float()
 
-        self.stats.solution_time = time.time() - start_time
+        if not auxiliary and self.phase != SolvePhase.PRIMAL:
+            # a solver loaded from a checkpoint continues making the dictionary feasible
+            if self.phase is not None or self.s_dict.get_state() not in (SimplexState.FEASIBLE, SimplexState.OPTIMAL):
+                if not self.make_feasible():
+                    return SimplexState.INFEASIBLE
+            self.phase = SolvePhase.PRIMAL
+
+        self.__pivot_loop(auxiliary, SimplexState.FEASIBLE, lambda: self.s_dict.get_pivot(self.pivot_method), "Dual LP pivots: " if auxiliary else "Primal LP pivots: ")
 
         sys.stderr.write("\n")
         
-        if not auxiliary:
-            state = self.s_dict.get_state()
-            self.print_result(state)
-        else:
+        if auxiliary:
             self.stats.is_auxiliary()
 
+        return self.s_dict.get_state()
+
+    def __solve_float(self):
+        """
+        HYBRID: solves the L.P. with the float revised simplex, then pivots the exact dictionary to the basis it ended with.
+        The exact solve continues from that basis like a warm start: it is done if the basis is optimal, the dual simplex
+        makes it feasible if it is not feasible, and primal pivots finish it otherwise. The result is exact even if the
+        float solve was wrong about it.
+
+        The float solve takes the pivots a cold exact solve with the same configuration would, so on an L.P. with
+        several optimal vertices it ends at the same one. If it ends without a basis of the dictionary (dual
+        initialization found the L.P. infeasible and stopped in its dual) or gives up cycling on round-off, it is
+        solved again with the dual simplex, which always ends at a basis of the dictionary. If that gives up too,
+        the exact solve starts from the slack basis
+        """
+        if not self.__run_float_solve(self.float_solver) or self.float_solver.s_dict.is_dual:
+            float_config = copy.copy(self.float_solver.config)
+            if float_config.feasibility_method == FeasibilityMethod.DUAL_SIMPLEX:
+                return
+
+            float_config.feasibility_method = FeasibilityMethod.DUAL_SIMPLEX
+            # the exact dictionary has not pivoted yet, it is still the L.P. the first float solve was built from
+            (objective_function, constraints) = self.s_dict.get_dictionary()
+            self.float_solver = self.__create_float_solver(objective_function, constraints, float_config, None)
+            if not self.__run_float_solve(self.float_solver):
+                return
+
+        self.__timed('set_basis', self.s_dict.set_basis, self.float_solver.get_basis(), False)
+        self.warm_start = True
+
+    def __run_float_solve(self, float_solver):
+        """
+        Runs the float solve of the HYBRID mode, returns False if it gave up after its FLOAT_PIVOT_FACTOR pivots.
+        Any other limit stops the whole solve
+        """
+        # the time limit covers both solves, and cancelling cancels both
+        float_solver.__limit_start = self.__limit_start
+        float_solver.cancel_token = self.cancel_token
+        try:
+            self.__timed('float_solve', float_solver.__solve, False)
+        except SolveStopped as stopped:
+            if stopped.limit != SolveLimit.PIVOTS or float_solver.config.pivot_limit == self.config.pivot_limit:
+                raise
+            sys.stderr.write("\nFloat solve gave up\n")
+            return False
+        finally:
+            float_solver.s_dict.close()
+
+            # kept if a limit stopped the float solve too
+            self.stats.float_stats = float_solver.stats
+            for phase, seconds in float_solver.stats.phase_times.items():
+                self.stats.add_phase_time(f'float_{phase}', seconds)
+
+        return True
+
+    def __pivot_loop(self, auxiliary, pivot_state, get_pivot, label):
+        """
+        Pivots while the dictionary is in pivot_state and get_pivot returns a pivot, adding the time it took to the
+        solution time. Checkpoints are written between pivots
+        """
+        start_time = time.time()
+        cur_val = self.s_dict.get_objective_value()
+        while self.s_dict.get_state() == pivot_state:
+            limit = self.__limit_reached()
+            if limit is not None:
+                self.stats.solution_time += time.time() - start_time
+                raise SolveStopped(self, limit)
+
+            st = time.perf_counter()
+            (entering_var, leaving_expr) = get_pivot()
+            selection_time = time.perf_counter() - st
+            self.stats.pivot_selection_time += selection_time
+
+            if entering_var is None or self.s_dict.get_state() != pivot_state:
+                break
+
+            if len(self.observers) > 0:
+                # the leaving variable has to be named before the pivot
+                pivot_names = self.s_dict.describe_pivot(entering_var, leaving_expr)
+
+            st = time.perf_counter()
+            self.s_dict.pivot(entering_var, leaving_expr)
+            pivot_time = time.perf_counter() - st
+            self.stats.pivot_time += pivot_time
+
+            # self.debug_print(self.to_string())
+            # self.debug_print(f"entering_var: {entering_var.to_string()}\nleaving_var: {leaving_expr.to_string()}") 
+            updated_val = self.s_dict.get_objective_value()
+            self.stats.num_pivots += 1
+            
+            degenerate = cur_val == updated_val
+            if degenerate:
+                self.stats.num_degenerate_pivots += 1
+            cur_val = updated_val
+
+            if len(self.observers) > 0:
+                event = PivotEvent(auxiliary, self.stats.num_pivots, *pivot_names, updated_val, degenerate, selection_time, pivot_time)
+                for observer in self.observers:
+                    observer(event)
+
+            sys.stderr.write( "{0}{1}\r".format(label, self.stats.num_pivots) )
+
+            self.__checkpoint_pivots += 1
+            if self.__checkpoint_due():
+                # the checkpoint's stats include the time spent so far
+                self.stats.solution_time += time.time() - start_time
+                start_time = time.time()
+                self.__timed('checkpoint', checkpoint.save, self.config.checkpoint_path, self)
+                self.__reset_checkpoint_interval()
+
+        self.stats.solution_time += time.time() - start_time
+
+    def __limit_reached(self):
+        """ The SolveLimit the solve has reached, or None if it can keep pivoting """
+        config = self.config
+        if self.cancel_token.is_cancelled():
+            return SolveLimit.CANCELLED
+
+        aux_stats = self.stats.aux_stats
+        if config.pivot_limit is not None and self.stats.num_pivots + (0 if aux_stats is None else aux_stats.num_pivots) >= config.pivot_limit:
+            return SolveLimit.PIVOTS
+
+        if config.time_limit is not None and time.perf_counter() - self.__limit_start >= config.time_limit:
+            return SolveLimit.TIME
+
+        if config.selection_time_limit is not None and self.stats.pivot_selection_time + (0 if aux_stats is None else aux_stats.pivot_selection_time) >= config.selection_time_limit:
+            return SolveLimit.SELECTION_TIME
+
+        return None
+
+    def __checkpoint_due(self):
+        """ True if a checkpoint should be written, checkpoint_pivots pivots or checkpoint_seconds seconds after the last one """
+        if self.config.checkpoint_path is None:
+            return False
+
+        return ((self.config.checkpoint_pivots is not None and self.__checkpoint_pivots >= self.config.checkpoint_pivots) or
+            (self.config.checkpoint_seconds is not None and time.perf_counter() - self.__checkpoint_time >= self.config.checkpoint_seconds))
+
+    def __reset_checkpoint_interval(self):
+        self.__checkpoint_pivots = 0
+        self.__checkpoint_time = time.perf_counter()
+
     def print_result(self, state):
+        for step in reversed(self.postsolve):
+            state = step.restore_state(state)
+
         if state == SimplexState.OPTIMAL:
             # self.debug_print("Optimal Dictionary:")
             # self.debug_print(self.to_string())
             # self.debug_print(f"Objective value: {self.s_dict.objective_function.get_constant().coefficient}")
-            objective_value = self.s_dict.objective_function.get_constant().coefficient
             print("optimal")
-            print(self.format_float(objective_value))
-            basis_sol = self.s_dict.get_basis_values()
-            print(self.format_solution(basis_sol))
+            self.__print_solution(self.s_dict, self.postsolve)
         elif state == SimplexState.INFEASIBLE:
             print('infeasible')
             # self.debug_print("INFEASIBLE!")
@@ -187,6 +700,42 @@ class SimplexSolver():
             print('unbounded')
             # self.debug_print("UNBOUNDED!")
             # self.debug_print(self.to_string())
+        elif state == SimplexState.LIMIT_REACHED:
+            # followed by the best feasible solution, if one was found
+            print('limit')
+            if self.best_dict is not None:
+                self.__print_solution(self.best_dict, self.best_postsolve)
+
+    def __print_solution(self, s_dict, postsolve):
+        """
+        Prints the objective value and the value of every variable of the original L.P., postsolve are the steps
+        the L.P. of s_dict went through
+        """
+        print(self.format_float(s_dict.get_objective_value()))
+        basis_sol = s_dict.get_basis_values()
+        for step in reversed(postsolve):
+            basis_sol = step.restore_values(basis_sol)
+        print(self.format_solution(basis_sol))
+
+    def print_sensitivity(self):
+        """
+        Prints the sensitivity analysis after the solution, each section a title line then its values.
+        Ranges are printed as lowest:highest, with -inf / inf for open ends
+        """
+        report = self.sensitivity()
+
+        def format_range(value_range):
+            (lowest, highest) = value_range
+            return f"{'-inf' if lowest is None else self.format_float(lowest)}:{'inf' if highest is None else self.format_float(highest)}"
+
+        print('reduced costs')
+        print(' '.join([self.format_float(value) for value in report.reduced_costs]))
+        print('shadow prices')
+        print(' '.join([self.format_float(value) for value in report.shadow_prices]))
+        print('cost ranges')
+        print(' '.join([format_range(value_range) for value_range in report.cost_ranges]))
+        print('bound ranges')
+        print(' '.join([format_range(value_range) for value_range in report.bound_ranges]))
 
     def format_solution(self, fn):
         return ' '.join([self.format_float(value) for (_, value) in fn])
@@ -0,0 +1,149 @@
+# Author: Tyrone Lagore V00995698
+
+class SparseLU():
+    """
+    LU factorization of a sparse m x m basis matrix, with product form (eta) updates.
+
+    The basis is given as a list of m sparse columns, each a dictionary of {row: value}.
+    Rows and columns (basis positions) are 0 indexed.
+
+    Supported operations:
+        ftran: solve B x = a for x (x is indexed by basis position)
+        btran: solve y^T B = d^T for y (y is indexed by row)
+        update: replace the column at a basis position, given the ftran of the new column
+    """
+
+    # only pivot on entries at least this fraction of the largest entry of their column
+    PIVOT_THRESHOLD = 0.1
+
+    # entries smaller than this created by elimination are dropped
+    DROP_TOLERANCE = 1e-14
+
+    def __init__(self, columns, m):
+        """ """
+        self.m = m
+        self.etas = []
+        self.__factorize(columns)
+
+    def num_updates(self):
+        return len(self.etas)
+
+    def __factorize(self, columns):
+        """
+        Sparse gaussian elimination. Pivots are chosen from the column with the fewest entries,
+        picking the row with the fewest entries among the numerically acceptable ones (Markowitz).
+
+        Each step is stored as (pivot_row, pivot_col, L, U, diagonal) where L holds the
+        multipliers of the eliminated rows and U the remainder of the pivot row.
+        """
+        cols = [dict(column) for column in columns]
+        rows = [dict() for _ in range(self.m)]
+        for j, column in enumerate(cols):
+            for i, value in column.items():
+                rows[i][j] = value
+
+        active = set(range(self.m))
+        self.steps = []
+
+        for _ in range(self.m):
+            pivot_col = min(active, key=lambda j: len(cols[j]))
+            column = cols[pivot_col]
+
+            if len(column) == 0:
+                raise Exception("SparseLU:: Cannot factorize a singular basis")
+
+            largest = max(abs(value) for value in column.values())
+            pivot_row = min((i for i, value in column.items() if abs(value) >= self.PIVOT_THRESHOLD*largest), key=lambda i: len(rows[i]))
+
+            diagonal = column[pivot_row]
+            pivot_entries = [(j, value) for j, value in rows[pivot_row].items() if j != pivot_col]
+
+            lower = []
+            for i, value in column.items():
+                if i == pivot_row:
+                    continue
+
+                multiplier = value / diagonal
+                lower.append((i, multiplier))
+
+                row = rows[i]
+                del row[pivot_col]
+                for j, u in pivot_entries:
+                    updated = row.get(j, 0.0) - multiplier*u
+                    if abs(updated) < self.DROP_TOLERANCE:
+                        if j in row:
+                            del row[j]
+                            del cols[j][i]
+                    else:
+                        row[j] = updated
+                        cols[j][i] = updated
+
+            for j, _ in pivot_entries:
+                del cols[j][pivot_row]
+
+            rows[pivot_row] = {}
+            cols[pivot_col] = {}
+            active.discard(pivot_col)
+
+            self.steps.append((pivot_row, pivot_col, lower, pivot_entries, diagonal))
+
+    def ftran(self, vec):
+        """
+        Solves B x = vec. vec is indexed by row, the result by basis position
+        """
+        work = list(vec)
+        for (pivot_row, _, lower, _, _) in self.steps:
+            value = work[pivot_row]
+            if value != 0:
+                for i, multiplier in lower:
+                    work[i] -= multiplier*value
+
+        result = [0.0]*self.m
+        for (pivot_row, pivot_col, _, upper, diagonal) in reversed(self.steps):
+            value = work[pivot_row]
+            for j, u in upper:
+                value -= u*result[j]
+            result[pivot_col] = value / diagonal
+
+        for (position, pivot, others) in self.etas:
+            value = result[position] / pivot
+            if value != 0:
+                for i, alpha in others:
+                    result[i] -= alpha*value
+            result[position] = value
+
+        return result
+
+    def btran(self, vec):
+        """
+        Solves y^T B = vec^T. vec is indexed by basis position, the result by row
+        """
+        work = list(vec)
+        for (position, pivot, others) in reversed(self.etas):
+            value = work[position]
+            for i, alpha in others:
+                value -= alpha*work[i]
+            work[position] = value / pivot
+
+        result = [0.0]*self.m
+        for (pivot_row, pivot_col, _, upper, diagonal) in self.steps:
+            value = work[pivot_col] / diagonal
+            result[pivot_row] = value
+            if value != 0:
+                for j, u in upper:
+                    work[j] -= value*u
+
+        for (pivot_row, _, lower, _, _) in reversed(self.steps):
+            value = result[pivot_row]
+            for i, multiplier in lower:
+                value -= multiplier*result[i]
+            result[pivot_row] = value
+
+        return result
+
+    def update(self, position, alpha):
+        """
+        Replaces the basis column at position with a column whose ftran is alpha
+        """
+        others = [(i, value) for i, value in enumerate(alpha) if i != position and value != 0]
+        self.etas.append((position, alpha[position], others))
@@ -0,0 +1,817 @@
+# Author: Tyrone Lagore V00995698
+
+import abc
+import math
+import sys
+
+import numpy as np
+
+from fractions import Fraction
+from math import inf
+from simplex.linear_expressions import LinearExpression, Variable
+from simplex.simplex_dictionary import SimplexConfig, PivotMethod, SimplexState, dual_init_coefficients, best_priced, check_basis, CandidateList, DEVEX_RESET_FACTOR, DUAL_DEGENERATE_LIMIT
+
+class TableauDictionary(abc.ABC):
+    """
+    A simplex dictionary stored as a single 2-D array instead of a list of LinearExpressions.
+
+    Row 0 is the objective function and rows 1..m are the basis expressions.
+    Column 0 holds the constants, columns 1..n the non-basic variables and the
+    remaining columns the epsilon perturbation of each basis expression.
+
+    Variables are tracked by their index (x3 -> 3). basic[r] is the variable of row r and
+    nonbasic[col] is the variable of column col. Index 0 of both is a placeholder for the objective/constant.
+
+    The dictionary pivots exactly like SimplexDictionary does, including the order the objective
+    function variables are visited in (obj_order), so that both produce the same answer.
+
+    Subclasses implement the arithmetic (_pivot_update, _ratio_test, ...), the abstract methods below
+    """
+    DEBUG = False
+
+    def __init__(self, objective_function: LinearExpression, constraints, config = None):
+        """ """
+        if config is None:
+            self.config = SimplexConfig()
+        else:
+            self.config = config
+
+        self.is_dual = False
+        self.z_sign = 1
+        self.__weights_method = None
+        self.__dual_degenerate_pivots = 0
+        self.__reset_candidates()
+
+        self.n = objective_function.num_terms()
+        self.m = len(constraints)
+        self.num_x = self.n
+
+        obj_vars = objective_function.get_vars()
+        self.nonbasic = [0] + [var.idx for var in obj_vars]
+        self.basic = [0] + [Variable(constraint.varname(), 0).idx for constraint in constraints]
+
+        num_eps = max([constraint.num_epsilon for constraint in constraints] + [0])
+
+        rows = [[objective_function.get_constant().coefficient] + [var.coefficient for var in obj_vars] + [0]*num_eps]
+        for constraint in constraints:
+            row = [constraint.get_constant().coefficient]
+            for var in obj_vars:
+                basis_var = constraint.get_var(var.varname)
+                row.append(0 if basis_var is None else basis_var.coefficient)
+
+            epsilon = constraint.get_epsilon()
+            row += [epsilon.get(i, 0) for i in range(1, num_eps+1)]
+
+            rows.append(row)
+
+        self.tableau = self._to_array(rows)
+
+        # order the variables are visited in by the objective function and the basis expressions
+        self.obj_order = list(range(1, self.n+1))
+        self.row_order = list(range(1, self.n+1))
+
+        self.update_state(init=True)
+
+    def debug_print(self, msg):
+        if self.DEBUG:
+            sys.stderr.write("{0}\n".format(msg))
+
+    @abc.abstractmethod
+    def _to_array(self, rows):
+        """ Converts a list of rows of Fractions to the tableau array """
+
+    @abc.abstractmethod
+    def _value(self, entry):
+        """ Converts a tableau entry to the value of the variable it represents """
+
+    @abc.abstractmethod
+    def _pivot_update(self, col, row):
+        """ Rewrites the tableau so that the variable of col is basic in row """
+
+    @abc.abstractmethod
+    def _ratio_test(self, col):
+        """
+        Returns the rows with the smallest bound on the increase of the variable in col,
+        and that bound (None if the variable is unbounded)
+        """
+
+    @abc.abstractmethod
+    def _dual_ratios(self, cols, row):
+        """
+        -c_j / d_rj of the dual ratio test for each col, negated so that the smallest ratio is the largest value
+        (as accepted by _filter_largest)
+        """
+
+    @abc.abstractmethod
+    def _largest_increase_candidates(self, cols):
+        """
+        For every col in cols with a bound, returns (col, tied_rows, increase) where increase
+        is the increase in objective value of bringing col into the basis.
+        """
+
+    @abc.abstractmethod
+    def _filter_largest(self, values):
+        """ Returns the indices of values that tie for the largest value, in order """
+
+    @abc.abstractmethod
+    def _lex_greater(self, first, second):
+        """ True if row first has a larger epsilon than row second """
+
+    @abc.abstractmethod
+    def _floats(self, entries, power=1):
+        """ Converts tableau entries, or products of power entries, to the float64 values they represent """
+
+    @abc.abstractmethod
+    def _is_positive(self, entries):
+        pass
+
+    @abc.abstractmethod
+    def _is_negative(self, entries):
+        pass
+
+    def var_name(self, var_idx):
+        return f"{'y' if self.is_dual else 'x'}{var_idx}"
+
+    def get_state(self):
+        return self.__state
+
+    def get_objective_value(self):
+        return self._value(self.tableau[0, 0])
+
+    def get_basis_values(self):
+        """
+        """
+        rows = {var_idx: row for row, var_idx in enumerate(self.basic) if row > 0}
+
+        basis_sol = []
+        for var_idx in range(1, self.num_x+1):
+            row = rows.get(var_idx)
+            basis_sol += [(self.var_name(var_idx), 0 if row is None else self._value(self.tableau[row, 0]))]
+
+        return basis_sol
+
+    def get_basis(self):
+        """
+        Names of the basic variables, ordered by index
+        """
+        if self.is_dual:
+            raise Exception("get_basis():: The dictionary is a dual dictionary, it has no basis of the original L.P.")
+
+        return [self.var_name(var_idx) for var_idx in sorted(self.basic[1:])]
+
+    def set_basis(self, basis):
+        """
+        Pivots the dictionary to the given basis, choosing the leaving rows like SimplexDictionary.set_basis.
+        The epsilon columns start over as the identity at the new basis
+        """
+        if self.is_dual:
+            raise Exception("set_basis():: Cannot set the basis of a dual dictionary")
+
+        check_basis(basis, self.n, self.m)
+        target = {Variable(varname, 0).idx for varname in basis}
+
+        for var_idx in sorted(target):
+            if var_idx in self.basic:
+                continue
+
+            col = self.nonbasic.index(var_idx)
+            rows = [row for row in range(1, self.m+1) if self.basic[row] not in target and self._is_positive(abs(self.tableau[row, col]))]
+            if len(rows) == 0:
+                raise Exception(f"set_basis():: The basis is singular, '{self.var_name(var_idx)}' cannot enter the basis")
+
+            self.pivot(col, max(rows, key=lambda row: abs(self.tableau[row, col])))
+
+        if self.tableau.shape[1] == self.n + self.m + 1:
+            self.tableau[1:, self.n+1:] = 0
+            for row in range(1, self.m+1):
+                self.tableau[row, self.n+row] = self._one()
+
+        self.update_state()
+
+    def update_state(self, init=False):
+        """
+        """
+        self.__state = SimplexState.FEASIBLE
+
+        if self.__optimal():
+            self.__state = SimplexState.OPTIMAL
+        elif self._is_negative(self.tableau[1:, 0]).any():
+            self.__state = SimplexState.INFEASIBLE
+        elif init:
+            positive = self._is_positive(self.tableau[0, 1:self.n+1])
+            no_negative = ~self._is_negative(self.tableau[1:, 1:self.n+1]).any(axis=0)
+
+            if (positive & no_negative).any():
+                self.__state = SimplexState.UNBOUNDED
+
+    def __optimal(self):
+        return not self._is_positive(self.tableau[0, 1:self.n+1]).any() and not self._is_negative(self.tableau[1:, 0]).any()
+
+    def __no_entering_variable(self):
+        if self.__optimal():
+            self.__state = SimplexState.OPTIMAL
+        else:
+            self.__state = SimplexState.INFEASIBLE
+
+    def get_pivot(self, pivot_type):
+        """
+        Gets the entering column and leaving row for a specific pivot
+        """
+        if pivot_type == PivotMethod.LARGEST_COEFFICIENT:
+            return self.__get_largest_coefficient_pivot()
+        elif pivot_type == PivotMethod.LARGEST_INCREASE:
+            return self.__get_largest_increase_pivot()
+        elif pivot_type == PivotMethod.STEEPEST_EDGE or pivot_type == PivotMethod.DEVEX:
+            return self.__get_priced_pivot(pivot_type)
+
+        return (None, None)
+
+    def __reset_candidates(self):
+        self.__candidates = None
+        if self.config.pricing_chunk_size is not None:
+            self.__candidates = CandidateList(self.config.pricing_chunk_size)
+
+    def __entering_candidates(self):
+        """
+        The columns with a positive objective function coefficient, in order. With partial pricing, only those of the candidate list
+        """
+        if self.__candidates is None:
+            return [col for col in self.obj_order if self._is_positive(self.tableau[0, col])]
+
+        return self.__candidates.select(lambda cols: list(self._is_positive(self.tableau[0, cols])), lambda: self.obj_order)
+
+    def __get_largest_coefficient_pivot(self):
+        cols = self.__entering_candidates()
+
+        if len(cols) == 0:
+            self.__no_entering_variable()
+            return (None, None)
+
+        entering_col = cols[self._filter_largest(self.tableau[0, cols])[0]]
+
+        (rows, _) = self._ratio_test(entering_col)
+        if len(rows) == 0:
+            self.__state = SimplexState.UNBOUNDED
+            return (None, None)
+
+        return (entering_col, self.__break_ties(rows))
+
+    def __reset_weights(self, pivot_type):
+        """
+        Starts the edge weights (indexed by column) of steepest edge or Devex pricing over at the current tableau.
+        The reference framework of Devex is the set of current non-basic variables
+        """
+        self.__weights_method = pivot_type
+        self.__weights = np.ones(self.n+1)
+
+        if pivot_type == PivotMethod.STEEPEST_EDGE:
+            self.__weights[1:] += self._floats((self.tableau[1:, 1:self.n+1]**2).sum(axis=0), 2)
+        elif pivot_type == PivotMethod.DEVEX:
+            self.__reference = set(self.nonbasic[1:])
+
+    def __get_priced_pivot(self, pivot_type):
+        """
+        The entering column has the largest c_j^2 / w_j, the leaving row is found with the usual ratio test
+        """
+        if self.__weights_method != pivot_type:
+            self.__reset_weights(pivot_type)
+
+        cols = self.__entering_candidates()
+
+        if len(cols) == 0:
+            self.__no_entering_variable()
+            return (None, None)
+
+        scores = self._floats(self.tableau[0, cols])**2 / self.__weights[cols]
+        entering_col = cols[best_priced(scores)]
+
+        (rows, _) = self._ratio_test(entering_col)
+        if len(rows) == 0:
+            self.__state = SimplexState.UNBOUNDED
+            return (None, None)
+
+        return (entering_col, self.__break_ties(rows))
+
+    def __update_weights(self, col, row):
+        """
+        Updates the edge weights for a pivot, before the tableau is updated. With p the pivot coefficient and
+        a_j = d_rj / p for each column j of the pivot row:
+
+        steepest edge: w_j = w_j - 2 a_j (e_j . e_q) + a_j^2 w_q, at least 1 + a_j^2, and w_leaving = w_q / p^2
+        Devex: w_j = max(w_j, a_j^2 w_q) and w_leaving = max(w_q / p^2, 1)
+
+        The leaving variable takes the column of the entering variable
+        """
+        n = self.n
+        pivot_row = self._floats(self.tableau[row, 1:n+1])
+        pivot = pivot_row[col-1]
+        ratios = pivot_row / pivot
+
+        weights = self.__weights
+        if self.__weights_method == PivotMethod.STEEPEST_EDGE:
+            column = self.tableau[1:, col]
+            products = self._floats(column @ self.tableau[1:, 1:n+1], 2)
+
+            # the exact weight of the entering variable is known, so use it instead of the updated one
+            entering_weight = 1 + products[col-1]
+            weights[1:] = np.maximum(weights[1:] - 2*ratios*products + ratios**2*entering_weight, 1 + ratios**2)
+        else:
+            column = self._floats(self.tableau[1:, col])
+            in_reference = np.array([var_idx in self.__reference for var_idx in self.basic[1:]], dtype=bool)
+            reference_weight = (1 if self.nonbasic[col] in self.__reference else 0) + (column[in_reference]**2).sum()
+
+            if weights[col] > DEVEX_RESET_FACTOR*reference_weight:
+                self.__reference = set(self.nonbasic[1:])
+                weights[:] = 1
+
+            entering_weight = weights[col]
+            weights[1:] = np.maximum(weights[1:], ratios**2*entering_weight)
+
+        weights[col] = max(entering_weight / pivot**2, 1.0)
+
+    def __get_largest_increase_pivot(self):
+        cols = self.__entering_candidates()
+
+        if len(cols) == 0:
+            self.__no_entering_variable()
+            return (None, None)
+
+        candidates = self._largest_increase_candidates(cols)
+
+        if len(candidates) == 0:
+            # we had positive variables in our non-basic, but nothing to pivot out
+            self.__state = SimplexState.UNBOUNDED
+            return (None, None)
+
+        largest = self._filter_largest([increase for (_, _, increase) in candidates])
+
+        # break ties based on lexicographical anti-cycling, first one wins on equal epsilon
+        (entering_col, leaving_row) = (None, None)
+        for i in largest:
+            (col, rows, _) = candidates[i]
+            row = self.__break_ties(rows)
+            if leaving_row is None or self._lex_greater(row, leaving_row):
+                (entering_col, leaving_row) = (col, row)
+
+        return (entering_col, leaving_row)
+
+    def __break_ties(self, rows):
+        """
+        Break ties using the lexicographical method, the row with the largest epsilon wins
+        """
+        top = rows[0]
+        for row in rows[1:]:
+            if self._lex_greater(row, top):
+                top = row
+
+        return top
+
+    def describe_pivot(self, entering_col, leaving_row):
+        """
+        (entering variable name, leaving variable name, 0 indexed row of the leaving variable) of a pivot
+        """
+        return (self.var_name(self.nonbasic[entering_col]), self.var_name(self.basic[leaving_row]), leaving_row-1)
+
+    def pivot(self, entering_col, leaving_row):
+        """
+        Pivots the variable of entering_col into the basis in place of the variable of leaving_row
+        """
+        if self.__weights_method is not None:
+            self.__update_weights(entering_col, leaving_row)
+
+        self._pivot_update(entering_col, leaving_row)
+
+        (self.basic[leaving_row], self.nonbasic[entering_col]) = (self.nonbasic[entering_col], self.basic[leaving_row])
+
+        # the leaving variable is appended to the end of every expression
+        self.obj_order.remove(entering_col)
+        self.obj_order.append(entering_col)
+        self.row_order.remove(entering_col)
+        self.row_order.append(entering_col)
+
+        self.update_state()
+
+    def as_dual_init(self):
+        """
+        Transforms the dictionary into a dual dictionary for initialization
+
+        Returns the original objective function as (constant, [(var_idx, coefficient)])
+        """
+        orig_fn = (self._value(self.tableau[0, 0]), [(self.nonbasic[col], self._value(self.tableau[0, col])) for col in self.obj_order])
+
+        cols = {var_idx: col for col, var_idx in enumerate(self.nonbasic) if col > 0}
+        coefficients = dual_init_coefficients(self.n, self.config.initialization_function)
+
+        self.tableau[0, :] = 0
+        self.z_sign = 1
+        self.obj_order = []
+        for var_idx, coef in enumerate(coefficients, 1):
+            self.tableau[0, cols[var_idx]] = -coef*self._one()
+            self.obj_order.append(cols[var_idx])
+
+        self.as_dual_nf()
+
+        return orig_fn
+
+    def as_dual_feasible(self):
+        """
+        Replaces the non-negative objective function coefficients with the negated initialization function
+        coefficients, making the dictionary dual feasible for the dual simplex
+
+        Returns the original objective function as (constant, [(var_idx, coefficient)])
+        """
+        orig_fn = (self._value(self.tableau[0, 0]), [(self.nonbasic[col], self._value(self.tableau[0, col])) for col in self.obj_order])
+
+        coefficients = dual_init_coefficients(self.n, self.config.initialization_function)
+        for col, coef in zip(self.obj_order, coefficients):
+            if not self._is_negative(self.tableau[0, col]):
+                self.tableau[0, col] = -coef*self._one()
+
+        self.update_state()
+
+        return orig_fn
+
+    def get_dual_pivot(self):
+        """
+        Gets the entering column and leaving row of a dual simplex pivot, chosen like SimplexDictionary.get_dual_pivot
+        """
+        rows = list(np.flatnonzero(self._is_negative(self.tableau[1:, 0])) + 1)
+        if len(rows) == 0:
+            return (None, None)
+
+        bland = self.__dual_degenerate_pivots >= DUAL_DEGENERATE_LIMIT
+        if bland:
+            leaving_row = min(rows, key=lambda row: self.basic[row])
+        else:
+            leaving_row = rows[self._filter_largest(-self.tableau[rows, 0])[0]]
+
+        cols = [col for col in self.obj_order if self._is_positive(self.tableau[leaving_row, col])]
+        if len(cols) == 0:
+            return (None, None)
+
+        tied = [cols[i] for i in self._filter_largest(self._dual_ratios(cols, leaving_row))]
+        entering_col = min(tied, key=lambda col: self.nonbasic[col]) if bland else tied[0]
+
+        if self._is_negative(self.tableau[0, entering_col]):
+            self.__dual_degenerate_pivots = 0
+        else:
+            self.__dual_degenerate_pivots += 1
+
+        return (entering_col, leaving_row)
+
+    def as_dual_nf(self):
+        """
+        Transforms the dictionary into a dual dictionary in normal form
+
+        The dual dictionary is the negative transpose of this one. The dual basis expressions are
+        created in the order of the objective function variables, each with a new epsilon.
+        """
+        (n, m) = (self.n, self.m)
+        order = self.obj_order
+
+        dual = self._zeros(n+1, 1+m+n)
+        dual[0, 0] = -self.tableau[0, 0]
+        dual[0, 1:m+1] = -self.tableau[1:, 0]
+        dual[1:, 0] = -self.tableau[0, order]
+        dual[1:, 1:m+1] = -self.tableau[1:m+1, order].T
+        for i in range(1, n+1):
+            dual[i, m+i] = self._one()
+
+        basic = [0] + [self.__dual_var(self.nonbasic[col]) for col in order]
+        nonbasic = [0] + [self.__dual_var(var_idx) for var_idx in self.basic[1:]]
+
+        self.basic = basic
+        self.nonbasic = nonbasic
+        self.tableau = dual
+
+        self.n = m
+        self.m = n
+        self.obj_order = list(range(1, self.n+1))
+        self.row_order = list(range(1, self.n+1))
+
+        self.is_dual = not self.is_dual
+        self.z_sign = -self.z_sign
+        self.__weights_method = None
+        self.__reset_candidates()
+        self.update_state()
+
+    def __dual_var(self, var_idx):
+        """
+        x1-n <-> yn+1-yn+m
+        xn+1-n+m <-> y1-m
+        """
+        if var_idx <= self.n:
+            return var_idx + self.m
+        return var_idx - self.n
+
+    def restore_objective(self, orig_fn):
+        """
+        Rewrites the original objective function (as returned by as_dual_init) in terms of the
+        current non-basic variables and sets it as the objective function
+        """
+        (constant, terms) = orig_fn
+
+        rows = {var_idx: row for row, var_idx in enumerate(self.basic) if row > 0}
+        cols = {var_idx: col for col, var_idx in enumerate(self.nonbasic) if col > 0}
+
+        objective = self._zeros(1, self.tableau.shape[1])[0]
+        objective[0] = constant*self._one()
+
+        order = [var_idx for (var_idx, _) in terms]
+        present = set(order)
+
+        for (var_idx, coef) in terms:
+            row = rows.get(var_idx)
+            if row is None:
+                objective[cols[var_idx]] += coef*self._one()
+                continue
+
+            objective += coef*self.tableau[row]
+
+            order.remove(var_idx)
+            present.discard(var_idx)
+            for col in self.row_order:
+                if self.nonbasic[col] not in present:
+                    order.append(self.nonbasic[col])
+                    present.add(self.nonbasic[col])
+
+        self.tableau[0] = objective
+        self.obj_order = [cols[var_idx] for var_idx in order]
+        self.update_state()
+
+    @abc.abstractmethod
+    def _zeros(self, rows, cols):
+        pass
+
+    @abc.abstractmethod
+    def _one(self):
+        """ The tableau entry representing 1 """
+
+    def close(self):
+        """ Nothing to release, the dictionary is solved in this process """
+        pass
+
+    def __expression(self, lhs, row):
+        # LinearExpressions hold Fractions, the float entries convert exactly
+        rhs_vars = [Variable(Variable.CONSTANT, Fraction(self._value(self.tableau[row, 0])))]
+        rhs_vars += [Variable(self.var_name(self.nonbasic[col]), Fraction(self._value(self.tableau[row, col]))) for col in range(1, self.n+1)]
+        return LinearExpression(Variable(lhs, Fraction(1)), rhs_vars, clone=False)
+
+    def get_dictionary(self):
+        """
+        The dictionary as LinearExpressions, (objective function, [basis expression of each row])
+        """
+        objective_function = self.__expression('z', 0)
+        basis_exprs = [self.__expression(self.var_name(self.basic[row]), row) for row in range(1, self.m+1)]
+        return (objective_function, basis_exprs)
+
+    def to_string(self):
+        (objective_function, basis_exprs) = self.get_dictionary()
+
+        msg = '\n----------------------------------\n'
+        msg += objective_function.to_string()
+        msg += '\n----------------------------------'
+
+        for basis_expr in basis_exprs:
+            msg += f'\n{basis_expr.to_string()}'
+
+        msg += '\n----------------------------------'
+
+        return msg
+
+class FloatTableau(TableauDictionary):
+    """
+    TableauDictionary in float64 arithmetic. Pricing, ratio tests and the pivot row update are
+    all vectorized NumPy operations over the tableau.
+
+    Comparisons are made within TOLERANCE, so ties that would be exact in rational arithmetic
+    are still broken by the lexicographic rule.
+    """
+    TOLERANCE = 1e-9
+
+    # entries smaller than this after a pivot are round-off and are flushed to 0
+    ZERO_TOLERANCE = 1e-11
+
+    def _to_array(self, rows):
+        return np.array([[float(value) for value in row] for row in rows], dtype=np.float64)
+
+    def _zeros(self, rows, cols):
+        return np.zeros((rows, cols), dtype=np.float64)
+
+    def _one(self):
+        return 1.0
+
+    def _value(self, entry):
+        if abs(entry) < self.TOLERANCE:
+            return 0.0
+        return float(entry)
+
+    def _floats(self, entries, power=1):
+        return np.asarray(entries, dtype=np.float64)
+
+    def _is_positive(self, entries):
+        return np.asarray(entries) > self.TOLERANCE
+
+    def _is_negative(self, entries):
+        return np.asarray(entries) < -self.TOLERANCE
+
+    def _ties(self, values, smallest):
+        return values <= smallest + self.TOLERANCE*max(1.0, abs(smallest))
+
+    def _filter_largest(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        largest = values.max()
+        return list(np.flatnonzero(values >= largest - self.TOLERANCE*max(1.0, abs(largest))))
+
+    def _lex_greater(self, first, second):
+        diff = self.tableau[first, self.n+1:] - self.tableau[second, self.n+1:]
+        nonzero = np.flatnonzero(np.abs(diff) > self.TOLERANCE)
+        return len(nonzero) > 0 and diff[nonzero[0]] > 0
+
+    def __bounds(self, cols):
+        coefs = self.tableau[1:, cols]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            bounds = np.where(coefs < -self.TOLERANCE, self.tableau[1:, 0, None] / -coefs, inf)
+        return bounds
+
+    def _ratio_test(self, col):
+        bounds = self.__bounds([col])[:, 0]
+        smallest = bounds.min()
+
+        if smallest == inf:
+            return ([], None)
+
+        return (list(np.flatnonzero(self._ties(bounds, smallest)) + 1), smallest)
+
+    def _dual_ratios(self, cols, row):
+        return self.tableau[0, cols] / self.tableau[row, cols]
+
+    def _largest_increase_candidates(self, cols):
+        bounds = self.__bounds(cols)
+        smallest = bounds.min(axis=0)
+        increases = smallest * self.tableau[0, cols]
+
+        candidates = []
+        for i, col in enumerate(cols):
+            if smallest[i] == inf:
+                continue
+
+            rows = list(np.flatnonzero(self._ties(bounds[:, i], smallest[i])) + 1)
+            candidates.append((col, rows, increases[i]))
+
+        return candidates
+
+    def _pivot_update(self, col, row):
+        tableau = self.tableau
+        coef = tableau[row, col]
+
+        pivot_row = -tableau[row] / coef
+        pivot_row[col] = 1.0 / coef
+
+        pivot_col = tableau[:, col].copy()
+        pivot_col[row] = 0
+
+        tableau[:, col] = 0
+        tableau[row] = pivot_row
+        tableau += np.outer(pivot_col, pivot_row)
+
+        tableau[np.abs(tableau) < self.ZERO_TOLERANCE] = 0
+
+class IntegerTableau(TableauDictionary):
+    """
+    TableauDictionary in exact integer arithmetic.
+
+    Every entry of the dictionary is tableau[i, j] / denominator, where the denominator is common to
+    the whole dictionary. Pivots use fraction-free (Bareiss) elimination: every division in a pivot
+    is an exact integer division by the previous denominator, so no gcd is ever computed while solving.
+    Fractions are only created when values are read out of the dictionary.
+
+    Since all entries share the denominator, comparing entries only compares the integers, and
+    ratios are compared by cross multiplication.
+    """
+
+    def _to_array(self, rows):
+        """
+        The starting denominator must be a multiple of the denominator of every minor of the dictionary
+        for the Bareiss divisions to be exact. The product of the row (or column) denominators is,
+        so the smaller of the two products is used.
+        """
+        rows = [[Fraction(value) for value in row] for row in rows]
+
+        row_denominators = [math.lcm(*[value.denominator for value in row]) for row in rows]
+        col_denominators = [math.lcm(*[row[j].denominator for row in rows]) for j in range(len(rows[0]))]
+        self.denominator = min(math.prod(row_denominators), math.prod(col_denominators))
+
+        tableau = np.empty((len(rows), len(rows[0])), dtype=object)
+        for i, row in enumerate(rows):
+            for j, value in enumerate(row):
+                tableau[i, j] = value.numerator * (self.denominator // value.denominator)
+
+        return tableau
+
+    def _zeros(self, rows, cols):
+        return np.zeros((rows, cols), dtype=object)
+
+    def _one(self):
+        return self.denominator
+
+    def _value(self, entry):
+        return Fraction(entry, self.denominator)
+
+    def _floats(self, entries, power=1):
+        # integer division rounds the exact quotient to the nearest float, the entries may be too large to convert first
+        return np.asarray(np.asarray(entries, dtype=object) / self.denominator**power, dtype=np.float64)
+
+    def _is_positive(self, entries):
+        return np.asarray(entries > 0, dtype=bool)
+
+    def _is_negative(self, entries):
+        return np.asarray(entries < 0, dtype=bool)
+
+    def _filter_largest(self, values):
+        """ values are entries, or (numerator, denominator) pairs with a positive denominator """
+        values = [value if isinstance(value, tuple) else (value, 1) for value in values]
+
+        (largest_num, largest_den) = values[0]
+        for (num, den) in values[1:]:
+            if num*largest_den > largest_num*den:
+                (largest_num, largest_den) = (num, den)
+
+        return [i for i, (num, den) in enumerate(values) if num*largest_den == largest_num*den]
+
+    def _lex_greater(self, first, second):
+        return self.tableau[first, self.n+1:].tolist() > self.tableau[second, self.n+1:].tolist()
+
+    def _ratio_test(self, col):
+        """
+        The bound of row i is tableau[i, 0] / -tableau[i, col] (the denominators cancel)
+        """
+        constants = self.tableau[:, 0]
+        coefs = self.tableau[:, col]
+
+        rows = []
+        (bound_num, bound_den) = (None, None)
+        for row in np.flatnonzero(self._is_negative(coefs[1:])) + 1:
+            (num, den) = (constants[row], -coefs[row])
+
+            if bound_num is None or num*bound_den < bound_num*den:
+                (bound_num, bound_den) = (num, den)
+                rows = [row]
+            elif num*bound_den == bound_num*den:
+                rows.append(row)
+
+        if bound_num is None:
+            return ([], None)
+
+        return (rows, (bound_num, bound_den))
+
+    def _dual_ratios(self, cols, row):
+        """ the denominators cancel, and tableau[row, col] is positive """
+        return [(self.tableau[0, col], self.tableau[row, col]) for col in cols]
+
+    def _largest_increase_candidates(self, cols):
+        candidates = []
+        for col in cols:
+            (rows, bound) = self._ratio_test(col)
+            if bound is None:
+                continue
+
+            # increase is bound * coefficient / denominator, the denominator is common to every column
+            candidates.append((col, rows, (bound[0]*self.tableau[0, col], bound[1])))
+
+        return candidates
+
+    def _pivot_update(self, col, row):
+        tableau = self.tableau
+        coef = tableau[row, col]
+
+        pivot_row = tableau[row].copy()
+        pivot_col = tableau[:, col].copy()
+
+        # Bareiss step, the division by the previous denominator is exact
+        updated = (np.multiply.outer(pivot_col, pivot_row) - tableau*coef) // self.denominator
+        updated[row] = pivot_row
+        updated[:, col] = -pivot_col
+        updated[row, col] = -self.denominator
+
+        # the pivot coefficient of a primal pivot is always negative, so the new denominator is positive.
+        # A dual simplex pivot coefficient is positive, negating every entry keeps the values and the exact divisions
+        self.tableau = updated
+        self.denominator = -coef
+        if self.denominator < 0:
+            self.tableau = -self.tableau
+            self.denominator = -self.denominator
+
+    def restore_objective(self, orig_fn):
+        """
+        Scales the dictionary by the common denominator of the original objective function
+        so that the restored objective function stays integral
+        """
+        (constant, terms) = orig_fn
+        scale = math.lcm(*[Fraction(coef).denominator for coef in [constant] + [coef for (_, coef) in terms]])
+
+        scaled_fn = (int(constant*scale), [(var_idx, int(coef*scale)) for (var_idx, coef) in terms])
+        super().restore_objective(scaled_fn)
+
+        self.tableau[1:] *= scale
+        self.denominator *= scale
@@ -1,11 +1,88 @@
 # Author: Tyrone Lagore V00995698
 
+import argparse
+import asyncio
+import json
+import os
+import signal
 import sys
 import simplex.simplex_parser as sp
-from simplex.simplex_dictionary import SimplexConfig, PivotMethod, InitializationFn
+from simplex import checkpoint
+from simplex.batch import find_lp_files, solve_batch
+from simplex.service import SolveService
+from simplex.simplex_dictionary import SimplexConfig, PivotMethod, InitializationFn, SolveMode, FeasibilityMethod, ScalingMethod, SimplexState
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Solves the linear program read from stdin, or a batch of linear program files")
+    parser.add_argument('inputs', nargs='*',
+        help="LP files or directories of LP files to solve in batch mode. If none are given a single LP is read from stdin")
+    parser.add_argument('--mode', choices=[mode.name for mode in SolveMode], default=SolveMode.DICTIONARY.name,
+        help="dictionary implementation to solve with (default: %(default)s)")
+    parser.add_argument('--pivot', choices=[method.name for method in PivotMethod], default=PivotMethod.LARGEST_COEFFICIENT.name,
+        help="pivot rule (default: %(default)s)")
+    parser.add_argument('--feasibility', choices=[method.name for method in FeasibilityMethod], default=FeasibilityMethod.DUAL_INIT.name,
+        help="how an infeasible starting dictionary is made feasible (default: %(default)s)")
+    parser.add_argument('--chunk-size', type=int, default=None,
+        help="partial pricing: only price a candidate list taken from chunks of this many objective function variables (default: price every variable)")
+    parser.add_argument('--basis', default=None,
+        help="warm start from the basis saved in this file by --save-basis")
+    parser.add_argument('--save-basis', default=None,
+        help="save the final basis to this file if the LP is optimal")
+    parser.add_argument('--sensitivity', action='store_true',
+        help="print the reduced costs, shadow prices and cost and bound ranges after an optimal solution")
+    parser.add_argument('--presolve', action='store_true',
+        help="remove redundant constraints and variables before solving")
+    parser.add_argument('--scaling', choices=[method.name for method in ScalingMethod], default=ScalingMethod.NONE.name,
+        help="row and column scaling in the FLOAT_TABLEAU and REVISED modes, and of the HYBRID float solve (default: %(default)s)")
+    parser.add_argument('--cache-dir', default=None,
+        help="cache parsed LPs in this directory, so a file solved before is not parsed again (default: no cache)")
+    parser.add_argument('--cache-size', type=int, default=256,
+        help="megabytes the LP cache may use before its least recently used entries are evicted (default: %(default)s)")
+    parser.add_argument('--checkpoint', default=None,
+        help="write a checkpoint of the solve to this file while pivoting, it is removed once the LP is solved (DICTIONARY and HYBRID modes)")
+    parser.add_argument('--checkpoint-pivots', type=int, default=None,
+        help="write a checkpoint every this many pivots (default: only by time)")
+    parser.add_argument('--checkpoint-interval', type=float, default=60,
+        help="write a checkpoint every this many seconds (default: %(default)s)")
+    parser.add_argument('--resume', action='store_true',
+        help="continue the solve from the file given by --checkpoint instead of reading the LP, if the file exists")
+    parser.add_argument('--pivot-limit', type=int, default=None,
+        help="stop after this many pivots, printing 'limit' and the best feasible solution found (default: no limit)")
+    parser.add_argument('--time-limit', type=float, default=None,
+        help="stop after this many seconds of solving, like --pivot-limit (default: no limit)")
+    parser.add_argument('--selection-time-limit', type=float, default=None,
+        help="stop after this many seconds spent choosing pivots, like --pivot-limit (default: no limit)")
+    parser.add_argument('--jobs', type=int, default=None,
+        help="batch and service modes: number of LPs solved at once (default: number of cores)")
+    parser.add_argument('--timeout', type=float, default=None,
+        help="batch and service modes: seconds after which an LP is stopped (default: no limit)")
+    parser.add_argument('--output-dir', default=None,
+        help="batch mode: write the solution of each LP to a file of the same name in this directory, instead of printing JSON lines")
+    parser.add_argument('--socket', default=None,
+        help="service mode: serve solve requests on this Unix socket until terminated, see simplex/service.py")
+    parser.add_argument('--port', type=int, default=None,
+        help="service mode: serve solve requests on this TCP port of --host until terminated")
+    parser.add_argument('--host', default='127.0.0.1',
+        help="service mode: address to serve on with --port (default: %(default)s)")
+    parser.add_argument('--queue-size', type=int, default=64,
+        help="service mode: LPs that may wait for a worker before requests stop being read (default: %(default)s)")
+    args = parser.parse_args()
+    if args.presolve and (args.basis is not None or args.save_basis is not None or args.sensitivity):
+        parser.error("--presolve cannot be combined with --basis, --save-basis or --sensitivity, which would refer to the presolved L.P.")
+    if args.checkpoint is not None and len(args.inputs) > 0:
+        parser.error("--checkpoint cannot be used in batch mode")
+    if args.resume and args.checkpoint is None:
+        parser.error("--resume requires --checkpoint")
+    if args.socket is not None and args.port is not None:
+        parser.error("--socket and --port cannot be combined")
+    if (args.socket is not None or args.port is not None) and (len(args.inputs) > 0 or args.checkpoint is not None or args.basis is not None or args.save_basis is not None or args.sensitivity):
+        parser.error("service mode cannot be combined with inputs, --checkpoint, --basis, --save-basis or --sensitivity")
+
+    return args
 
 def main():
     debug = False
+    args = parse_args()
 
     # debug_print was slowing the program down quite a bit so I removed debug as a cmdline argument
     # if len(sys.argv) > 1:
@@ -15,10 +92,48 @@ def main():
     # Set configurations for simplex program
     # Defaults are LARGEST_INCREASE and FIBONNACI initialization (for substituted dual objective function)
     simplex_config = SimplexConfig()
-    simplex_config.pivot_method = PivotMethod.LARGEST_COEFFICIENT
+    simplex_config.pivot_method = PivotMethod[args.pivot]
     simplex_config.initialization_function = InitializationFn.FIBONNACI
-    solver = sp.parse(sys.stdin, simplex_config)
-    sys.stderr.write("Beginning solve...\n")
+    simplex_config.solve_mode = SolveMode[args.mode]
+    simplex_config.feasibility_method = FeasibilityMethod[args.feasibility]
+    simplex_config.pricing_chunk_size = args.chunk_size
+    simplex_config.presolve = args.presolve
+    simplex_config.scaling_method = ScalingMethod[args.scaling]
+    simplex_config.cache_dir = args.cache_dir
+    simplex_config.cache_max_bytes = args.cache_size*1024*1024
+    simplex_config.checkpoint_path = args.checkpoint
+    simplex_config.checkpoint_pivots = args.checkpoint_pivots
+    simplex_config.checkpoint_seconds = args.checkpoint_interval
+    simplex_config.pivot_limit = args.pivot_limit
+    simplex_config.time_limit = args.time_limit
+    simplex_config.selection_time_limit = args.selection_time_limit
+
+    if len(args.inputs) > 0:
+        batch_main(args, simplex_config)
+        return
+
+    if args.socket is not None or args.port is not None:
+        asyncio.run(service_main(args, simplex_config))
+        return
+
+    basis = None
+    if args.basis is not None:
+        with open(args.basis) as basis_file:
+            basis = sp.parse_basis(basis_file.readline())
+
+    if args.resume and os.path.exists(args.checkpoint):
+        # the solve continues with the configuration it was started with, only the checkpoints and limits follow this run's options
+        solver = checkpoint.load(args.checkpoint)
+        solver.config.checkpoint_path = simplex_config.checkpoint_path
+        solver.config.checkpoint_pivots = simplex_config.checkpoint_pivots
+        solver.config.checkpoint_seconds = simplex_config.checkpoint_seconds
+        solver.config.pivot_limit = simplex_config.pivot_limit
+        solver.config.time_limit = simplex_config.time_limit
+        solver.config.selection_time_limit = simplex_config.selection_time_limit
+        sys.stderr.write(f"Resuming solve from '{args.checkpoint}' after {solver.stats.total().num_pivots} pivots...\n")
+    else:
+        solver = sp.parse(sys.stdin, simplex_config, basis)
+        sys.stderr.write("Beginning solve...\n")
 
     # turned off debug, the debug_print was hurting performance even when disabled
     # if debug:
@@ -26,8 +141,56 @@ def main():
     #     sys.stderr.write("{0}\n".format(solver.s_dict.to_string()))
     #     solver.enable_debug()
 
+    # a terminated solve stops at its next pivot and prints the best solution it has (and checkpoints, with --checkpoint)
+    signal.signal(signal.SIGTERM, lambda signum, frame: solver.cancel())
+
     solver.solve()
+    if args.sensitivity and solver.s_dict.get_state() == SimplexState.OPTIMAL:
+        solver.print_sensitivity()
+
     solver.stats.print_stats()
 
+    if args.save_basis is not None and solver.s_dict.get_state() == SimplexState.OPTIMAL:
+        with open(args.save_basis, 'w') as basis_file:
+            basis_file.write(sp.format_basis(solver.get_basis()) + '\n')
+
+def batch_main(args, simplex_config):
+    """
+    Solves every LP file in args.inputs. Each result is printed as a line of JSON as soon as it is solved,
+    or written to args.output_dir
+    """
+    if args.output_dir is not None:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    for result in solve_batch(find_lp_files(args.inputs), simplex_config, args.jobs, args.timeout):
+        if args.output_dir is None:
+            print(json.dumps(result), flush=True)
+            continue
+
+        sys.stderr.write(f"{result['file']}: {result['status']} ({result['time']:.2f}s)\n")
+        if result['error'] is not None:
+            sys.stderr.write(result['error'])
+        elif result['status'] != 'timeout':
+            with open(os.path.join(args.output_dir, os.path.basename(result['file'])), 'w') as out_file:
+                out_file.write(result['output'])
+
+async def service_main(args, simplex_config):
+    """
+    Serves solve requests on args.socket or args.port until the process is terminated or interrupted
+    """
+    service = SolveService(simplex_config, args.jobs, args.queue_size, args.timeout)
+    await service.start(args.socket, args.host, args.port)
+
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, stopped.set)
+
+    sys.stderr.write(f"Serving on {', '.join(str(address) for address in service.addresses())}...\n")
+    try:
+        await stopped.wait()
+    finally:
+        await service.close()
+
 if __name__ == "__main__":
     main()
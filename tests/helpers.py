@@ -0,0 +1,53 @@
+# Author: Tyrone Lagore V00995698
+
+import io
+import os
+
+import simplex.simplex_parser as sp
+from simplex.simplex_dictionary import SimplexConfig, SolveMode
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+def lp_path(volume, filename, directory='input'):
+    """ Path of an L.P. file of a test volume, or of its expected output with directory='output' """
+    return os.path.join(DATA_DIR, volume, directory, filename)
+
+def lp_files(volume):
+    """ Names of the L.P. files of a test volume, sorted """
+    return sorted(os.listdir(os.path.join(DATA_DIR, volume, 'input')))
+
+def read_input(volume, filename):
+    with open(lp_path(volume, filename)) as in_file:
+        return in_file.read()
+
+def read_output(volume, filename):
+    with open(lp_path(volume, filename, 'output')) as out_file:
+        return out_file.read()
+
+def make_config(solve_mode=SolveMode.DICTIONARY, **attributes):
+    """ A SimplexConfig for solve_mode with the given attributes set """
+    config = SimplexConfig()
+    config.solve_mode = solve_mode
+    for (name, value) in attributes.items():
+        if not hasattr(config, name):
+            raise Exception(f"make_config():: SimplexConfig has no attribute '{name}'")
+        setattr(config, name, value)
+    return config
+
+def parse_text(text, config=None, basis=None):
+    return sp.parse(io.StringIO(text), SimplexConfig() if config is None else config, basis)
+
+def solve_output(solver, capsys):
+    """ Solves with solver, returns what it printed """
+    capsys.readouterr()
+    solver.solve()
+    return capsys.readouterr().out
+
+def solve_text(text, config, capsys, basis=None):
+    """ Parses and solves the L.P. text, returns the solver and what it printed """
+    solver = parse_text(text, config, basis)
+    return (solver, solve_output(solver, capsys))
+
+def solve_file(volume, filename, config, capsys):
+    """ Parses and solves an L.P. file of a test volume, returns the solver and what it printed """
+    return solve_text(read_input(volume, filename), config, capsys)
@@ -0,0 +1,33 @@
+# Author: Tyrone Lagore V00995698
+
+import os
+
+from simplex.batch import find_lp_files, solve_batch
+from simplex.simplex_dictionary import SimplexConfig
+from tests.helpers import DATA_DIR, lp_path, read_output
+
+def test_batch_matches_expected():
+    input_dir = os.path.join(DATA_DIR, 'test_LPs_volume2', 'input')
+    files = find_lp_files([input_dir])[::4]
+
+    results = list(solve_batch(files, SimplexConfig(), jobs=2))
+
+    assert sorted(result['file'] for result in results) == sorted(files)
+    for result in results:
+        assert result['output'].strip() == read_output('test_LPs_volume2', os.path.basename(result['file'])).strip()
+
+        assert result['status'] == result['output'].split('\n')[0]
+        assert result['stats']['num_constraints'] > 0
+
+def test_batch_timeout_does_not_block_queue(tmp_path):
+    slow = lp_path('test_LPs_volume1', 'netlib_klein2.txt')
+    fast = find_lp_files([os.path.join(DATA_DIR, 'test_LPs_volume2', 'input')])[:3]
+    broken = tmp_path / 'broken.txt'
+    broken.write_text('1 2\nnot a number 3\n')
+
+    results = {result['file']: result for result in solve_batch([slow, str(broken)] + fast, SimplexConfig(), jobs=2, timeout=1)}
+
+    assert results[slow]['status'] == 'timeout'
+    assert results[str(broken)]['status'] == 'error'
+    for path in fast:
+        assert results[path]['output'].strip() == read_output('test_LPs_volume2', os.path.basename(path)).strip()
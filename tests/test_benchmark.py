@@ -0,0 +1,32 @@
+# Author: Tyrone Lagore V00995698
+
+import os
+
+from simplex.batch import find_lp_files
+from simplex.benchmark import benchmark_configs, run_benchmark, compare_results
+from simplex.simplex_dictionary import PivotMethod, InitializationFn, SolveMode
+from tests.helpers import DATA_DIR
+
+def record(file, status='optimal', time=1.0, num_pivots=10):
+    return {'config': 'config', 'file': file, 'status': status, 'time': time, 'num_pivots': num_pivots}
+
+def test_benchmark_records_every_config():
+    files = find_lp_files([os.path.join(DATA_DIR, 'test_LPs_volume2', 'input')])[:2]
+    configs = benchmark_configs(list(PivotMethod), list(InitializationFn), SolveMode.DICTIONARY)
+
+    report = run_benchmark(files, configs)
+
+    assert len(report['records']) == len(files)*len(configs)
+    for rec in report['records']:
+        assert rec['matches_expected']
+        assert rec['num_pivots'] >= rec['num_degenerate_pivots']
+
+def test_compare_flags_regressions():
+    baseline = {'records': [record('same'), record('slow'), record('noise', time=0.01), record('pivots'), record('status'), record('fast')]}
+    report = {'records': [record('same', time=1.1), record('slow', time=2.0), record('noise', time=0.05), record('pivots', num_pivots=20),
+        record('status', status='timeout'), record('fast', time=0.5), record('new')]}
+
+    (regressions, improvements) = compare_results(report, baseline, 0.2, 0.1)
+
+    assert sorted((change['file'], change['metric']) for change in regressions) == [('pivots', 'num_pivots'), ('slow', 'time'), ('status', 'status')]
+    assert [(change['file'], change['metric']) for change in improvements] == [('fast', 'time')]
@@ -0,0 +1,114 @@
+# Author: Tyrone Lagore V00995698
+
+import os
+import pytest
+
+from simplex import checkpoint
+from simplex.simplex_dictionary import SimplexConfig, SolveMode, FeasibilityMethod, PivotMethod
+from simplex.simplex_solver import SolvePhase
+from tests import helpers
+from tests.helpers import parse_text, read_input, solve_output
+
+class Interrupted(Exception):
+    pass
+
+def make_config(path, solve_mode=SolveMode.DICTIONARY, feasibility_method=FeasibilityMethod.DUAL_INIT, pivot_method=PivotMethod.LARGEST_COEFFICIENT):
+    """ checkpoints to path every 3 pivots """
+    return helpers.make_config(solve_mode, feasibility_method=feasibility_method, pivot_method=pivot_method,
+        checkpoint_path=path, checkpoint_pivots=3, checkpoint_seconds=None)
+
+def interrupt_after(solver, pivots):
+    """ stops the solve, like a killed process, once it has made this many pivots in total """
+    count = 0
+    def observer(event):
+        nonlocal count
+        count += 1
+        if count == pivots:
+            raise Interrupted()
+
+    solver.add_observer(observer)
+
+@pytest.mark.parametrize('filename, feasibility_method, pivot_method, interrupt_at', [
+    # interrupted solving the auxiliary problem, then the primal one
+    ('netlib_afiro.txt', FeasibilityMethod.DUAL_INIT, PivotMethod.LARGEST_COEFFICIENT, 8),
+    ('netlib_afiro.txt', FeasibilityMethod.DUAL_INIT, PivotMethod.LARGEST_COEFFICIENT, 17),
+    # interrupted making the dictionary feasible with the dual simplex, an infeasible L.P., then the primal problem
+    ('netlib_bgprtr.txt', FeasibilityMethod.DUAL_SIMPLEX, PivotMethod.STEEPEST_EDGE, 8),
+    ('netlib_afiro.txt', FeasibilityMethod.DUAL_SIMPLEX, PivotMethod.STEEPEST_EDGE, 10),
+    # the Devex weights are saved with the dictionary
+    ('netlib_sc50b.txt', FeasibilityMethod.DUAL_INIT, PivotMethod.DEVEX, 30),
+])
+def test_resumed_solve_matches(filename, feasibility_method, pivot_method, interrupt_at, tmp_path, capsys):
+    text = read_input('test_LPs_volume1', filename)
+    path = str(tmp_path / 'checkpoint')
+
+    expected_solver = parse_text(text, make_config(None, SolveMode.DICTIONARY, feasibility_method, pivot_method))
+    expected = solve_output(expected_solver, capsys)
+
+    solver = parse_text(text, make_config(path, SolveMode.DICTIONARY, feasibility_method, pivot_method))
+    interrupt_after(solver, interrupt_at)
+    with pytest.raises(Interrupted):
+        solver.solve()
+
+    resumed = checkpoint.load(path)
+    assert resumed.phase is not None
+    assert resumed.stats.total().num_pivots <= interrupt_at
+
+    assert solve_output(resumed, capsys) == expected
+    assert resumed.stats.total().num_pivots == expected_solver.stats.total().num_pivots
+    assert not os.path.exists(path)
+
+def test_checkpoint_phases(tmp_path):
+    """ a checkpoint taken while solving the auxiliary problem keeps the original objective function aside """
+    text = read_input('test_LPs_volume2', 'optimal_10x7_7.txt')
+    path = str(tmp_path / 'checkpoint')
+
+    config = make_config(path)
+    config.checkpoint_pivots = 1
+    solver = parse_text(text, config)
+    interrupt_after(solver, 2)
+    with pytest.raises(Interrupted):
+        solver.solve()
+
+    resumed = checkpoint.load(path)
+    assert resumed.phase == SolvePhase.DUAL_INIT
+    assert resumed.s_dict.is_dual
+    assert resumed.orig_fn.deepequals(parse_text(text, SimplexConfig()).s_dict.objective_function)
+    assert resumed.stats.num_pivots == 1
+    assert solver.stats.phase_times['checkpoint'] > 0
+
+def test_checkpoint_seconds(tmp_path, capsys):
+    text = read_input('test_LPs_volume2', 'optimal_10x7_7.txt')
+    path = str(tmp_path / 'checkpoint')
+
+    config = make_config(path)
+    config.checkpoint_pivots = None
+    config.checkpoint_seconds = 0
+    solver = parse_text(text, config)
+    interrupt_after(solver, 3)
+    with pytest.raises(Interrupted):
+        solver.solve()
+
+    # the observers see a pivot before it is checkpointed
+    assert checkpoint.load(path).stats.num_pivots == 2
+
+def test_hybrid_checkpoints_the_exact_solve(tmp_path, capsys):
+    text = read_input('test_LPs_volume1', 'netlib_sc50b.txt')
+    path = str(tmp_path / 'checkpoint')
+
+    solver = parse_text(text, make_config(path, SolveMode.HYBRID))
+    assert solver.float_solver.config.checkpoint_path is None
+
+    expected = solve_output(parse_text(text, make_config(None, SolveMode.HYBRID)), capsys)
+    assert solve_output(solver, capsys) == expected
+    assert not os.path.exists(path)
+
+def test_unsupported_modes_are_rejected(tmp_path):
+    with pytest.raises(Exception):
+        parse_text("1 1\n1 1 2\n", make_config(str(tmp_path / 'checkpoint'), SolveMode.REVISED))
+
+def test_not_a_checkpoint(tmp_path):
+    path = tmp_path / 'checkpoint'
+    path.write_bytes(b'1 1\n1 1 2\n')
+    with pytest.raises(Exception, match='is not a checkpoint'):
+        checkpoint.load(str(path))
@@ -0,0 +1,83 @@
+# Author: Tyrone Lagore V00995698
+
+import pytest
+
+from simplex import simplex_solver
+from simplex.simplex_dictionary import FeasibilityMethod, PivotMethod, SolveMode
+from tests.helpers import lp_files, make_config, parse_text, read_input, read_output, solve_output, solve_text
+
+VOLUME2_FILES = lp_files('test_LPs_volume2')
+
+def solve(text, capsys, solve_mode=SolveMode.HYBRID, basis=None, **attributes):
+    """ the solver and its stripped output """
+    (solver, output) = solve_text(text, make_config(solve_mode, **attributes), capsys, basis)
+    return (solver, output.strip())
+
+@pytest.mark.parametrize('filename', VOLUME2_FILES[::2])
+def test_hybrid_matches_expected(filename, capsys):
+    expected = read_output('test_LPs_volume2', filename).strip()
+
+    (_, output) = solve(read_input('test_LPs_volume2', filename), capsys)
+    assert output == expected
+
+def test_optimal_float_basis_needs_no_exact_pivots(capsys):
+    (solver, output) = solve(read_input('test_LPs_volume1', 'netlib_sc50b.txt'), capsys)
+    (_, expected) = solve(read_input('test_LPs_volume1', 'netlib_sc50b.txt'), capsys, SolveMode.DICTIONARY)
+
+    assert output == expected
+    assert solver.stats.float_stats.num_pivots > 0
+    assert solver.stats.num_pivots == 0
+    assert not solver.stats.required_auxiliary
+
+def test_infeasible_float_basis_is_verified(capsys):
+    # x1 + x2 <= -1 can not be satisfied, dual initialization ends in the dual of the dictionary so the float
+    # solve is redone with the dual simplex, which ends at a basis of the dictionary
+    (solver, output) = solve("1 1\n1 1 -1\n1 0 2\n", capsys)
+
+    assert output == 'infeasible'
+    assert 'set_basis' in solver.stats.phase_times
+    assert solver.float_solver.config.feasibility_method == FeasibilityMethod.DUAL_SIMPLEX
+    assert not solver.s_dict.is_dual
+
+@pytest.mark.parametrize('pivot_method', list(PivotMethod))
+def test_hybrid_ends_at_the_exact_vertex(pivot_method, capsys):
+    # afiro has several optimal vertices, the float solve follows the pivots of the exact one to the same vertex
+    text = read_input('test_LPs_volume1', 'netlib_afiro.txt')
+    (_, expected) = solve(text, capsys, SolveMode.DICTIONARY, pivot_method=pivot_method)
+
+    (solver, output) = solve(text, capsys, pivot_method=pivot_method)
+    assert output == expected
+    assert solver.stats.num_pivots == 0
+
+def test_float_solve_gives_up(monkeypatch, capsys):
+    monkeypatch.setattr(simplex_solver, 'FLOAT_PIVOT_FACTOR', 0)
+    text = read_input('test_LPs_volume1', 'netlib_afiro.txt')
+    (_, expected) = solve(text, capsys, SolveMode.DICTIONARY)
+
+    # both float solves give up, the exact solve starts from the slack basis
+    (solver, output) = solve(text, capsys)
+    assert output == expected
+    assert solver.stats.limit is None
+    assert 'set_basis' not in solver.stats.phase_times
+    assert solver.float_solver.config.feasibility_method == FeasibilityMethod.DUAL_SIMPLEX
+
+@pytest.mark.parametrize('basis', [['x4', 'x5', 'x6'], ['x3', 'x5', 'x6']])
+def test_wrong_float_basis_is_repaired(basis, capsys):
+    text = read_input('test_LPs_volume2', 'optimal_3x3_2.txt')
+    (_, expected) = solve(text, capsys, SolveMode.DICTIONARY)
+
+    # stands in for a float solve that stopped at a basis that is not optimal
+    solver = parse_text(text, make_config(SolveMode.HYBRID))
+    solver.float_solver.get_basis = lambda: basis
+
+    assert solve_output(solver, capsys).strip() == expected
+    assert solver.stats.num_pivots + (solver.stats.aux_stats.num_pivots if solver.stats.required_auxiliary else 0) > 0
+
+def test_hybrid_warm_starts_its_float_solve(capsys):
+    text = read_input('test_LPs_volume1', 'netlib_afiro.txt')
+    (solver, expected) = solve(text, capsys)
+    (warm_solver, output) = solve(text, capsys, basis=solver.get_basis())
+
+    assert output == expected
+    assert warm_solver.stats.float_stats.num_pivots == 0
+    assert warm_solver.stats.num_pivots == 0
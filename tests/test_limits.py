@@ -0,0 +1,120 @@
+# Author: Tyrone Lagore V00995698
+
+import os
+import threading
+import pytest
+
+from fractions import Fraction
+
+from simplex import checkpoint
+from simplex.simplex_dictionary import SimplexState, SolveMode
+from simplex.simplex_solver import SolveLimit
+from tests import helpers
+from tests.helpers import make_config, parse_text
+
+def read_input(filename):
+    return helpers.read_input('test_LPs_volume1', filename)
+
+def solve(text, config, capsys):
+    solver = parse_text(text, config)
+    capsys.readouterr()
+    state = solver.solve()
+    return (solver, state, capsys.readouterr().out.split('\n'))
+
+def assert_feasible(text, objective_value, values, tolerance=0):
+    """ values satisfy every constraint of the L.P. in text, and give objective_value """
+    lines = text.strip().split('\n')
+    assert all(value >= -tolerance for value in values)
+    for line in lines[1:]:
+        parts = [Fraction(part) for part in line.split()]
+        assert sum(coef*value for coef, value in zip(parts[:-1], values)) <= parts[-1] + tolerance
+
+    assert sum(Fraction(part)*value for part, value in zip(lines[0].split(), values)) == pytest.approx(objective_value)
+
+def test_pivot_limit_prints_best_feasible_solution(capsys):
+    text = read_input('netlib_sc50b.txt')
+    config = make_config()
+    config.pivot_limit = 10
+
+    (solver, state, output) = solve(text, config, capsys)
+
+    assert state == SimplexState.LIMIT_REACHED
+    assert solver.stats.limit == SolveLimit.PIVOTS
+    assert solver.stats.num_pivots == 10
+    assert solver.stats.to_dict()['limit'] == 'PIVOTS'
+
+    assert output[0] == 'limit'
+    assert float(output[1]) == pytest.approx(float(solver.s_dict.get_objective_value()))
+    assert float(output[1]) < 70
+    assert_feasible(text, float(output[1]), [Fraction(value) for value in output[2].split()], 1e-6)
+
+def test_limit_before_feasible_has_no_solution(capsys):
+    # netlib_afiro.txt starts infeasible, the auxiliary problem takes 12 pivots
+    config = make_config()
+    config.pivot_limit = 5
+
+    (solver, state, output) = solve(read_input('netlib_afiro.txt'), config, capsys)
+
+    assert state == SimplexState.LIMIT_REACHED
+    assert solver.best_dict is None
+    assert output == ['limit', '']
+    assert solver.stats.num_pivots == 5
+
+@pytest.mark.parametrize('attribute, limit', [('time_limit', SolveLimit.TIME), ('selection_time_limit', SolveLimit.SELECTION_TIME)])
+def test_time_limits(attribute, limit, capsys):
+    config = make_config()
+    setattr(config, attribute, 0)
+
+    (solver, state, output) = solve(read_input('netlib_sc50b.txt'), config, capsys)
+
+    assert state == SimplexState.LIMIT_REACHED
+    assert solver.stats.limit == limit
+    # the slack basis of netlib_sc50b.txt is feasible
+    assert output[:2] == ['limit', '0']
+
+def test_cancel_from_another_thread(capsys):
+    solver = None
+    def observer(event):
+        if event.pivot_number == 3:
+            thread = threading.Thread(target=solver.cancel)
+            thread.start()
+            thread.join()
+
+    solver = parse_text(read_input('netlib_sc50b.txt'), make_config())
+    solver.add_observer(observer)
+    state = solver.solve()
+
+    assert state == SimplexState.LIMIT_REACHED
+    assert solver.stats.limit == SolveLimit.CANCELLED
+    assert solver.stats.num_pivots == 3
+
+def test_hybrid_limit_stops_the_float_solve(capsys):
+    text = read_input('netlib_sc50b.txt')
+    config = make_config(SolveMode.HYBRID)
+    config.pivot_limit = 10
+
+    (solver, state, output) = solve(text, config, capsys)
+
+    assert state == SimplexState.LIMIT_REACHED
+    assert solver.stats.float_stats.num_pivots == 10
+    assert solver.stats.num_pivots == 0
+    assert output[0] == 'limit'
+    assert_feasible(text, float(output[1]), [Fraction(value) for value in output[2].split()], 1e-6)
+
+def test_limited_solve_resumes_from_checkpoint(tmp_path, capsys):
+    text = read_input('netlib_sc50b.txt')
+    path = str(tmp_path / 'checkpoint')
+
+    config = make_config()
+    config.pivot_limit = 20
+    config.checkpoint_path = path
+    (_, state, _) = solve(text, config, capsys)
+    assert state == SimplexState.LIMIT_REACHED
+
+    resumed = checkpoint.load(path)
+    resumed.config.pivot_limit = None
+    capsys.readouterr()
+    assert resumed.solve() == SimplexState.OPTIMAL
+    assert capsys.readouterr().out.split('\n')[:2] == ['optimal', '70']
+    assert resumed.stats.num_pivots == 54
+    assert not os.path.exists(path)
@@ -0,0 +1,103 @@
+# Author: Tyrone Lagore V00995698
+
+import io
+import os
+import pytest
+import struct
+
+from fractions import Fraction
+
+import simplex.simplex_parser as sp
+from simplex.lp_cache import LPCache, HEADER
+from simplex.simplex_dictionary import SolveMode
+from tests.helpers import make_config, parse_text, read_input, solve_output
+
+SMALL_LP = "3 2 4\n1 1 2 4\n2 0 3 5\n2 -0.5 3 7\n"
+
+def test_cached_lp_equals_parsed_lp(tmp_path):
+    cache = LPCache(str(tmp_path), 1024*1024)
+    text = read_input('test_LPs_volume1', 'netlib_share1b.txt')
+    key = cache.key(text)
+    (obj_fn, constraints) = sp.parse_lp(io.StringIO(text))
+
+    assert cache.load(key) is None
+    assert cache.store(key, obj_fn, constraints)
+
+    (cached_obj_fn, cached_constraints) = cache.load(key)
+    assert cached_obj_fn.deepequals(obj_fn)
+    assert [constraint.varname() for constraint in cached_constraints] == [constraint.varname() for constraint in constraints]
+    assert all(cached.deepequals(constraint) for cached, constraint in zip(cached_constraints, constraints))
+
+@pytest.mark.parametrize('solve_mode', list(SolveMode))
+def test_cached_solve_matches_expected(solve_mode, tmp_path, capsys):
+    config = make_config(solve_mode, cache_dir=str(tmp_path))
+
+    outputs = []
+    for _ in range(2):
+        outputs.append(solve_output(parse_text(SMALL_LP, config), capsys))
+
+    assert len(os.listdir(tmp_path)) == 1
+    assert outputs[0] == outputs[1]
+
+def test_least_recently_used_is_evicted(tmp_path):
+    texts = ["1 1\n1 1 2\n", "1 2\n1 1 3\n", "2 1\n1 1 4\n"]
+    cache = LPCache(str(tmp_path), 1024*1024)
+    for i, text in enumerate(texts):
+        cache.store(cache.key(text), *sp.parse_lp(io.StringIO(text)))
+        os.utime(cache.path(cache.key(text)), (i, i))
+
+    # loading the oldest entry makes the second one the least recently used
+    assert cache.load(cache.key(texts[0])) is not None
+    cache.max_bytes = 2*os.path.getsize(cache.path(cache.key(texts[0])))
+    cache.evict()
+
+    assert [cache.load(cache.key(text)) is not None for text in texts] == [True, False, True]
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = LPCache(str(tmp_path), 1024*1024)
+    key = cache.key(SMALL_LP)
+    cache.store(key, *sp.parse_lp(io.StringIO(SMALL_LP)))
+
+    with open(cache.path(key), 'r+b') as cache_file:
+        cache_file.truncate(40)
+
+    assert cache.load(key) is None
+    assert not os.path.exists(cache.path(key))
+
+# int64 index after the header of the value to corrupt in the entry of SMALL_LP (n = m = 3, 8 non-zeros)
+@pytest.mark.parametrize('index, value', [
+    (5, 0),     # an objective function denominator
+    (12, 0),    # a bound denominator
+    (15, 9),    # a row start past the non-zeros
+    (18, 7),    # a column past n
+    (27, 0),    # a coefficient denominator
+])
+def test_corrupt_values_are_a_miss(index, value, tmp_path):
+    cache = LPCache(str(tmp_path), 1024*1024)
+    key = cache.key(SMALL_LP)
+    cache.store(key, *sp.parse_lp(io.StringIO(SMALL_LP)))
+
+    with open(cache.path(key), 'r+b') as cache_file:
+        cache_file.seek(HEADER.size + 8*index)
+        cache_file.write(struct.pack('q', value))
+
+    assert cache.load(key) is None
+    assert not os.path.exists(cache.path(key))
+
+def test_uncacheable_lps_are_not_stored(tmp_path):
+    cache = LPCache(str(tmp_path), 1024*1024)
+    huge = "1 1\n1 100000000000000000000 2\n"
+    assert not cache.store(cache.key(huge), *sp.parse_lp(io.StringIO(huge)))
+
+    cache.max_bytes = 16
+    assert not cache.store(cache.key(SMALL_LP), *sp.parse_lp(io.StringIO(SMALL_LP)))
+    assert os.listdir(tmp_path) == []
+
+def test_cached_coefficients_are_exact(tmp_path):
+    cache = LPCache(str(tmp_path), 1024*1024)
+    key = cache.key(SMALL_LP)
+    cache.store(key, *sp.parse_lp(io.StringIO(SMALL_LP)))
+
+    (_, constraints) = cache.load(key)
+    assert constraints[2].get_var('x2').coefficient == Fraction(1, 2)
+    assert constraints[1].get_var('x2') is None
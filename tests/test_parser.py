@@ -0,0 +1,35 @@
+# Author: Tyrone Lagore V00995698
+
+import pytest
+
+from fractions import Fraction
+
+import simplex.simplex_parser as sp
+from simplex.simplex_dictionary import SolveMode
+from tests.helpers import make_config, read_output, solve_file
+
+@pytest.mark.parametrize('part', ['0', '-0', '12', '-12', '+3', '1.5', '-0.0024', '.5', '-.5', '5.', '00.10', '1e3', '-1.2e-3', '1/3'])
+def test_parse_number(part):
+    value = sp.parse_number(part)
+    assert value == Fraction(part)
+    assert isinstance(value, Fraction)
+
+@pytest.mark.parametrize('part', ['', '.', '-', '--1', '1.2.3', 'x'])
+def test_parse_number_rejects_invalid(part):
+    with pytest.raises(ValueError):
+        sp.parse_number(part)
+
+def test_constraints_only_hold_non_zeros():
+    (obj_fn, n) = sp.parse_obj_function("1 0 2")
+    constraint = sp.parse_constraint("0 -0 3.5 0.0 7\n", n)
+
+    assert [var.varname for var in obj_fn.get_vars()] == ['x1', 'x2', 'x3']
+    assert [(var.varname, var.coefficient) for var in constraint.get_vars()] == [('x3', Fraction(-7, 2))]
+    assert constraint.get_constant().coefficient == 7
+
+@pytest.mark.parametrize('solve_mode', list(SolveMode))
+def test_sparse_lp_matches_expected(solve_mode, capsys):
+    expected = read_output('test_LPs_volume1', 'netlib_adlittle.txt').strip()
+
+    (_, output) = solve_file('test_LPs_volume1', 'netlib_adlittle.txt', make_config(solve_mode), capsys)
+    assert output.strip().split('\n')[:2] == expected.split('\n')[:2]
@@ -0,0 +1,89 @@
+# Author: Tyrone Lagore V00995698
+
+import pytest
+
+from fractions import Fraction
+
+import simplex.simplex_parser as sp
+from simplex.presolve import presolve
+from simplex.simplex_dictionary import SimplexState, SolveMode
+from tests.helpers import lp_files, make_config, parse_text, read_input, read_output, solve_text
+
+VOLUME2_FILES = lp_files('test_LPs_volume2')
+
+def presolve_text(text):
+    lines = text.strip().split('\n')
+    (obj_fn, n) = sp.parse_obj_function(lines[0])
+    constraints = [sp.parse_constraint(line, i+n) for i, line in enumerate(lines[1:])]
+    return presolve(obj_fn, constraints)
+
+def solve_presolved(text, solve_mode, capsys):
+    (solver, output) = solve_text(text, make_config(solve_mode, presolve=True), capsys)
+    return (solver, output.strip())
+
+def test_removes_empty_and_duplicate_rows_and_empty_columns():
+    # x1 + x2 <= 4 twice (the second scaled by 2), an empty row, and x3 in no constraint
+    (obj_fn, constraints, postsolve) = presolve_text("2 3 0\n1 1 0 4\n2 2 0 9\n0 0 0 5\n1 0 0 3\n")
+
+    assert (postsolve.removed_rows, postsolve.removed_columns) == (2, 1)
+    assert [var.varname for var in obj_fn.get_vars()] == ['x1', 'x2']
+    assert [constraint.varname() for constraint in constraints] == ['x3', 'x4']
+    assert [constraint.get_constant().coefficient for constraint in constraints] == [4, 3]
+    assert postsolve.columns == [1, 2, None]
+
+def test_shifts_lower_bounds():
+    # -x1 <= -2 is x1 >= 2
+    (obj_fn, constraints, postsolve) = presolve_text("-1 1\n-1 0 -2\n1 1 5\n")
+
+    assert (postsolve.removed_rows, postsolve.removed_columns) == (1, 0)
+    assert obj_fn.get_constant().coefficient == -2
+    assert constraints[0].get_constant().coefficient == 3
+    assert postsolve.restore_values([('x1', Fraction(0)), ('x2', Fraction(3))]) == [('x1', 2), ('x2', 3)]
+
+def test_fixes_columns_forced_to_zero():
+    (obj_fn, constraints, postsolve) = presolve_text("1 2 1\n1 1 0 0\n1 2 1 5\n")
+
+    assert (postsolve.removed_rows, postsolve.removed_columns) == (1, 2)
+    assert [var.coefficient for var in obj_fn.get_vars()] == [1]
+    assert postsolve.columns == [None, None, 1]
+
+@pytest.mark.parametrize('solve_mode', list(SolveMode))
+@pytest.mark.parametrize('text, expected', [
+    ("2 3 0\n1 1 0 4\n2 2 0 9\n0 0 0 5\n1 0 0 3\n", "optimal\n12\n0 4 0"),
+    ("-1 1\n-1 0 -2\n1 1 5\n", "optimal\n1\n2 3"),
+    ("1 1\n1 1 0\n0 1 5\n", "optimal\n0\n0 0"),
+    ("1 1\n0 1 3\n", "unbounded"),
+    ("1 1\n0 -1 -1\n0 1 0.5\n", "infeasible"),
+    ("1 1\n0 1 -1\n", "infeasible"),
+])
+def test_presolved_result(text, expected, solve_mode, capsys):
+    (_, output) = solve_presolved(text, solve_mode, capsys)
+    assert output == expected
+
+@pytest.mark.parametrize('filename', VOLUME2_FILES[::4])
+@pytest.mark.parametrize('solve_mode', list(SolveMode))
+def test_presolve_matches_expected(filename, solve_mode, capsys):
+    expected = read_output('test_LPs_volume2', filename).strip()
+
+    (_, output) = solve_presolved(read_input('test_LPs_volume2', filename), solve_mode, capsys)
+
+    assert output.split('\n')[:2] == expected.split('\n')[:2]
+
+def test_presolve_rejects_basis():
+    with pytest.raises(Exception):
+        parse_text("1 1\n1 1 2\n", make_config(presolve=True), ['x3'])
+
+def test_presolved_solution_is_feasible(capsys):
+    text = read_input('test_LPs_volume1', 'netlib_sc50b.txt')
+
+    (solver, output) = solve_presolved(text, SolveMode.DICTIONARY, capsys)
+    assert solver.postsolve[0].removed_rows > 0
+
+    lines = text.strip().split('\n')
+    values = [value for (_, value) in solver.postsolve[0].restore_values(solver.s_dict.get_basis_values())]
+    assert all(value >= 0 for value in values)
+    for line in lines[1:]:
+        parts = [Fraction(part) for part in line.split()]
+        assert sum(coef*value for coef, value in zip(parts[:-1], values)) <= parts[-1]
+
+    assert sum(Fraction(part)*value for part, value in zip(lines[0].split(), values)) == solver.s_dict.get_objective_value()
@@ -0,0 +1,43 @@
+# Author: Tyrone Lagore V00995698
+
+import numpy as np
+import pytest
+
+from simplex.simplex_dictionary import PivotMethod, SolveMode
+from simplex.sparse_lu import SparseLU
+from tests.helpers import lp_files, make_config, read_output, solve_file
+
+VOLUME = 'test_LPs_volume2'
+LP_FILES = lp_files(VOLUME)
+
+def solve(filename, solve_mode, pivot_method, capsys):
+    return solve_file(VOLUME, filename, make_config(solve_mode, pivot_method=pivot_method), capsys)[1]
+
+def test_sparse_lu_solves():
+    rng = np.random.default_rng(5)
+    m = 25
+    basis = np.diag(rng.uniform(1, 3, m)) + (rng.random((m, m)) < 0.1)*rng.normal(size=(m, m))
+    rhs = rng.normal(size=m)
+
+    lu = SparseLU([{i: basis[i, j] for i in range(m) if basis[i, j] != 0} for j in range(m)], m)
+
+    for _ in range(10):
+        assert np.allclose(basis @ np.array(lu.ftran(rhs)), rhs)
+        assert np.allclose(np.array(lu.btran(rhs)) @ basis, rhs)
+
+        column = rng.normal(size=m)
+        position = rng.integers(m)
+        lu.update(position, lu.ftran(column))
+        basis[:, position] = column
+
+@pytest.mark.parametrize('filename', LP_FILES)
+def test_revised_matches_expected(filename, capsys):
+    expected = read_output(VOLUME, filename).strip()
+
+    assert solve(filename, SolveMode.REVISED, PivotMethod.LARGEST_COEFFICIENT, capsys).strip() == expected
+
+@pytest.mark.parametrize('filename', LP_FILES[::5])
+@pytest.mark.parametrize('pivot_method', [PivotMethod.LARGEST_INCREASE, PivotMethod.STEEPEST_EDGE, PivotMethod.DEVEX])
+def test_revised_matches_dictionary(filename, pivot_method, capsys):
+    expected = solve(filename, SolveMode.DICTIONARY, pivot_method, capsys)
+    assert solve(filename, SolveMode.REVISED, pivot_method, capsys) == expected
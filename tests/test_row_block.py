@@ -0,0 +1,57 @@
+# Author: Tyrone Lagore V00995698
+
+import pytest
+
+from fractions import Fraction
+from simplex.linear_expressions import LinearExpression, Variable
+from simplex.row_block import RowBlock
+
+def make_row(varname, constant, coefficients):
+    rhs = [Variable(Variable.CONSTANT, Fraction(constant))] + [Variable(name, Fraction(coef)) for (name, coef) in coefficients.items()]
+    return LinearExpression(Variable(varname, Fraction(1)), rhs)
+
+def terms(basis_expr):
+    return [(var.varname, var.coefficient) for var in basis_expr.get_vars(include_constant=True)]
+
+def make_rows():
+    return [
+        make_row('x4', 4, {'x1': -1, 'x2': -1}),
+        make_row('x5', 6, {'x1': -2, 'x3': -1}),
+        make_row('x6', 5, {'x3': -1}),
+        make_row('x7', 3, {'x1': -1, 'x2': -1}),
+    ]
+
+def test_row_block_pivot_leaves_other_rows_untouched():
+    rows = make_rows()
+    untouched = rows[2]
+    untouched_terms = terms(untouched)
+
+    block = RowBlock(rows)
+    block.pivot('x1', 0)
+
+    # x1 does not appear in x6, it is neither rewritten nor given the leaving variable x4
+    assert block.rows[2] is untouched
+    assert terms(untouched) == untouched_terms
+    assert untouched.get_var('x4') is None
+
+    # x7 = 3 - (4 - x2 - x4) - x2, the x2 coefficients cancel and x2 is dropped
+    assert terms(block.rows[3]) == [(Variable.CONSTANT, -1), ('x4', 1)]
+    assert block.occurrences['x2'] == {0, 1}
+    assert block.occurrences['x4'] == {0, 1, 3}
+    assert 'x1' not in block.occurrences
+    assert block.num_infeasible() == 2
+
+def test_row_block_shares_the_basis_expressions():
+    rows = make_rows()
+    block = RowBlock(rows)
+    block.pivot('x1', 1)
+
+    assert block.rows is rows
+    assert rows[1].varname() == 'x1'
+
+def test_row_block_pivot_raises():
+    block = RowBlock(make_rows())
+
+    # x2 is not in the row of x6, the exception reaches the caller
+    with pytest.raises(Exception, match="in_terms_of\\(\\)::"):
+        block.pivot('x2', 2)
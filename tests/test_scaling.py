@@ -0,0 +1,109 @@
+# Author: Tyrone Lagore V00995698
+
+import pytest
+
+from fractions import Fraction
+
+import simplex.simplex_parser as sp
+from simplex.scaling import power_of_two, scale
+from simplex.simplex_dictionary import SolveMode, ScalingMethod, PivotMethod
+from tests.helpers import lp_files, make_config, parse_text, read_output, solve_file, solve_output, solve_text
+
+VOLUME2_FILES = lp_files('test_LPs_volume2')
+
+# coefficients spread over eight orders of magnitude
+BADLY_SCALED_LP = "1000 0.001 1\n10000 0.01 0 5000\n0.0001 0.001 0.1 1\n1 0 100000 20000\n"
+
+def parse_scaled(text, solve_mode, scaling_method):
+    return parse_text(text, make_config(solve_mode, scaling_method=scaling_method))
+
+def test_power_of_two():
+    assert power_of_two(1) == 1
+    assert power_of_two(0.3) == Fraction(1, 4)
+    assert power_of_two(1000) == 1024
+
+@pytest.mark.parametrize('scaling_method', [ScalingMethod.EQUILIBRATION, ScalingMethod.GEOMETRIC_EQUILIBRATION])
+def test_equilibrated_columns(scaling_method):
+    lines = BADLY_SCALED_LP.strip().split('\n')
+    (obj_fn, n) = sp.parse_obj_function(lines[0])
+    constraints = [sp.parse_constraint(line, i+n) for i, line in enumerate(lines[1:])]
+
+    (_, scaled, scaling) = scale(obj_fn, constraints, scaling_method, 4)
+
+    for j in range(1, obj_fn.num_terms()+1):
+        largest = max(abs(constraint.get_var(f'x{j}').coefficient) for constraint in scaled if constraint.get_var(f'x{j}') is not None)
+        assert Fraction(1, 2) <= largest <= 2
+
+    # x = Sx', so the bounds scale with the rows only
+    assert [constraint.get_constant().coefficient for constraint in scaled] == [Fraction(bound)*factor for bound, factor in zip([5000, 1, 20000], scaling.row_factors)]
+
+@pytest.mark.parametrize('solve_mode', [SolveMode.FLOAT_TABLEAU, SolveMode.REVISED])
+@pytest.mark.parametrize('scaling_method', [ScalingMethod.GEOMETRIC, ScalingMethod.EQUILIBRATION, ScalingMethod.GEOMETRIC_EQUILIBRATION])
+def test_scaled_solution_is_unscaled(solve_mode, scaling_method, capsys):
+    solver = parse_scaled(BADLY_SCALED_LP, solve_mode, scaling_method)
+    assert len(solver.postsolve) == 1
+
+    output = solve_output(solver, capsys).strip()
+
+    unscaled = parse_scaled(BADLY_SCALED_LP, SolveMode.DICTIONARY, scaling_method)
+    expected = solve_output(unscaled, capsys).strip()
+
+    (status, objective_value, values) = output.split('\n')
+    (expected_status, expected_value, expected_values) = expected.split('\n')
+    assert status == expected_status
+    assert float(objective_value) == pytest.approx(float(expected_value))
+    assert [float(value) for value in values.split()] == pytest.approx([float(value) for value in expected_values.split()])
+
+    assert solver.sensitivity().shadow_prices == pytest.approx(unscaled.sensitivity().shadow_prices, abs=1e-6)
+    assert solver.sensitivity().reduced_costs == pytest.approx(unscaled.sensitivity().reduced_costs, abs=1e-6)
+
+def test_exact_modes_are_not_scaled():
+    for solve_mode in [SolveMode.DICTIONARY, SolveMode.EXACT_INTEGER]:
+        assert parse_scaled(BADLY_SCALED_LP, solve_mode, ScalingMethod.GEOMETRIC).postsolve == []
+
+@pytest.mark.parametrize('filename', VOLUME2_FILES[::3])
+@pytest.mark.parametrize('solve_mode', [SolveMode.FLOAT_TABLEAU, SolveMode.REVISED])
+@pytest.mark.parametrize('pivot_method', [PivotMethod.LARGEST_COEFFICIENT, PivotMethod.LARGEST_INCREASE])
+def test_scaling_matches_expected(filename, solve_mode, pivot_method, capsys):
+    config = make_config(solve_mode, pivot_method=pivot_method, scaling_method=ScalingMethod.GEOMETRIC_EQUILIBRATION)
+    expected = read_output('test_LPs_volume2', filename).strip()
+
+    (_, output) = solve_file('test_LPs_volume2', filename, config, capsys)
+    assert output.strip().split('\n')[:2] == expected.split('\n')[:2]
+
+@pytest.mark.parametrize('solve_mode', [SolveMode.FLOAT_TABLEAU, SolveMode.REVISED])
+def test_scaling_may_end_at_another_optimal_vertex(solve_mode, capsys):
+    # the pivot rules compare scaled coefficients, optimal_3x3_6.txt has several optimal vertices
+    assert read_output('test_LPs_volume2', 'optimal_3x3_6.txt') == "optimal\n15\n0 0 2.5\n"
+
+    config = make_config(solve_mode, scaling_method=ScalingMethod.GEOMETRIC)
+    (_, output) = solve_file('test_LPs_volume2', 'optimal_3x3_6.txt', config, capsys)
+    assert output == "optimal\n15\n0.08333333 0 2.583333\n"
+
+def test_hybrid_scales_its_float_solve(capsys):
+    solver = parse_scaled(BADLY_SCALED_LP, SolveMode.HYBRID, ScalingMethod.GEOMETRIC)
+    assert solver.postsolve == []
+    assert len(solver.float_solver.postsolve) == 1
+
+    output = solve_output(solver, capsys)
+    expected = solve_output(parse_scaled(BADLY_SCALED_LP, SolveMode.DICTIONARY, ScalingMethod.NONE), capsys)
+
+    assert output == expected
+    assert 'float_scaling' in solver.stats.phase_times
+
+def test_hybrid_limit_prints_unscaled_float_solution(capsys):
+    config = make_config(SolveMode.HYBRID, scaling_method=ScalingMethod.GEOMETRIC, pivot_limit=1)
+
+    (solver, output) = solve_text(BADLY_SCALED_LP, config, capsys)
+    (status, objective_value, values) = output.strip().split('\n')
+    values = [Fraction(value) for value in values.split()]
+
+    assert status == 'limit'
+    assert solver.stats.float_stats.num_pivots == 1
+    assert any(value != 0 for value in values)
+    # the solution of the scaled float L.P. is unscaled before it is printed
+    lines = BADLY_SCALED_LP.strip().split('\n')
+    for line in lines[1:]:
+        parts = [Fraction(part) for part in line.split()]
+        assert sum(coef*value for coef, value in zip(parts[:-1], values)) <= parts[-1]*(1 + Fraction(1, 10**6))
+    assert float(sum(Fraction(part)*value for part, value in zip(lines[0].split(), values))) == pytest.approx(float(objective_value), rel=1e-6)
@@ -0,0 +1,85 @@
+# Author: Tyrone Lagore V00995698
+
+import pytest
+
+from fractions import Fraction
+
+from simplex.sensitivity import ratio_range
+from simplex.simplex_dictionary import SolveMode
+from tests.helpers import make_config, parse_text, read_input
+
+# max 3x1 + 2x2 + 4x3, optimal at x = (5/2, 3/2, 0) with dual values (2, 1/2, 0)
+SMALL_LP = "3 2 4\n1 1 2 4\n2 0 3 5\n2 1 3 7\n"
+
+def solve(text, solve_mode=SolveMode.DICTIONARY):
+    solver = parse_text(text, make_config(solve_mode))
+    solver.solve()
+    return solver
+
+def read_lp(text):
+    rows = [[Fraction(part) for part in line.split()] for line in text.strip().split('\n')]
+    return (rows[0], rows[1:])
+
+def write_lp(costs, constraints):
+    return '\n'.join(' '.join(str(value) for value in row) for row in [costs] + constraints) + '\n'
+
+def test_ratio_range():
+    assert ratio_range([]) == (None, None)
+    assert ratio_range([(2, 1), (3, -1), (1, 0)]) == (-2, 3)
+    assert ratio_range([(4, 2), (1, 1)]) == (-1, None)
+
+@pytest.mark.parametrize('solve_mode', list(SolveMode))
+def test_small_lp_report(solve_mode, capsys):
+    report = solve(SMALL_LP, solve_mode).sensitivity()
+    capsys.readouterr()
+
+    assert report.reduced_costs == pytest.approx([0, 0, -1.5])
+    assert report.shadow_prices == pytest.approx([2, 0.5, 0])
+    assert report.cost_ranges[0] == (pytest.approx(2), None)
+    assert report.cost_ranges[1] == pytest.approx((0, 3))
+    assert report.cost_ranges[2] == (None, pytest.approx(5.5))
+    assert report.bound_ranges[0] == pytest.approx((2.5, 4.5))
+    assert report.bound_ranges[1] == pytest.approx((0, 6), abs=1e-9)
+    assert report.bound_ranges[2] == (pytest.approx(6.5), None)
+
+@pytest.mark.parametrize('filename', ['optimal_10x7_1.txt', 'optimal_10x7_5.txt', 'optimal_3x3_2.txt'])
+def test_ranges_keep_the_solution_optimal(filename, capsys):
+    text = read_input('test_LPs_volume2', filename)
+
+    (costs, constraints) = read_lp(text)
+    solver = solve(text)
+    report = solver.sensitivity()
+    objective_value = solver.s_dict.get_objective_value()
+
+    def moved_within(value, value_range):
+        (lowest, highest) = value_range
+        target = value + 1 if highest is None else highest
+        if target == value:
+            target = value - 1 if lowest is None else lowest
+        return (value + target)/2
+
+    # each bound moved within its range changes the objective value by its shadow price
+    for i, constraint in enumerate(constraints):
+        moved = [list(row) for row in constraints]
+        moved[i][-1] = moved_within(constraint[-1], report.bound_ranges[i])
+        changed = solve(write_lp(costs, moved))
+
+        assert changed.s_dict.get_objective_value() == objective_value + report.shadow_prices[i]*(moved[i][-1] - constraint[-1])
+
+    # each cost moved within its range keeps the solution optimal
+    values = [value for (_, value) in solver.s_dict.get_basis_values()]
+    for j, cost in enumerate(costs):
+        moved = list(costs)
+        moved[j] = moved_within(cost, report.cost_ranges[j])
+        changed = solve(write_lp(moved, constraints))
+
+        assert changed.s_dict.get_objective_value() == objective_value + (moved[j] - cost)*values[j]
+
+    capsys.readouterr()
+
+def test_sensitivity_requires_optimal_solution(capsys):
+    solver = solve("1 1\n1 0 -1\n0 1 2\n")
+    capsys.readouterr()
+
+    with pytest.raises(Exception):
+        solver.sensitivity()
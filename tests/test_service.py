@@ -0,0 +1,227 @@
+# Author: Tyrone Lagore V00995698
+
+import asyncio
+import json
+import multiprocessing
+import os
+import pytest
+import signal
+import time
+
+from simplex import service
+from simplex.service import ServiceWorker, SolveService, job_config
+from simplex.simplex_dictionary import SimplexConfig, SolveMode
+from tests.helpers import read_input, read_output
+
+class Client():
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    async def send(self, **request):
+        self.writer.write((json.dumps(request) + '\n').encode())
+        await self.writer.drain()
+
+    async def receive(self):
+        return json.loads(await asyncio.wait_for(self.reader.readline(), 30))
+
+    async def results(self, count):
+        """ the events received until count results arrived, and the results by id """
+        (events, results) = ([], {})
+        while len(results) < count:
+            event = await self.receive()
+            events.append(event)
+            if event['event'] == 'result':
+                results[event['id']] = event
+        return (events, results)
+
+def run_service(scenario, tmp_path, workers=2, queue_size=64, timeout=None, progress_interval=1.0):
+    """ runs scenario(client) against a service on a Unix socket """
+    path = str(tmp_path / 'service.sock')
+
+    async def run():
+        solve_service = SolveService(SimplexConfig(), workers, queue_size, timeout, progress_interval)
+        await solve_service.start(path)
+        try:
+            client = Client(*await asyncio.open_unix_connection(path))
+            await scenario(client)
+            client.writer.close()
+        finally:
+            await solve_service.close()
+
+    asyncio.run(run())
+    assert not os.path.exists(path)
+
+def test_results_match_the_expected_output(tmp_path):
+    files = [('test_LPs_volume1', 'netlib_sc50b.txt'), ('test_LPs_volume1', 'netlib_afiro.txt'),
+             ('test_LPs_volume2', 'optimal_10x7_7.txt'), ('test_LPs_volume1', 'netlib_bgprtr.txt')]
+
+    async def scenario(client):
+        for (volume, filename) in files:
+            await client.send(op='solve', id=filename, lp=read_input(volume, filename), options={'mode': 'HYBRID'})
+
+        (events, results) = await client.results(len(files))
+        for (volume, filename) in files:
+            assert results[filename]['output'] == read_output(volume, filename)
+            assert results[filename]['stats']['float_stats'] is not None
+            assert [event['event'] for event in events if event['id'] == filename][:2] == ['queued', 'started']
+
+    run_service(scenario, tmp_path)
+
+def test_progress(tmp_path):
+    async def scenario(client):
+        await client.send(op='solve', lp=read_input('test_LPs_volume1', 'netlib_afiro.txt'))
+        await client.send(op='solve', lp=read_input('test_LPs_volume1', 'netlib_sc50b.txt'), progress=False)
+
+        (events, results) = await client.results(2)
+        progress = [event for event in events if event['event'] == 'progress']
+        # the service numbers jobs without an id
+        assert set(results) == {1, 2}
+        assert all(event['id'] == 1 for event in progress)
+        # netlib_afiro.txt takes 12 pivots on the auxiliary problem, then 10
+        assert [event['pivots'] for event in progress] == list(range(1, 13)) + list(range(1, 11))
+        assert progress[-1]['objective'] == pytest.approx(464.753, abs=1e-3)
+
+    run_service(scenario, tmp_path, progress_interval=0)
+
+def test_cancel(tmp_path):
+    async def scenario(client):
+        lp = read_input('test_LPs_volume1', 'netlib_share2b.txt')
+        await client.send(op='solve', id='running', lp=lp)
+        await client.send(op='solve', id='queued', lp=lp)
+
+        while (await client.receive())['event'] != 'progress':
+            pass
+        await client.send(op='cancel', id='queued')
+        await client.send(op='cancel', id='running')
+
+        (events, results) = await client.results(2)
+        assert results['running']['status'] == 'cancelled'
+        assert results['running']['stats']['limit'] == 'CANCELLED'
+        assert results['queued']['status'] == 'cancelled'
+        assert {'id': 'queued', 'event': 'started'} not in events
+
+        await client.send(op='cancel', id='running')
+        assert (await client.receive())['event'] == 'error'
+
+    run_service(scenario, tmp_path, workers=1, progress_interval=0)
+
+def test_timeout_stops_the_job(tmp_path):
+    async def scenario(client):
+        await client.send(op='solve', id='slow', lp=read_input('test_LPs_volume1', 'netlib_share2b.txt'), timeout=0.5)
+        (_, results) = await client.results(1)
+        assert results['slow']['status'] == 'timeout'
+        assert results['slow']['output'].startswith('limit')
+        assert results['slow']['stats']['limit'] == 'CANCELLED'
+        assert results['slow']['time'] < service.KILL_GRACE
+
+        await client.send(op='solve', id='next', lp=read_input('test_LPs_volume1', 'netlib_sc50b.txt'))
+        (_, results) = await client.results(1)
+        assert results['next']['output'] == read_output('test_LPs_volume1', 'netlib_sc50b.txt')
+
+    run_service(scenario, tmp_path, workers=1, timeout=60)
+
+def test_timeout_replaces_a_worker_that_does_not_stop(monkeypatch, tmp_path):
+    monkeypatch.setattr(service, 'KILL_GRACE', 0)
+    # parsing takes about a second, the job can not stop before its first pivot
+    n = 300
+    lp = ' '.join(['1']*n) + '\n' + (' '.join(['1']*(n+1)) + '\n')*n
+
+    async def scenario(client):
+        await client.send(op='solve', id='slow', lp=lp, timeout=0.1)
+        (_, results) = await client.results(1)
+        assert results['slow']['status'] == 'timeout'
+        assert results['slow']['output'] == ''
+        assert results['slow']['error'] is None
+
+        await client.send(op='solve', id='next', lp=read_input('test_LPs_volume1', 'netlib_sc50b.txt'))
+        (_, results) = await client.results(1)
+        assert results['next']['output'] == read_output('test_LPs_volume1', 'netlib_sc50b.txt')
+
+    run_service(scenario, tmp_path, workers=1)
+
+def test_sending_to_a_worker_does_not_block():
+    worker = ServiceWorker(multiprocessing.get_context('forkserver'))
+    try:
+        os.kill(worker.process.pid, signal.SIGSTOP)
+        start = time.perf_counter()
+        # far more than the pipe holds, and the stopped process reads none of it
+        worker.send(('solve', 1, 'x'*(16*1024*1024), SimplexConfig(), None))
+        assert time.perf_counter() - start < 1
+        os.kill(worker.process.pid, signal.SIGCONT)
+
+        (kind, number, result) = asyncio.run(worker.recv())
+        assert (kind, number, result['status']) == ('result', 1, 'error')
+    finally:
+        worker.stop()
+
+def test_backpressure(tmp_path):
+    async def scenario(client):
+        lp = read_input('test_LPs_volume2', 'optimal_10x7_7.txt')
+        await client.send(op='solve', id='slow', lp=read_input('test_LPs_volume1', 'netlib_share2b.txt'), timeout=1)
+        assert (await client.receive())['event'] == 'queued'
+        assert (await client.receive())['event'] == 'started'
+
+        await client.send(op='solve', id='first', lp=lp)
+        await client.send(op='solve', id='second', lp=lp)
+
+        # second is not read while first fills the queue
+        (events, results) = await client.results(3)
+        order = [(event['id'], event['event']) for event in events if event['event'] != 'progress']
+        assert order.index(('second', 'queued')) > order.index(('slow', 'result'))
+        assert results['second']['status'] == 'optimal'
+
+    run_service(scenario, tmp_path, workers=1, queue_size=1)
+
+def test_bad_requests(tmp_path):
+    async def scenario(client):
+        client.writer.write(b'not json\n')
+        assert (await client.receive())['event'] == 'error'
+
+        await client.send(op='resolve', id=1)
+        assert (await client.receive()) == {'id': 1, 'event': 'error', 'message': "handle_request():: Unknown op 'resolve', expected solve or cancel"}
+
+        await client.send(op='solve', id=2, lp='1 1\n1 1 2\n', options={'workers': 4})
+        assert 'Unknown option' in (await client.receive())['message']
+
+        await client.send(op='solve', id=3)
+        assert (await client.receive())['event'] == 'error'
+
+        await client.send(op='solve', id=4, lp='1 x\n')
+        (_, results) = await client.results(1)
+        assert results[4]['status'] == 'error'
+        assert 'Fraction' in results[4]['error']
+
+    run_service(scenario, tmp_path, workers=1)
+
+def test_tcp(tmp_path):
+    async def run():
+        solve_service = SolveService(SimplexConfig(), 1)
+        await solve_service.start(port=0)
+        try:
+            (host, port) = solve_service.addresses()[0][:2]
+            client = Client(*await asyncio.open_connection(host, port))
+            await client.send(op='solve', id='lp', lp='1 1\n1 1 2\n')
+            (_, results) = await client.results(1)
+            assert results['lp']['output'].split('\n')[:2] == ['optimal', '2']
+            client.writer.close()
+        finally:
+            await solve_service.close()
+
+    asyncio.run(run())
+
+def test_job_config():
+    config = SimplexConfig()
+    config.checkpoint_path = 'checkpoint'
+
+    job = job_config(config, {'mode': 'REVISED', 'presolve': True, 'time_limit': 2})
+    assert (job.solve_mode, job.presolve, job.time_limit) == (SolveMode.REVISED, True, 2.0)
+    assert job.checkpoint_path is None
+    assert config.solve_mode == SolveMode.DICTIONARY
+
+    for options in [{'mode': 'FAST'}, {'presolve': 'yes'}, {'pivot_limit': '10'}]:
+        with pytest.raises(Exception):
+            job_config(config, options)
+
+def test_service_max_request_bytes():
+    assert service.MAX_REQUEST_BYTES > len(read_input('test_LPs_volume1', 'netlib_share1b.txt'))
@@ -1,6 +1,8 @@
 # Author: Tyrone Lagore V00995698
 
+import simplex.simplex_parser as sp
 from simplex.simplex_solver import SimplexSolver, SimplexConfig
+from simplex.simplex_dictionary import PivotMethod, SimplexState, FeasibilityMethod, SimplexDictionary
 from simplex.linear_expressions import LinearExpression, Variable
 from fractions import Fraction
 
@@ -59,4 +61,147 @@ simplex_config = SimplexConfig()
 
 simplex = SimplexSolver(obj_fn, constraints, simplex_config)
 simplex.DEBUG = True
-simplex.solve()
\ No newline at end of file
+simplex.solve()
+
+def test_occurrences_match_rescan():
+    """ the variable to expression lookup must stay equal to a full rescan after every pivot """
+    with open('data/test_LPs_volume2/input/optimal_10x7_1.txt') as in_file:
+        solver = sp.parse(in_file, SimplexConfig())
+
+    s_dict = solver.s_dict
+    orig_fn = s_dict.as_dual_init()
+
+    while s_dict.get_state() == SimplexState.FEASIBLE:
+        (entering_var, leaving_expr) = s_dict.get_pivot(PivotMethod.LARGEST_INCREASE)
+        if entering_var is None:
+            break
+        s_dict.pivot(entering_var, leaving_expr)
+
+        rescan = {}
+        for row, basis_expr in enumerate(s_dict.basis_exprs):
+            for var in basis_expr.get_vars():
+                if var.coefficient != 0:
+                    rescan.setdefault(var.varname, set()).add(row)
+
+        assert {name: rows for name, rows in s_dict.rows.occurrences.items() if rows} == rescan
+
+    s_dict.as_dual_nf()
+    s_dict.restore_objective(orig_fn)
+
+def test_state_matches_rescan():
+    """ the state kept up to date by pivot() must equal the state of a full rescan after every pivot, in both phases """
+    with open('data/test_LPs_volume2/input/optimal_10x7_7.txt') as in_file:
+        solver = sp.parse(in_file, SimplexConfig())
+
+    s_dict = solver.s_dict
+    orig_fn = s_dict.as_dual_feasible()
+
+    def check_state():
+        state = s_dict.get_state()
+        infeasible_rows = [row for row, basis_expr in enumerate(s_dict.basis_exprs) if basis_expr.get_constant().coefficient < 0]
+        assert [row for (row, _) in s_dict.rows.infeasible_rows()] == infeasible_rows
+
+        s_dict.update_state()
+        assert state == s_dict.get_state()
+
+    assert s_dict.get_state() == SimplexState.INFEASIBLE
+    while s_dict.get_state() == SimplexState.INFEASIBLE:
+        (entering_var, leaving_row) = s_dict.get_dual_pivot()
+        if entering_var is None:
+            break
+        s_dict.pivot(entering_var, leaving_row)
+        check_state()
+
+    s_dict.restore_objective(orig_fn)
+
+    while s_dict.get_state() == SimplexState.FEASIBLE:
+        (entering_var, leaving_expr) = s_dict.get_pivot(PivotMethod.LARGEST_COEFFICIENT)
+        if entering_var is None:
+            break
+        s_dict.pivot(entering_var, leaving_expr)
+        check_state()
+
+    assert s_dict.get_state() == SimplexState.OPTIMAL
+
+def test_epsilon_block_stays_sparse():
+    """ only non-zero epsilon coefficients are stored, and no two basis expressions tie on epsilon """
+    with open('data/test_LPs_volume2/input/optimal_10x7_1.txt') as in_file:
+        solver = sp.parse(in_file, SimplexConfig())
+
+    s_dict = solver.s_dict
+    s_dict.as_dual_init()
+
+    while s_dict.get_state() == SimplexState.FEASIBLE:
+        (entering_var, leaving_expr) = s_dict.get_pivot(PivotMethod.LARGEST_COEFFICIENT)
+        if entering_var is None:
+            break
+        s_dict.pivot(entering_var, leaving_expr)
+
+        for basis_expr in s_dict.basis_exprs:
+            assert 0 not in basis_expr.get_epsilon().values()
+
+        for first in s_dict.basis_exprs:
+            for second in s_dict.basis_exprs:
+                if first is not second:
+                    assert first.compare_eps(second) == -second.compare_eps(first) != 0
+
+def test_steepest_edge_weights_match_rescan():
+    """ the incrementally updated steepest edge weights must stay equal to the exact edge lengths """
+    with open('data/test_LPs_volume2/input/optimal_10x7_1.txt') as in_file:
+        solver = sp.parse(in_file, SimplexConfig())
+
+    s_dict = solver.s_dict
+    s_dict.as_dual_init()
+
+    while s_dict.get_state() == SimplexState.FEASIBLE:
+        (entering_var, leaving_expr) = s_dict.get_pivot(PivotMethod.STEEPEST_EDGE)
+        if entering_var is None:
+            break
+        s_dict.pivot(entering_var, leaving_expr)
+
+        weights = s_dict._SimplexDictionary__weights
+        for var in s_dict.objective_function.get_vars():
+            exact = 1 + sum(float(basis_expr.get_var(var.varname).coefficient)**2 for basis_expr in s_dict.basis_exprs)
+            assert abs(weights[var.varname] - exact) <= 1e-9*exact
+
+def test_dual_simplex_on_dual_feasible_dictionary(capsys):
+    """ a dual feasible dictionary is solved by dual simplex pivots alone, without touching the objective function """
+    obj_fn = LinearExpression(Variable('z', Fraction(1)), [Variable(Variable.CONSTANT, Fraction(0)), Variable('x1', Fraction(-1)), Variable('x2', Fraction(-2))])
+    constraints = [
+        LinearExpression(Variable('x3', Fraction(1)), [Variable(Variable.CONSTANT, Fraction(-2)), Variable('x1', Fraction(1)), Variable('x2', Fraction(1))]),
+        LinearExpression(Variable('x4', Fraction(1)), [Variable(Variable.CONSTANT, Fraction(3)), Variable('x1', Fraction(-1)), Variable('x2', Fraction(0))]),
+    ]
+
+    config = SimplexConfig()
+    config.feasibility_method = FeasibilityMethod.DUAL_SIMPLEX
+    solver = SimplexSolver(obj_fn, constraints, config)
+
+    capsys.readouterr()
+    solver.solve()
+
+    assert capsys.readouterr().out.split() == ['optimal', '-2', '2', '0']
+    assert solver.stats.aux_stats.num_pivots == 1
+    assert solver.stats.num_pivots == 0
+    assert not solver.s_dict.is_dual
+
+def test_dictionary_ownership():
+    """ the solver's dictionary takes the expressions it is given, a dictionary built directly clones them by default """
+    with open('data/test_LPs_volume2/input/optimal_10x7_7.txt') as in_file:
+        (obj_fn, constraints) = sp.parse_lp(in_file)
+
+    cloned = SimplexDictionary(obj_fn, constraints)
+    assert cloned.objective_function is not obj_fn
+    assert all(cloned_expr is not constraint for cloned_expr, constraint in zip(cloned.basis_exprs, constraints))
+
+    solver = SimplexSolver(obj_fn, constraints, SimplexConfig())
+    assert solver.s_dict.objective_function is obj_fn
+    assert all(basis_expr is constraint for basis_expr, constraint in zip(solver.s_dict.basis_exprs, constraints))
+
+    # dual initialization hands the original objective function back instead of copying it
+    orig_fn = solver.s_dict.as_dual_init()
+    assert orig_fn is obj_fn
+    assert orig_fn.deepequals(cloned.objective_function)
+
+    # transforming the solver's dictionary does not touch the clones
+    assert cloned.get_basis_values() == [(f'x{j}', 0) for j in range(1, cloned.n+1)]
+    assert cloned.deepclone().deepequals(cloned)
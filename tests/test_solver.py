@@ -0,0 +1,135 @@
+# Author: Tyrone Lagore V00995698
+
+import pytest
+
+from simplex.simplex_dictionary import SolveMode, PivotMethod, CandidateList, FeasibilityMethod
+from tests.helpers import lp_files, make_config, parse_text, read_input, read_output, solve_file, solve_text
+
+VOLUME2_FILES = lp_files('test_LPs_volume2')
+
+def solve_observed(volume, filename, solve_mode):
+    solver = parse_text(read_input(volume, filename), make_config(solve_mode))
+
+    events = []
+    solver.add_observer(events.append)
+    solver.solve()
+
+    return (solver, events)
+
+@pytest.mark.parametrize('volume, filename', [('test_LPs_volume1', 'netlib_sc50a.txt'), ('test_LPs_volume2', 'optimal_10x7_8.txt')])
+def test_observer_sees_every_pivot(volume, filename):
+    (solver, events) = solve_observed(volume, filename, SolveMode.DICTIONARY)
+    stats = solver.stats
+
+    aux_events = [event for event in events if event.auxiliary]
+    primal_events = [event for event in events if not event.auxiliary]
+    aux_pivots = 0 if stats.aux_stats is None else stats.aux_stats.num_pivots
+
+    assert len(aux_events) == aux_pivots
+    assert len(primal_events) == stats.num_pivots
+    assert [event.pivot_number for event in primal_events] == list(range(1, stats.num_pivots+1))
+    assert len([event for event in primal_events if event.degenerate]) == stats.num_degenerate_pivots
+    assert all(event.entering_var != event.leaving_var for event in events)
+
+    if len(primal_events) > 0:
+        assert primal_events[-1].objective_value == solver.s_dict.get_objective_value()
+
+    assert {'parse', 'create_dictionary', 'update_state'} <= set(stats.phase_times)
+    if stats.required_auxiliary:
+        assert {'as_dual_init', 'as_dual_nf', 'restore_objective'} <= set(stats.phase_times)
+
+@pytest.mark.parametrize('solve_mode', [SolveMode.FLOAT_TABLEAU, SolveMode.EXACT_INTEGER, SolveMode.REVISED])
+def test_pivots_described_the_same_by_every_mode(solve_mode):
+    lp = ('test_LPs_volume2', 'optimal_10x7_8.txt')
+    describe = lambda events: [(event.auxiliary, event.entering_var, event.leaving_var, event.leaving_row) for event in events]
+
+    (_, expected) = solve_observed(*lp, SolveMode.DICTIONARY)
+    (_, events) = solve_observed(*lp, solve_mode)
+
+    assert describe(events) == describe(expected)
+
+def test_candidate_list_rotates_through_chunks():
+    values = {'a': 0, 'b': 2, 'c': 0, 'd': 1, 'e': 3}
+    order = list(values)
+    def is_attractive(keys):
+        return [values[key] > 0 for key in keys]
+
+    candidates = CandidateList(2)
+
+    # the first chunk has one attractive variable, it is used for one pivot
+    assert candidates.select(is_attractive, lambda: order) == ['b']
+    assert candidates.select(is_attractive, lambda: order) == ['d']
+
+    # the refill wraps around the end of the objective function
+    values['d'] = 0
+    assert candidates.select(is_attractive, lambda: order) == ['e']
+    assert candidates.select(is_attractive, lambda: order) == ['b']
+
+    # variables that are no longer attractive are dropped, and nothing attractive left means optimal
+    values['b'] = 0
+    values['e'] = 0
+    assert candidates.select(is_attractive, lambda: order) == []
+
+@pytest.mark.parametrize('filename', VOLUME2_FILES[::5])
+@pytest.mark.parametrize('solve_mode', list(SolveMode))
+@pytest.mark.parametrize('pivot_method', [PivotMethod.LARGEST_COEFFICIENT, PivotMethod.LARGEST_INCREASE, PivotMethod.DEVEX])
+def test_partial_pricing_matches_expected(filename, solve_mode, pivot_method, capsys):
+    config = make_config(solve_mode, pivot_method=pivot_method, pricing_chunk_size=3)
+
+    (_, output) = solve_file('test_LPs_volume2', filename, config, capsys)
+    assert output.strip() == read_output('test_LPs_volume2', filename).strip()
+
+@pytest.mark.parametrize('filename', VOLUME2_FILES[::3])
+@pytest.mark.parametrize('solve_mode', list(SolveMode))
+def test_dual_simplex_matches_expected(filename, solve_mode, capsys):
+    config = make_config(solve_mode, feasibility_method=FeasibilityMethod.DUAL_SIMPLEX)
+
+    (solver, output) = solve_file('test_LPs_volume2', filename, config, capsys)
+    assert output.strip() == read_output('test_LPs_volume2', filename).strip()
+
+    # the dictionary is never transformed into its dual
+    assert 'as_dual_init' not in solver.stats.phase_times
+    assert not solver.s_dict.is_dual
+
+def solve_warm(text, solve_mode, capsys, basis=None):
+    (solver, output) = solve_text(text, make_config(solve_mode), capsys, basis)
+    return (solver, output.strip())
+
+@pytest.mark.parametrize('filename', [filename for filename in VOLUME2_FILES if filename.startswith('optimal')][::3])
+@pytest.mark.parametrize('solve_mode', list(SolveMode))
+def test_warm_start_from_final_basis(filename, solve_mode, capsys):
+    text = read_input('test_LPs_volume2', filename)
+
+    (solver, expected) = solve_warm(text, solve_mode, capsys)
+    (warm_solver, output) = solve_warm(text, solve_mode, capsys, solver.get_basis())
+
+    assert output == expected
+    assert warm_solver.stats.num_pivots == 0
+    assert not warm_solver.stats.required_auxiliary
+    assert warm_solver.get_basis() == solver.get_basis()
+
+# the HYBRID mode warm starts its float solve, see test_hybrid.py
+@pytest.mark.parametrize('solve_mode', [solve_mode for solve_mode in SolveMode if solve_mode != SolveMode.HYBRID])
+def test_warm_start_after_changing_bound(solve_mode, capsys):
+    lines = read_input('test_LPs_volume1', 'netlib_afiro.txt').strip().split('\n')
+
+    (solver, _) = solve_warm('\n'.join(lines), solve_mode, capsys)
+
+    # halving the last bound makes the saved basis infeasible, the dual simplex takes it from there
+    parts = lines[-1].split()
+    parts[-1] = str(float(parts[-1])/2)
+    text = '\n'.join(lines[:-1] + [' '.join(parts)])
+
+    (cold_solver, expected) = solve_warm(text, solve_mode, capsys)
+    (warm_solver, output) = solve_warm(text, solve_mode, capsys, solver.get_basis())
+
+    assert output == expected
+    assert warm_solver.stats.required_auxiliary
+    assert 'as_dual_init' not in warm_solver.stats.phase_times
+    assert warm_solver.stats.aux_stats.num_pivots + warm_solver.stats.num_pivots < cold_solver.stats.num_pivots
+
+@pytest.mark.parametrize('solve_mode', list(SolveMode))
+@pytest.mark.parametrize('basis', [['x4', 'x5'], ['x1', 'x2', 'x7'], ['x1', 'x1', 'x4']])
+def test_warm_start_rejects_invalid_basis(solve_mode, basis):
+    with pytest.raises(Exception):
+        parse_text("1 1 1\n1 0 0 1\n0 1 0 1\n0 0 1 1\n", make_config(solve_mode), basis)
@@ -0,0 +1,55 @@
+# Author: Tyrone Lagore V00995698
+
+import numpy as np
+import pytest
+
+from simplex.simplex_dictionary import PivotMethod, SolveMode
+from simplex.tableau import TableauDictionary
+from tests.helpers import lp_files, make_config, parse_text, read_input, read_output, solve_file
+
+VOLUME = 'test_LPs_volume2'
+LP_FILES = lp_files(VOLUME)
+
+def solve(filename, solve_mode, pivot_method, capsys):
+    return solve_file(VOLUME, filename, make_config(solve_mode, pivot_method=pivot_method), capsys)[1]
+
+@pytest.mark.parametrize('filename', LP_FILES)
+def test_float_tableau_matches_expected(filename, capsys):
+    expected = read_output(VOLUME, filename).strip()
+
+    assert solve(filename, SolveMode.FLOAT_TABLEAU, PivotMethod.LARGEST_COEFFICIENT, capsys).strip() == expected
+
+@pytest.mark.parametrize('filename', LP_FILES[::5])
+@pytest.mark.parametrize('pivot_method', [PivotMethod.LARGEST_INCREASE, PivotMethod.STEEPEST_EDGE, PivotMethod.DEVEX])
+def test_float_tableau_matches_dictionary(filename, pivot_method, capsys):
+    expected = solve(filename, SolveMode.DICTIONARY, pivot_method, capsys)
+    assert solve(filename, SolveMode.FLOAT_TABLEAU, pivot_method, capsys) == expected
+
+@pytest.mark.parametrize('filename', LP_FILES)
+def test_integer_tableau_matches_expected(filename, capsys):
+    expected = read_output(VOLUME, filename).strip()
+
+    assert solve(filename, SolveMode.EXACT_INTEGER, PivotMethod.LARGEST_COEFFICIENT, capsys).strip() == expected
+
+@pytest.mark.parametrize('filename', LP_FILES[::5])
+@pytest.mark.parametrize('pivot_method', [PivotMethod.LARGEST_INCREASE, PivotMethod.STEEPEST_EDGE, PivotMethod.DEVEX])
+def test_integer_tableau_matches_dictionary(filename, pivot_method, capsys):
+    expected = solve(filename, SolveMode.DICTIONARY, pivot_method, capsys)
+    assert solve(filename, SolveMode.EXACT_INTEGER, pivot_method, capsys) == expected
+
+@pytest.mark.parametrize('solve_mode', [SolveMode.FLOAT_TABLEAU, SolveMode.EXACT_INTEGER])
+def test_tableau_starts_with_epsilon_identity(solve_mode):
+    s_dict = parse_text(read_input(VOLUME, 'optimal_10x7_1.txt'), make_config(solve_mode)).s_dict
+    epsilon = s_dict.tableau[1:, s_dict.n+1:]
+
+    assert epsilon.shape == (s_dict.m, s_dict.m)
+    assert (epsilon == np.identity(s_dict.m, dtype=int)).all()
+
+def test_incomplete_tableau_cannot_be_created():
+    class MissingRatioTest(TableauDictionary):
+        def _to_array(self, rows):
+            return np.array(rows, dtype=np.float64)
+
+    # the missing hooks are reported when the tableau is created, not when they are first called
+    with pytest.raises(TypeError, match='_ratio_test'):
+        MissingRatioTest(None, [])